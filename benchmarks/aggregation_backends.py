@@ -0,0 +1,139 @@
+"""
+Compare the SQL and NumPy aggregation backends of the list and comparison endpoints.
+
+The benchmark builds a synthetic SQLite database with one hourly waste and weather
+reading per bin, then times the per-bin summaries of the List*WastesAPI endpoints and
+the bucketed data of the comparison view with each backend.
+
+Usage:
+    python benchmarks/aggregation_backends.py --bins 50 --days 365
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.test_settings")
+os.environ.setdefault("ALLOWED_HOSTS", "localhost")
+
+
+def populate(bins: int, days: int) -> int:
+    """
+    Create the bin, waste and weather tables and fill them with one hourly reading per bin.
+
+    :param bins: Number of bins, each in its own location.
+    :param days: Number of days of readings, ending on 2024-12-31.
+
+    :return: The number of waste rows created.
+    """
+    from django.db import connection, transaction
+
+    from waste.models import Bin, Waste, Weather
+
+    with connection.schema_editor() as editor:
+        for model in (Bin, Waste, Weather):
+            editor.create_model(model)
+    random.seed(0)
+    start = datetime(2025, 1, 1) - timedelta(days=days)
+    hours = [(start + timedelta(hours=hour)).strftime("%Y-%m-%d %H:%M:%S")
+             for hour in range(days * 24)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO bin (bin_id, name, location, lat, lon, waste_type, "
+            "capacity, collect_freq) VALUES (%s, %s, %s, 0, 0, 'General', 100, 'Daily')",
+            [(bin_id, f"Bin {bin_id}", f"Location {bin_id}")
+             for bin_id in range(1, bins + 1)])
+        cursor.executemany(
+            "INSERT INTO waste (bin_id, timestamp, level) VALUES (%s, %s, %s)",
+            [(bin_id, hour, round(random.uniform(0, 5), 2))
+             for hour in hours for bin_id in range(1, bins + 1)])
+        cursor.executemany(
+            "INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid) "
+            "VALUES (%s, %s, 0, 0, %s, %s, %s)",
+            [(hour, f"Location {bin_id}", round(random.uniform(25, 38), 2),
+              round(random.uniform(0, 3), 2), round(random.uniform(40, 90), 2))
+             for hour in hours for bin_id in range(1, bins + 1)])
+    return len(hours) * bins
+
+
+def get_cases() -> dict:
+    """
+    Build the aggregations to time, keyed by name.
+
+    :return: Functions running an aggregation with the given backend.
+    """
+    from waste.models import Waste, Weather
+    from waste.services import filter_period, resolve_period, summarize_bins
+    from waste.views import WasteLevelComparisonView
+
+    def list_period(year, month="", day=""):
+        start, end = resolve_period(year, month, day)
+        return lambda backend: summarize_bins(
+            filter_period(Waste.objects.all(), start, end),
+            filter_period(Weather.objects.all(), start, end), backend)
+
+    def comparison(method, year, month="", day="", *args):
+        start, end = resolve_period(year, month, day)
+
+        def run(backend):
+            view = WasteLevelComparisonView()
+            view.backend = backend
+            return getattr(view, method)(
+                filter_period(Waste.objects.all(), start, end),
+                filter_period(Weather.objects.all(), start, end), *args)
+        return run
+
+    return {
+        "list period (day)": list_period(2024, 12, 15),
+        "list period (month)": list_period(2024, 12),
+        "list period (year)": list_period(2024),
+        "comparison (day)": comparison("get_daily_data", 2024, 12, 15),
+        "comparison (month)": comparison("get_monthly_data", 2024, 12, "", 12, 2024),
+        "comparison (year)": comparison("get_yearly_data", 2024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bins", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        from django.conf import settings
+        settings.DATABASES["default"]["NAME"] = os.path.join(directory,
+                                                             "bench.sqlite3")
+        django.setup()
+        from waste.services import array_aggregation
+        if array_aggregation.np is None:
+            parser.error("The NumPy backend requires numpy (pip install numpy).")
+
+        started = time.perf_counter()
+        rows = populate(args.bins, args.days)
+        print(f"Generated {rows:,} waste rows and {rows:,} weather rows "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        for name, run in get_cases().items():
+            timings = {}
+            for backend in ("sql", "numpy"):
+                best = None
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    run(backend)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    best = elapsed if best is None else min(best, elapsed)
+                timings[backend] = best
+            print(f"{name}: sql {timings['sql']:.1f} ms, "
+                  f"numpy {timings['numpy']:.1f} ms "
+                  f"({timings['sql'] / timings['numpy']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
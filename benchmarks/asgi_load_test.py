@@ -0,0 +1,230 @@
+"""
+Compare the throughput of the waste endpoints under concurrent requests with ASGI and WSGI serving.
+
+The load test generates a synthetic SQLite database with generate_benchmark_data, then serves
+the site with uvicorn and WASTE_ASYNC_VIEWS=True, which serves the async views, and with
+gunicorn using a pool of --wsgi-threads threads, which serves the sync views. Both run a single
+process, and --concurrency clients request the list and specific latest and period endpoints
+from both.
+Responses are not cached, and every query waits --db-latency milliseconds to stand in for the
+round trip to a database server, which the in-process SQLite does not have.
+
+Usage:
+    pip install uvicorn gunicorn
+    python benchmarks/asgi_load_test.py --concurrency 64 --requests 2000
+"""
+import argparse
+import http.client
+import importlib.util
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import django
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("ALLOWED_HOSTS", "127.0.0.1")
+
+SETTINGS = """
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+from mysite.test_settings import *
+
+DATABASES = {{"default": {{"ENGINE": "django.db.backends.sqlite3", "NAME": {database!r},
+                         "OPTIONS": {{"timeout": 30}}}}}}
+CACHES = {{"default": {{"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}}}
+ALLOWED_HOSTS = ["127.0.0.1"]
+DEBUG = False
+DB_LATENCY = float(os.environ.get("LOAD_TEST_DB_LATENCY", 0)) / 1000
+
+
+def delay_query(execute, sql, params, many, context):
+    time.sleep(DB_LATENCY)
+    return execute(sql, params, many, context)
+
+
+def add_latency(sender, connection, **kwargs):
+    if DB_LATENCY and delay_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(delay_query)
+
+
+connection_created.connect(add_latency)
+"""
+
+
+def populate(bins: int, days: int) -> list[str]:
+    """
+    Create the database and fill it with synthetic bins and readings.
+
+    :param bins: Number of bins, each in its own location.
+    :param days: Number of days of hourly readings.
+
+    :return: The paths of the endpoints to request.
+    """
+    from django.core.management import call_command
+    from django.db import connection
+
+    from waste.models import Bin, Waste, Weather
+
+    call_command("migrate", verbosity=0)
+    with connection.schema_editor() as editor:
+        for model in (Bin, Waste, Weather):
+            editor.create_model(model)
+    call_command("generate_benchmark_data", bins=bins, days=days, cadence=60,
+                 stdout=open(os.devnull, "w"))
+    bin = Bin.objects.order_by("bin_id").first()
+    day = Waste.objects.order_by("-timestamp").first().timestamp.date()
+    return [
+        "/api/waste/latest/",
+        f"/api/waste/latest/bin/{bin.bin_id}/",
+        f"/api/waste/{day.year}/{day.month}/{day.day}/",
+        f"/api/waste/{day.year}/{day.month}/{day.day}/bin/{bin.bin_id}/",
+        f"/api/waste/{day.year}/{day.month}/{day.day}/location/{quote(bin.location)}/",
+    ]
+
+
+def wait_for_server(port: int, process: subprocess.Popen, timeout: float = 30):
+    """
+    Wait until a server accepts connections.
+
+    :param port: The port of the server.
+    :param process: The server process.
+    :param timeout: The number of seconds to wait.
+
+    :raises RuntimeError: If the server exits or does not accept connections in time.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with status {process.returncode}.")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("The server did not start in time.")
+
+
+def run_load(port: int, paths: list[str], requests: int, concurrency: int) -> dict:
+    """
+    Request the endpoints round robin from concurrent clients with keep-alive connections.
+
+    :param port: The port of the server.
+    :param paths: The paths of the endpoints.
+    :param requests: The total number of requests.
+    :param concurrency: The number of concurrent clients.
+
+    :return: The throughput, latency percentiles and number of errors.
+    """
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    latencies = []
+    errors = 0
+
+    def client():
+        nonlocal errors
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                break
+            started = time.perf_counter()
+            try:
+                connection.request("GET", paths[index % len(paths)])
+                response = connection.getresponse()
+                response.read()
+                failed = response.status != 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                failed = True
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                errors += failed
+        connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(round(len(latencies) * 0.95), len(latencies) - 1)],
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bins", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--wsgi-threads", type=int, default=8)
+    parser.add_argument("--db-latency", type=float, default=50,
+                        help="Milliseconds added to every query.")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    for module in ("uvicorn", "gunicorn"):
+        if importlib.util.find_spec(module) is None:
+            parser.error(f"The load test requires {module} (pip install uvicorn gunicorn).")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "load_test_settings.py"), "w") as settings_file:
+            settings_file.write(textwrap.dedent(SETTINGS).format(
+                database=os.path.join(directory, "load_test.sqlite3")))
+        sys.path.insert(0, directory)
+        os.environ["DJANGO_SETTINGS_MODULE"] = "load_test_settings"
+        django.setup()
+        paths = populate(args.bins, args.days)
+        env = os.environ | {
+            "PYTHONPATH": os.pathsep.join([directory, ROOT]),
+            "LOAD_TEST_DB_LATENCY": str(args.db_latency),
+        }
+        servers = {
+            "ASGI (uvicorn, async views)": (
+                [sys.executable, "-m", "uvicorn", "mysite.asgi:application",
+                 "--port", str(args.port), "--log-level", "warning", "--no-access-log"],
+                {"WASTE_ASYNC_VIEWS": "True"}),
+            f"WSGI (gunicorn, {args.wsgi_threads} threads)": (
+                [sys.executable, "-m", "gunicorn", "mysite.wsgi:application",
+                 "--bind", f"127.0.0.1:{args.port}", "--worker-class", "gthread",
+                 "--workers", "1", "--threads", str(args.wsgi_threads),
+                 "--log-level", "warning"],
+                {"WASTE_ASYNC_VIEWS": "False"}),
+        }
+        print(f"{args.requests} requests from {args.concurrency} clients, "
+              f"{args.db_latency:g} ms per query")
+        for name, (command, server_env) in servers.items():
+            process = subprocess.Popen(command, cwd=ROOT, env=env | server_env)
+            try:
+                wait_for_server(args.port, process)
+                run_load(args.port, paths, len(paths) * 2, 1)
+                result = run_load(args.port, paths, args.requests, args.concurrency)
+            finally:
+                process.terminate()
+                process.wait()
+            print(f"{name}: {result['throughput']:.1f} requests/s, "
+                  f"p50 {result['p50']:.1f} ms, p95 {result['p95']:.1f} ms, "
+                  f"{result['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Compare connecting per request, persistent connections and the connection pool.
+
+Every thread plays a worker thread serving --requests requests in a row. Like Django, it closes
+obsolete connections before and after each request, and runs one small query in between. By
+default the database is an SQLite file whose connects are delayed by --connect-latency
+milliseconds to stand in for the TCP and authentication handshake of MySQL. Pass --mysql to use
+the MySQL database configured in .env instead.
+
+Usage:
+    python benchmarks/connection_pool.py --threads 8 --requests 500 --connect-latency 5
+    python benchmarks/connection_pool.py --mysql
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ALLOWED_HOSTS", "localhost")
+
+
+def get_wrapper_classes(mysql: bool, connect_latency: float) -> tuple[type, type]:
+    """
+    Get the plain and pooled database wrapper classes of the database under test.
+
+    :param mysql: Whether to use MySQL instead of SQLite.
+    :param connect_latency: Seconds added to every new SQLite connection.
+
+    :return: The plain and the pooled database wrapper classes.
+    """
+    from waste.db import PooledDatabaseWrapperMixin
+
+    if mysql:
+        from django.db.backends.mysql.base import DatabaseWrapper
+    else:
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        class SlowConnectDatabaseWrapper(DatabaseWrapper):
+            def get_new_connection(self, conn_params):
+                time.sleep(connect_latency)
+                return super().get_new_connection(conn_params)
+
+        DatabaseWrapper = SlowConnectDatabaseWrapper
+
+    class PooledDatabaseWrapper(PooledDatabaseWrapperMixin, DatabaseWrapper):
+        pass
+
+    return DatabaseWrapper, PooledDatabaseWrapper
+
+
+def run(wrapper_class: type, settings_dict: dict, threads: int, requests: int) -> dict:
+    """
+    Serve requests from several threads, each with its own database wrapper.
+
+    :param wrapper_class: The database wrapper class.
+    :param settings_dict: The database settings.
+    :param threads: The number of threads.
+    :param requests: The number of requests per thread.
+
+    :return: The throughput, the latency percentiles and the number of connects of the wrappers.
+    """
+    latencies = []
+    connects = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal connects
+        wrapper = wrapper_class(settings_dict, alias="benchmark")
+        timings = []
+        opened = 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            wrapper.close_if_unusable_or_obsolete()
+            if wrapper.connection is None:
+                opened += 1
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            wrapper.close_if_unusable_or_obsolete()
+            timings.append((time.perf_counter() - started) * 1000)
+        wrapper.close()
+        with lock:
+            latencies.extend(timings)
+            connects += opened
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(round(len(latencies) * 0.95), len(latencies) - 1)],
+        "connects": connects,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--connect-latency", type=float, default=5,
+                        help="Milliseconds added to every new SQLite connection.")
+    parser.add_argument("--mysql", action="store_true",
+                        help="Use the MySQL database configured in .env.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE",
+                          "mysite.settings" if args.mysql else "mysite.test_settings")
+    django.setup()
+    from django.db import connection
+
+    from waste.db import close_connection_pools, get_connection_pool_stats
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings_dict = dict(connection.settings_dict)
+        if not args.mysql:
+            settings_dict["NAME"] = os.path.join(directory, "bench.sqlite3")
+        plain, pooled = get_wrapper_classes(args.mysql, args.connect_latency / 1000)
+        pool = {"MAX_SIZE": args.pool_size, "IDLE_TIMEOUT": 300,
+                "HEALTH_CHECK_INTERVAL": 30, "TIMEOUT": 30}
+        cases = {
+            "connect per request (CONN_MAX_AGE=0)":
+                (plain, settings_dict | {"CONN_MAX_AGE": 0}),
+            "persistent (CONN_MAX_AGE=60)":
+                (plain, settings_dict | {"CONN_MAX_AGE": 60}),
+            f"pool (DB_POOL_SIZE={args.pool_size}, CONN_MAX_AGE=0)":
+                (pooled, settings_dict | {"CONN_MAX_AGE": 0, "POOL": pool}),
+        }
+        print(f"{args.threads} threads x {args.requests} requests on "
+              f"{'MySQL' if args.mysql else f'SQLite, {args.connect_latency:g} ms per connect'}")
+        for name, (wrapper_class, case_settings) in cases.items():
+            result = run(wrapper_class, case_settings, args.threads, args.requests)
+            if wrapper_class is pooled:
+                result["connects"] = get_connection_pool_stats()["benchmark"]["connects"]
+            print(f"{name}: {result['throughput']:.0f} requests/s, "
+                  f"p50 {result['p50']:.2f} ms, p95 {result['p95']:.2f} ms, "
+                  f"{result['connects']} connects")
+        print(f"pool stats: {get_connection_pool_stats()['benchmark']}")
+        close_connection_pools()
+
+
+if __name__ == "__main__":
+    main()
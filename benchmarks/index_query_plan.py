@@ -0,0 +1,157 @@
+"""
+Compare query plans and timings of the API access patterns with and without
+the composite indexes created by waste/migrations/0002_waste_weather_indexes.py.
+
+The benchmark builds a synthetic SQLite database with the same layout as
+data/data.sql, runs every query once without the indexes, creates the
+indexes and runs them again.
+
+Usage:
+    python benchmarks/index_query_plan.py --bins 200 --days 420
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TABLES = """
+    CREATE TABLE bin (
+        bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(100) NOT NULL,
+        location VARCHAR(100) NOT NULL
+    );
+    CREATE TABLE waste (
+        waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bin_id INTEGER NOT NULL,
+        timestamp TIMESTAMP NOT NULL,
+        level NUMERIC(6,2) NOT NULL
+    );
+    CREATE TABLE weather_api (
+        weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TIMESTAMP NOT NULL,
+        location TEXT NOT NULL,
+        temp NUMERIC(5,2) NOT NULL,
+        precip NUMERIC(5,2) NOT NULL,
+        humid NUMERIC(5,2) NOT NULL
+    );
+"""
+
+INDEXES = """
+    CREATE INDEX waste_bin_timestamp_idx ON waste (bin_id, timestamp, level);
+    CREATE INDEX waste_timestamp_idx ON waste (timestamp, bin_id, level);
+    CREATE INDEX weather_location_timestamp_idx
+        ON weather_api (location, timestamp, temp, precip, humid);
+"""
+
+QUERIES = {
+    "specific period (bin, month)": (
+        "SELECT timestamp, level FROM waste "
+        "WHERE bin_id = 7 AND timestamp >= '2024-03-01 00:00:00' "
+        "AND timestamp < '2024-04-01 00:00:00' ORDER BY timestamp DESC"),
+    "weather for location (month)": (
+        "SELECT location, timestamp, temp, precip, humid FROM weather_api "
+        "WHERE location = 'Location 7' "
+        "AND timestamp >= '2024-03-01 00:00:00' "
+        "AND timestamp < '2024-04-01 00:00:00'"),
+    "list period totals (day)": (
+        "SELECT bin_id, SUM(level) FROM waste "
+        "WHERE timestamp >= '2024-03-15 00:00:00' "
+        "AND timestamp < '2024-03-16 00:00:00' GROUP BY bin_id"),
+    "latest reading (global)": (
+        "SELECT timestamp FROM waste ORDER BY timestamp DESC LIMIT 1"),
+    "latest reading (bin)": (
+        "SELECT timestamp FROM waste WHERE bin_id = 7 "
+        "ORDER BY timestamp DESC LIMIT 1"),
+}
+
+
+def populate(connection: sqlite3.Connection, bins: int, days: int) -> int:
+    """
+    Fill the database with one hourly waste and weather reading per bin.
+
+    :param connection: Connection to the benchmark database.
+    :param bins: Number of bins, each in its own location.
+    :param days: Number of days of readings, ending on 2024-12-31.
+
+    :return: The number of waste rows created.
+    """
+    random.seed(0)
+    connection.executescript(TABLES)
+    connection.executemany(
+        "INSERT INTO bin (bin_id, name, location) VALUES (?, ?, ?)",
+        ((bin_id, f"Bin {bin_id}", f"Location {bin_id}")
+         for bin_id in range(1, bins + 1)))
+    start = datetime(2025, 1, 1) - timedelta(days=days)
+    hours = [(start + timedelta(hours=hour)).strftime("%Y-%m-%d %H:%M:%S")
+             for hour in range(days * 24)]
+    connection.executemany(
+        "INSERT INTO waste (bin_id, timestamp, level) VALUES (?, ?, ?)",
+        ((bin_id, hour, round(random.uniform(0, 5), 2))
+         for hour in hours for bin_id in range(1, bins + 1)))
+    connection.executemany(
+        "INSERT INTO weather_api (timestamp, location, temp, precip, humid) "
+        "VALUES (?, ?, ?, ?, ?)",
+        ((hour, f"Location {bin_id}", round(random.uniform(25, 38), 2),
+          round(random.uniform(0, 3), 2), round(random.uniform(40, 90), 2))
+         for hour in hours for bin_id in range(1, bins + 1)))
+    connection.commit()
+    return len(hours) * bins
+
+
+def run_queries(connection: sqlite3.Connection, repeat: int) -> dict:
+    """
+    Explain and time every benchmark query.
+
+    :param connection: Connection to the benchmark database.
+    :param repeat: Number of times each query is timed; the best time is kept.
+
+    :return: Query plan and best time in milliseconds keyed by query name.
+    """
+    results = {}
+    for name, sql in QUERIES.items():
+        plan = [row[-1] for row in
+                connection.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            connection.execute(sql).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = (plan, min(timings))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bins", type=int, default=200)
+    parser.add_argument("--days", type=int, default=420)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection = sqlite3.connect(os.path.join(directory, "bench.sqlite3"))
+        started = time.perf_counter()
+        rows = populate(connection, args.bins, args.days)
+        print(f"Generated {rows:,} waste rows and {rows:,} weather rows "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        before = run_queries(connection, args.repeat)
+        started = time.perf_counter()
+        connection.executescript(INDEXES)
+        connection.execute("ANALYZE")
+        print(f"Created indexes in {time.perf_counter() - started:.1f}s")
+        after = run_queries(connection, args.repeat)
+        connection.close()
+
+    for name in QUERIES:
+        (plan_before, ms_before), (plan_after, ms_after) = \
+            before[name], after[name]
+        print(f"\n{name}: {ms_before:.2f} ms -> {ms_after:.2f} ms")
+        print(f"  before: {'; '.join(plan_before)}")
+        print(f"  after:  {'; '.join(plan_after)}")
+
+
+if __name__ == "__main__":
+    main()
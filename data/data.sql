@@ -1720,7 +1720,10 @@ ALTER TABLE `bin`
 --
 ALTER TABLE `waste`
   ADD PRIMARY KEY (`waste_id`),
-  ADD UNIQUE KEY `waste_id` (`waste_id`);
+  ADD UNIQUE KEY `waste_id` (`waste_id`),
+  ADD UNIQUE KEY `waste_bin_timestamp_uniq` (`bin_id`,`timestamp`),
+  ADD KEY `waste_bin_timestamp_idx` (`bin_id`,`timestamp`,`level`),
+  ADD KEY `waste_timestamp_idx` (`timestamp`,`bin_id`,`level`);
 
 --
 -- Indexes for table `waste_record`
@@ -1734,7 +1737,8 @@ ALTER TABLE `waste_record`
 --
 ALTER TABLE `weather_api`
   ADD PRIMARY KEY (`weather_id`),
-  ADD UNIQUE KEY `weather_id` (`weather_id`);
+  ADD UNIQUE KEY `weather_id` (`weather_id`),
+  ADD KEY `weather_location_timestamp_idx` (`location`,`timestamp`,`temp`,`precip`,`humid`);
 
 --
 -- AUTO_INCREMENT for dumped tables
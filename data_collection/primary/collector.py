@@ -0,0 +1,234 @@
+import json
+import time
+
+# Readings taken before the clock was set (e.g. by NTP) are sent without a timestamp.
+MIN_VALID_YEAR = 2024
+
+
+def format_timestamp(seconds=None):
+    """
+    Format a time as an ISO 8601 UTC timestamp.
+    Returns None if the clock has not been set yet.
+    """
+    t = time.gmtime(seconds)
+    if t[0] < MIN_VALID_YEAR:
+        return None
+    return "%04d-%02d-%02dT%02d:%02d:%02dZ" % t[:6]
+
+
+class RingBuffer:
+    """
+    Fixed-size FIFO buffer in RAM. When it is full, the oldest item is overwritten.
+    """
+    def __init__(self, capacity):
+        self.items = [None] * capacity
+        self.capacity = capacity
+        self.start = 0
+        self.count = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, item):
+        """
+        Add an item, overwriting the oldest one if the buffer is full.
+        """
+        if self.count == self.capacity:
+            self.items[self.start] = item
+            self.start = (self.start + 1) % self.capacity
+            self.dropped += 1
+        else:
+            self.items[(self.start + self.count) % self.capacity] = item
+            self.count += 1
+
+    def peek(self, n):
+        """
+        Return up to n of the oldest items without removing them.
+        """
+        return [self.items[(self.start + i) % self.capacity]
+                for i in range(min(n, self.count))]
+
+    def discard(self, n):
+        """
+        Remove up to n of the oldest items.
+        """
+        n = min(n, self.count)
+        for i in range(n):
+            self.items[(self.start + i) % self.capacity] = None
+        self.start = (self.start + n) % self.capacity
+        self.count -= n
+
+
+class Collector:
+    """
+    Measures the waste added to a bin and publishes the readings over one long-lived MQTT session.
+
+    Readings are buffered in a ring buffer and published in batches of up to batch_size readings
+    once publish_every readings have been collected. While the network or the broker is
+    unreachable, readings stay in the buffer and the backlog is published on reconnect.
+    Payloads have the form {"bin_id": ..., "readings": [{"timestamp": ..., "level": ...}]}.
+    """
+    def __init__(self, client, wlan, sensor, bin_id, bin_capacity, topic,
+                 wifi_ssid, wifi_pass, buffer_size=48, batch_size=12, publish_every=1,
+                 keepalive=7200, connect_timeout=10, samples=5, on_connection=None,
+                 on_connect=None):
+        """
+        client: MQTT client with connect, publish, ping and disconnect, e.g. umqtt.simple.MQTTClient
+        wlan: Station interface with isconnected, active and connect, e.g. network.WLAN
+        sensor: Distance sensor with sample_cm, e.g. HCSR04
+        keepalive: MQTT keepalive in seconds. The connection is pinged every keepalive // 2 seconds.
+        connect_timeout: Seconds to wait for Wi-Fi before giving up until the next reading
+        samples: Number of pulses the sensor filters into one measurement
+        on_connection: Called with True or False when the connection state changes
+        on_connect: Called after the broker connection is (re)established, e.g. to set the clock
+        """
+        self.client = client
+        self.wlan = wlan
+        self.sensor = sensor
+        self.bin_id = bin_id
+        self.bin_capacity = bin_capacity
+        self.topic = topic
+        self.wifi_ssid = wifi_ssid
+        self.wifi_pass = wifi_pass
+        self.buffer = RingBuffer(buffer_size)
+        self.batch_size = batch_size
+        self.publish_every = publish_every
+        self.keepalive = keepalive
+        self.connect_timeout = connect_timeout
+        self.samples = samples
+        self.on_connection = on_connection
+        self.on_connect = on_connect
+        self.connected = False
+        self.previous_level = 1
+        self.connects = 0
+        self.failed_samples = 0
+
+    def measure(self):
+        """
+        Get the waste added since the previous measurement, in centimeters.
+        Drops and changes smaller than 1cm, e.g. after the bin was emptied, count as 0.
+        """
+        current_level = self.bin_capacity - self.sensor.sample_cm(self.samples)
+        waste_added = current_level - self.previous_level
+        self.previous_level = current_level
+        if waste_added < 1:
+            waste_added = 0
+        return round(waste_added, 2)
+
+    def sample(self):
+        """
+        Take a measurement and buffer it with the current time.
+        Measurements the sensor could not filter into a distance are skipped, not sent.
+        """
+        try:
+            level = self.measure()
+        except OSError as e:
+            print("Measurement failed:", e)
+            self.failed_samples += 1
+            return
+        reading = {"level": level}
+        timestamp = format_timestamp()
+        if timestamp:
+            reading["timestamp"] = timestamp
+        self.buffer.append(reading)
+
+    def set_connected(self, connected):
+        if connected != self.connected:
+            self.connected = connected
+            if self.on_connection:
+                self.on_connection(connected)
+
+    def connect(self):
+        """
+        Make sure Wi-Fi and the MQTT session are up. Returns whether they are.
+        The session is persistent (clean_session=False), so the broker keeps it across reconnects.
+        """
+        if self.connected:
+            return True
+        try:
+            if not self.wlan.isconnected():
+                self.wlan.active(True)
+                self.wlan.connect(self.wifi_ssid, self.wifi_pass)
+                deadline = time.time() + self.connect_timeout
+                while not self.wlan.isconnected():
+                    if time.time() >= deadline:
+                        return False
+                    time.sleep(0.1)
+            self.client.connect(clean_session=False)
+        except Exception as e:
+            print("Connect failed:", e)
+            return False
+        self.connects += 1
+        self.set_connected(True)
+        if self.on_connect:
+            try:
+                self.on_connect()
+            except Exception as e:
+                print("on_connect failed:", e)
+        return True
+
+    def drop_connection(self):
+        self.set_connected(False)
+        try:
+            self.client.disconnect()
+        except Exception:
+            pass
+
+    def publish(self):
+        """
+        Publish the buffered readings in batches. Returns the number of published readings.
+        Readings are only removed from the buffer once their batch was published.
+        """
+        published = 0
+        while len(self.buffer):
+            batch = self.buffer.peek(self.batch_size)
+            payload = json.dumps({"bin_id": self.bin_id, "readings": batch})
+            try:
+                self.client.publish(self.topic, payload, qos=1)
+            except Exception as e:
+                print("Publish failed:", e)
+                self.drop_connection()
+                break
+            self.buffer.discard(len(batch))
+            published += len(batch)
+        return published
+
+    def ping(self):
+        """
+        Keep the MQTT session alive between publishes.
+        """
+        if not self.connected:
+            return
+        try:
+            self.client.ping()
+        except Exception as e:
+            print("Ping failed:", e)
+            self.drop_connection()
+
+    def step(self):
+        """
+        Take a reading and publish the buffer when enough readings are due.
+        """
+        self.sample()
+        if len(self.buffer) >= self.publish_every and self.connect():
+            self.publish()
+
+    def wait(self, seconds, sleep=time.sleep):
+        """
+        Wait until the next reading, pinging the broker every keepalive // 2 seconds.
+        """
+        interval = max(self.keepalive // 2, 1)
+        while seconds > 0:
+            sleep(min(interval, seconds))
+            seconds -= interval
+            if seconds > 0:
+                self.ping()
+
+    def run(self, sample_interval):
+        while True:
+            try:
+                self.step()
+            except Exception as e:
+                print("Exception:", e)
+            self.wait(sample_interval)
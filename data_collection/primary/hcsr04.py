@@ -1,5 +1,5 @@
 from machine import Pin, time_pulse_us
-from utime import sleep_us
+from utime import sleep_us, sleep_ms
 
 __version__ = '0.2.1'
 __author__ = 'Roberto Sánchez'
@@ -13,6 +13,10 @@ class HCSR04:
     The timeouts received listening to echo pin are converted to OSError('Out of range')
 
     """
+    # Readings outside the sensor range (2cm to 4m) are discarded by the sampling methods
+    MIN_RANGE_MM = 20
+    MAX_RANGE_MM = 4000
+
     # echo_timeout_us is based in chip range limit (400cm)
     def __init__(self, trigger_pin, echo_pin, echo_timeout_us=500*2*30):
         """
@@ -29,10 +33,10 @@ class HCSR04:
         # Init echo pin (in)
         self.echo = Pin(echo_pin, mode=Pin.IN, pull=None)
 
-    def _send_pulse_and_wait(self):
+    def _pulse(self):
         """
         Send the pulse to trigger and listen on echo pin.
-        We use the method `machine.time_pulse_us()` to get the microseconds until the echo is received.
+        Returns the microseconds until the echo is received, or a negative number on timeout.
         """
         self.trigger.value(0) # Stabilize the sensor
         sleep_us(5)
@@ -40,10 +44,17 @@ class HCSR04:
         # Send a 10us pulse.
         sleep_us(10)
         self.trigger.value(0)
+        # time_pulse_us returns -2 if there was timeout waiting for condition; and -1 if there was timeout during the main measurement. It DOES NOT raise an exception
+        # ...as of MicroPython 1.17: http://docs.micropython.org/en/v1.17/library/machine.html#machine.time_pulse_us
+        return time_pulse_us(self.echo, 1, self.echo_timeout_us)
+
+    def _send_pulse_and_wait(self):
+        """
+        Send the pulse to trigger and listen on echo pin.
+        We use the method `machine.time_pulse_us()` to get the microseconds until the echo is received.
+        """
         try:
-            pulse_time = time_pulse_us(self.echo, 1, self.echo_timeout_us)
-            # time_pulse_us returns -2 if there was timeout waiting for condition; and -1 if there was timeout during the main measurement. It DOES NOT raise an exception
-            # ...as of MicroPython 1.17: http://docs.micropython.org/en/v1.17/library/machine.html#machine.time_pulse_us
+            pulse_time = self._pulse()
             if pulse_time < 0:
                 MAX_RANGE_IN_CM = const(500) # it's really ~400 but I've read people say they see it working up to ~460
                 pulse_time = int(MAX_RANGE_IN_CM * 29.1) # 1cm each 29.1us
@@ -80,3 +91,65 @@ class HCSR04:
         # 0.034320 cm/us that is 1cm each 29.1us
         cms = (pulse_time / 2) / 29.1
         return cms
+
+    def sample_mm(self, samples=5, interval_ms=60, trim=None, max_deviation_mm=50,
+                  min_valid=None):
+        """
+        Get a filtered distance in milimeters from several pulses, without floating point operations.
+
+        samples: Number of pulses to send
+        interval_ms: Milliseconds between pulses. The datasheet recommends at least 60ms so
+        the echo of one pulse is not taken for the echo of the next one
+        trim: Number of the lowest and of the highest readings to drop before averaging the
+        rest. By default the median is returned instead of a mean
+        max_deviation_mm: Readings further than this from the median of the valid readings
+        are rejected as outliers, e.g. echoes from the side of the bin
+        min_valid: Number of readings that have to remain after rejecting timeouts, readings out of
+        range and outliers. By default more than half of the samples
+
+        Raises OSError('Out of range') if fewer than min_valid readings remain.
+        """
+        if min_valid is None:
+            min_valid = samples // 2 + 1
+        readings = []
+        for i in range(samples):
+            if i:
+                sleep_ms(interval_ms)
+            try:
+                pulse_time = self._pulse()
+            except OSError:
+                continue
+            # Timeouts are skipped instead of being counted as the maximum range
+            if pulse_time < 0:
+                continue
+            mm = pulse_time * 100 // 582
+            if self.MIN_RANGE_MM <= mm <= self.MAX_RANGE_MM:
+                readings.append(mm)
+        readings.sort()
+        if readings and max_deviation_mm is not None:
+            median = _median(readings)
+            readings = [mm for mm in readings if abs(mm - median) <= max_deviation_mm]
+        if not readings or len(readings) < min_valid:
+            raise OSError('Out of range')
+        if trim is None:
+            return _median(readings)
+        if 2 * trim < len(readings):
+            readings = readings[trim:len(readings) - trim]
+        return sum(readings) // len(readings)
+
+    def sample_cm(self, samples=5, **kwargs):
+        """
+        Get a filtered distance in centimeters from several pulses. See sample_mm.
+        It returns a float
+        """
+        return self.sample_mm(samples, **kwargs) / 10
+
+
+def _median(readings):
+    """
+    Get the median of sorted integer readings, rounded down.
+    """
+    middle = len(readings) // 2
+    if len(readings) % 2:
+        return readings[middle]
+    return (readings[middle - 1] + readings[middle]) // 2
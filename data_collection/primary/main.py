@@ -1,15 +1,23 @@
 import network
-import json
-from time import sleep
-from machine import Pin
+import ntptime
+import ubinascii
+from machine import Pin, unique_id
 from hcsr04 import HCSR04
-from umqtt.robust import MQTTClient
+from umqtt.simple import MQTTClient
+from collector import Collector
+import config
 from config import (
     WIFI_SSID, WIFI_PASS,
     MQTT_BROKER, MQTT_USER, MQTT_PASS,
     BIN_ID, BIN_CAPACITY
 )
 
+SAMPLE_INTERVAL = getattr(config, "SAMPLE_INTERVAL", 3600)
+PUBLISH_EVERY = getattr(config, "PUBLISH_EVERY", 1)
+BUFFER_SIZE = getattr(config, "BUFFER_SIZE", 48)
+KEEPALIVE = getattr(config, "KEEPALIVE", 2 * SAMPLE_INTERVAL)
+SAMPLES = getattr(config, "SAMPLES", 5)
+
 led_wifi = Pin(2, Pin.OUT)
 led_wifi.value(1)
 led_iot = Pin(12, Pin.OUT)
@@ -19,45 +27,22 @@ sensor = HCSR04(trigger_pin=19, echo_pin=18)
 
 wlan = network.WLAN(network.STA_IF)
 
-mqtt = MQTTClient(client_id="",
+# A fixed client ID lets the broker resume the persistent session after a reconnect.
+mqtt = MQTTClient(client_id=b"bin-" + ubinascii.hexlify(unique_id()),
                   server=MQTT_BROKER,
                   user=MQTT_USER,
-                  password=MQTT_PASS)
-
-previous_level = 1
-
-while True:
-    try:
-        if not wlan.isconnected():
-            led_wifi.value(1)
-            wlan.active(True)
-            wlan.connect(WIFI_SSID, WIFI_PASS)
-            while not wlan.isconnected():
-                sleep(0.1)
-            led_wifi.value(0)
-
-        mqtt.connect()
-        led_iot.value(0)
-
-        current_level = BIN_CAPACITY - sensor.distance_cm()
-        waste_added = current_level - previous_level
-        previous_level = current_level
-        
-        if waste_added < 1:
-            waste_added = 0
-
-        data = {
-            "bin_id": BIN_ID,
-            "level": waste_added
-        }
+                  password=MQTT_PASS,
+                  keepalive=KEEPALIVE)
 
-        mqtt.publish("b6510545641/waste", json.dumps(data))
 
-    except Exception as e:
-        print("Exception:", e)
+def on_connection(connected):
+    led_wifi.value(0 if wlan.isconnected() else 1)
+    led_iot.value(0 if connected else 1)
 
-    finally:
-        mqtt.disconnect()
-        led_iot.value(1)
 
-    sleep(3600)
+collector = Collector(mqtt, wlan, sensor, BIN_ID, BIN_CAPACITY,
+                      "b6510545641/waste", WIFI_SSID, WIFI_PASS,
+                      buffer_size=BUFFER_SIZE, publish_every=PUBLISH_EVERY,
+                      keepalive=KEEPALIVE, samples=SAMPLES, on_connection=on_connection,
+                      on_connect=ntptime.settime)
+collector.run(SAMPLE_INTERVAL)
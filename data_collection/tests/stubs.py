@@ -0,0 +1,127 @@
+import binascii
+import os
+import sys
+import types
+from unittest import mock
+
+PRIMARY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "primary")
+
+
+class FakePin:
+    """
+    Stand-in for machine.Pin that records the values written to it.
+    """
+    OUT = 1
+    IN = 0
+
+    def __init__(self, pin, mode=None, pull=None):
+        self.pin = pin
+        self.mode = mode
+        self.values = []
+
+    def value(self, value=None):
+        if value is None:
+            return self.values[-1] if self.values else 0
+        self.values.append(value)
+
+
+class FakeMQTTClient:
+    """
+    Stand-in for umqtt.simple.MQTTClient that records the published messages.
+    Set fail to an exception to make the next calls raise it.
+    """
+
+    def __init__(self, client_id=b"", server=None, user=None, password=None,
+                 keepalive=0, **kwargs):
+        self.client_id = client_id
+        self.server = server
+        self.keepalive = keepalive
+        self.published = []
+        self.connects = []
+        self.pings = 0
+        self.fail = None
+
+    def connect(self, clean_session=True):
+        if self.fail:
+            raise self.fail
+        self.connects.append(clean_session)
+        return False
+
+    def publish(self, topic, msg, retain=False, qos=0):
+        if self.fail:
+            raise self.fail
+        self.published.append((topic, msg, qos))
+
+    def ping(self):
+        if self.fail:
+            raise self.fail
+        self.pings += 1
+
+    def disconnect(self):
+        pass
+
+
+class FakeWLAN:
+    """
+    Stand-in for network.WLAN that connects immediately unless it is offline.
+    """
+
+    def __init__(self, interface=None):
+        self.online = True
+        self.connected = False
+
+    def isconnected(self):
+        return self.connected
+
+    def active(self, active=None):
+        return True
+
+    def connect(self, ssid, password):
+        self.connected = self.online
+
+
+def get_stub_modules():
+    """
+    Get stand-ins for the MicroPython modules used by the collector, to be installed in
+    sys.modules, e.g. with unittest.mock.patch.dict.
+    """
+    machine = types.ModuleType("machine")
+    machine.Pin = FakePin
+    machine.unique_id = lambda: b"\x01\x02\x03\x04"
+    machine.time_pulse_us = lambda pin, level, timeout_us: -2
+    network = types.ModuleType("network")
+    network.STA_IF = 0
+    network.WLAN = FakeWLAN
+    ntptime = types.ModuleType("ntptime")
+    ntptime.settime = lambda: None
+    ubinascii = types.ModuleType("ubinascii")
+    ubinascii.hexlify = binascii.hexlify
+    utime = types.ModuleType("utime")
+    utime.sleep_us = lambda us: None
+    utime.sleep_ms = lambda ms: None
+    umqtt = types.ModuleType("umqtt")
+    umqtt_simple = types.ModuleType("umqtt.simple")
+    umqtt_simple.MQTTClient = FakeMQTTClient
+    umqtt.simple = umqtt_simple
+    config = types.ModuleType("config")
+    config.WIFI_SSID = "ssid"
+    config.WIFI_PASS = "password"
+    config.MQTT_BROKER = "broker"
+    config.MQTT_USER = "user"
+    config.MQTT_PASS = "password"
+    config.BIN_ID = 1
+    config.BIN_CAPACITY = 100
+    return {"machine": machine, "network": network, "ntptime": ntptime,
+            "ubinascii": ubinascii, "utime": utime, "umqtt": umqtt,
+            "umqtt.simple": umqtt_simple, "config": config}
+
+
+def install_stubs(test_case):
+    """
+    Install the MicroPython stand-ins and make the modules in data_collection/primary importable
+    for the duration of a test.
+    """
+    for patcher in (mock.patch.dict(sys.modules, get_stub_modules()),
+                    mock.patch.object(sys, "path", [PRIMARY_DIR] + sys.path)):
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
@@ -0,0 +1,159 @@
+import importlib
+import json
+import time
+from unittest import TestCase, mock
+
+from .stubs import FakeMQTTClient, FakeWLAN, install_stubs
+
+
+class FakeSensor:
+    """
+    Distance sensor returning a fixed sequence of distances.
+    """
+
+    def __init__(self, distances):
+        self.distances = list(distances)
+
+    def sample_cm(self, samples=5):
+        distance = self.distances.pop(0)
+        if distance is None:
+            raise OSError("Out of range")
+        return distance
+
+
+class CollectorTest(TestCase):
+    """
+    Test case for the MicroPython collector, run on CPython with stubbed MicroPython modules.
+    """
+
+    def setUp(self):
+        install_stubs(self)
+        self.collector_module = importlib.import_module("collector")
+        self.client = FakeMQTTClient()
+        self.wlan = FakeWLAN()
+
+    def create_collector(self, distances, **kwargs):
+        return self.collector_module.Collector(
+            self.client, self.wlan, FakeSensor(distances), 1, 100, "b6510545641/waste",
+            "ssid", "password", **kwargs)
+
+    def published_readings(self):
+        return [json.loads(msg) for _, msg, _ in self.client.published]
+
+    def test_ring_buffer(self):
+        """
+        Test that a full ring buffer overwrites its oldest items.
+        """
+        buffer = self.collector_module.RingBuffer(3)
+        for item in range(5):
+            buffer.append(item)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual(buffer.peek(2), [2, 3])
+        buffer.discard(2)
+        buffer.append(5)
+        self.assertEqual(buffer.peek(10), [4, 5])
+
+    def test_single_session(self):
+        """
+        Test that one persistent session is used for every reading.
+        """
+        collector = self.create_collector([90, 80, 80])
+        for _ in range(3):
+            collector.step()
+        self.assertEqual(self.client.connects, [False])
+        self.assertEqual([message["readings"][0]["level"]
+                          for message in self.published_readings()], [9, 10, 0])
+        self.assertEqual(self.published_readings()[0]["bin_id"], 1)
+        self.assertIn("timestamp", self.published_readings()[0]["readings"][0])
+        self.assertEqual(self.client.published[0][2], 1)
+
+    def test_batching(self):
+        """
+        Test that readings are published in batches once publish_every readings are buffered.
+        """
+        collector = self.create_collector([90, 80, 70, 60, 50], publish_every=5,
+                                          batch_size=2)
+        for _ in range(4):
+            collector.step()
+        self.assertEqual(self.client.published, [])
+        self.assertEqual(self.client.connects, [])
+        collector.step()
+        self.assertEqual([len(message["readings"]) for message in self.published_readings()],
+                         [2, 2, 1])
+
+    def test_offline_backlog(self):
+        """
+        Test that readings taken while offline are buffered and published on reconnect.
+        """
+        collector = self.create_collector([90, 80, 70, 60], buffer_size=2,
+                                          connect_timeout=0)
+        self.wlan.online = False
+        for _ in range(3):
+            collector.step()
+        self.assertEqual(len(collector.buffer), 2)
+        self.assertEqual(collector.buffer.dropped, 1)
+        self.wlan.online = True
+        collector.step()
+        self.assertEqual(len(self.published_readings()), 1)
+        self.assertEqual([reading["level"] for reading in self.published_readings()[0]["readings"]],
+                         [10, 10])
+
+    def test_publish_failure(self):
+        """
+        Test that readings stay buffered when publishing fails and the session is reconnected later.
+        """
+        states = []
+        collector = self.create_collector([90, 80], on_connection=states.append)
+        collector.connect()
+        self.client.fail = OSError("connection reset")
+        collector.step()
+        self.assertFalse(collector.connected)
+        self.assertEqual(len(collector.buffer), 1)
+        self.client.fail = None
+        collector.step()
+        self.assertEqual(len(collector.buffer), 0)
+        self.assertEqual(len(self.published_readings()[0]["readings"]), 2)
+        self.assertEqual(states, [True, False, True])
+        self.assertEqual(collector.connects, 2)
+
+    def test_failed_measurement(self):
+        """
+        Test that a measurement the sensor could not filter is skipped instead of published.
+        """
+        collector = self.create_collector([90, None, 80])
+        for _ in range(3):
+            collector.step()
+        self.assertEqual(collector.failed_samples, 1)
+        self.assertEqual([message["readings"][0]["level"]
+                          for message in self.published_readings()], [9, 10])
+
+    def test_wait_pings(self):
+        """
+        Test that the session is kept alive while waiting for the next reading.
+        """
+        collector = self.create_collector([], keepalive=600)
+        collector.connect()
+        sleeps = []
+        collector.wait(3600, sleep=sleeps.append)
+        self.assertEqual(sleeps, [300] * 12)
+        self.assertEqual(self.client.pings, 11)
+
+    def test_timestamp_before_clock_is_set(self):
+        """
+        Test that readings are sent without a timestamp before the clock is set.
+        """
+        self.assertIsNone(self.collector_module.format_timestamp(0))
+        self.assertEqual(self.collector_module.format_timestamp(1713866400),
+                         "2024-04-23T10:00:00Z")
+
+    def test_main(self):
+        """
+        Test that main.py wires the collector to the MQTT client with a fixed client ID.
+        """
+        with mock.patch.object(self.collector_module.Collector, "run") as run:
+            main = importlib.import_module("main")
+        run.assert_called_once_with(3600)
+        self.assertEqual(main.mqtt.client_id, b"bin-01020304")
+        self.assertEqual(main.mqtt.keepalive, 7200)
+        self.assertIs(main.collector.client, main.mqtt)
@@ -0,0 +1,99 @@
+import builtins
+import importlib
+from unittest import TestCase, mock
+
+from .stubs import install_stubs
+
+
+def pulse_time(mm):
+    """
+    Get the echo time of a distance, the inverse of HCSR04.distance_mm.
+    """
+    return (mm * 582 + 99) // 100
+
+
+class HCSR04Test(TestCase):
+    """
+    Test case for the multi-sample distance reading of the HCSR04 driver.
+    """
+
+    def setUp(self):
+        install_stubs(self)
+        self.hcsr04 = importlib.import_module("hcsr04")
+        self.sensor = self.hcsr04.HCSR04(trigger_pin=19, echo_pin=18)
+        self.sleeps = []
+        for patcher in (mock.patch.object(self.hcsr04, "sleep_ms", self.sleeps.append),
+                        mock.patch.object(builtins, "const", lambda value: value,
+                                          create=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def set_echoes(self, echoes):
+        """
+        Make the echo pin return the given pulse times, in order.
+        """
+        patcher = mock.patch.object(self.hcsr04, "time_pulse_us", side_effect=echoes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_median(self):
+        """
+        Test that the median of the pulses is returned, with the configured spacing between pulses.
+        """
+        self.set_echoes([pulse_time(mm) for mm in (500, 520, 510, 505, 515)])
+        self.assertEqual(self.sensor.sample_mm(), 510)
+        self.assertEqual(self.sleeps, [60] * 4)
+
+    def test_median_of_even_count(self):
+        """
+        Test that the median of an even number of readings is rounded down.
+        """
+        self.set_echoes([pulse_time(mm) for mm in (500, 503, 510, 520)])
+        self.assertEqual(self.sensor.sample_mm(samples=4, interval_ms=100), 506)
+        self.assertEqual(self.sleeps, [100] * 3)
+
+    def test_trimmed_mean(self):
+        """
+        Test that the mean of the readings is returned after dropping the lowest and highest ones.
+        """
+        self.set_echoes([pulse_time(mm) for mm in (500, 530, 510, 520, 560)])
+        self.assertEqual(self.sensor.sample_mm(trim=1, max_deviation_mm=None), 520)
+
+    def test_outliers(self):
+        """
+        Test that readings far from the median and readings out of range are rejected.
+        """
+        self.set_echoes([pulse_time(mm) for mm in (500, 1500, 510, 10, 505, 5000, 515)])
+        self.assertEqual(self.sensor.sample_mm(samples=7, trim=0), 507)
+
+    def test_timeouts(self):
+        """
+        Test that timeouts are skipped instead of being read as the maximum range.
+        """
+        self.set_echoes([-2, pulse_time(500), -1, pulse_time(502), pulse_time(504)])
+        self.assertEqual(self.sensor.sample_mm(), 502)
+
+    def test_too_few_valid_readings(self):
+        """
+        Test that an error is raised when fewer than min_valid readings remain.
+        """
+        self.set_echoes([-2, pulse_time(500), -1, -2, pulse_time(502)])
+        with self.assertRaisesRegex(OSError, "Out of range"):
+            self.sensor.sample_mm()
+        self.set_echoes([-2, -2, -2])
+        with self.assertRaisesRegex(OSError, "Out of range"):
+            self.sensor.sample_cm(samples=3, min_valid=1)
+
+    def test_sample_cm(self):
+        """
+        Test that the distance in centimeters is the filtered distance in milimeters divided by 10.
+        """
+        self.set_echoes([pulse_time(mm) for mm in (505, 505, 505)])
+        self.assertEqual(self.sensor.sample_cm(samples=3), 50.5)
+
+    def test_single_pulse_timeout(self):
+        """
+        Test that distance_mm still reads a timeout as the maximum range.
+        """
+        self.set_echoes([-2])
+        self.assertEqual(self.sensor.distance_mm(), 2500)
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'waste.middleware.QueryMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,17 +76,140 @@ WSGI_APPLICATION = 'mysite.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connections are taken from a pool of up to DB_POOL_SIZE connections per process (0 disables
+# the pool). Closing a connection at the end of a request returns it to the pool, and
+# DB_CONN_MAX_AGE keeps it attached to its thread for that many seconds instead.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'waste.db.backends.mysql',
         'NAME': config('DB_NAME'),
         'USER': config('DB_USER'),
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT'),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', cast=int, default=0),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', cast=bool, default=True),
+        'OPTIONS': {
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', cast=int, default=10),
+        },
+        'POOL': {
+            'MAX_SIZE': config('DB_POOL_SIZE', cast=int, default=10),
+            'IDLE_TIMEOUT': config('DB_POOL_IDLE_TIMEOUT', cast=float, default=300),
+            'HEALTH_CHECK_INTERVAL': config('DB_POOL_HEALTH_CHECK_INTERVAL', cast=float, default=30),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', cast=float, default=10),
+        },
+    }
+}
+
+# Read replicas of the database, as comma-separated HOST or HOST:PORT entries, which are
+# configured like the primary as replica_1, replica_2 and so on.
+for index, replica in enumerate(config('DB_REPLICA_HOSTS', cast=Csv(), default=''), start=1):
+    replica_host, _, replica_port = replica.partition(':')
+    DATABASES[f'replica_{index}'] = DATABASES['default'] | {
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['waste.db.ReplicaRouter']
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND',
+                          default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='waste-watcher'),
     }
 }
 
+# Seconds the latest waste reading of a bin, location or all bins stays cached.
+WASTE_LATEST_CACHE_TIMEOUT = config('WASTE_LATEST_CACHE_TIMEOUT', cast=int,
+                                    default=60)
+
+# Seconds an API response of an open period stays cached. Responses of closed periods
+# are cached until readings of a previous day change, or for at most
+# WASTE_ARCHIVE_CACHE_TIMEOUT seconds, since the changes made by other processes only
+# discard them when the cache is shared.
+WASTE_RESPONSE_CACHE_TIMEOUT = config('WASTE_RESPONSE_CACHE_TIMEOUT', cast=int,
+                                      default=300)
+WASTE_ARCHIVE_CACHE_TIMEOUT = config('WASTE_ARCHIVE_CACHE_TIMEOUT', cast=int,
+                                     default=3600)
+
+# Default and maximum number of records per page of the waste records API.
+WASTE_RECORDS_PAGE_SIZE = config('WASTE_RECORDS_PAGE_SIZE', cast=int,
+                                 default=1000)
+WASTE_RECORDS_MAX_PAGE_SIZE = config('WASTE_RECORDS_MAX_PAGE_SIZE', cast=int,
+                                     default=10000)
+
+# Token required in the "Authorization: Token <token>" header of the ingest API. Without a token the
+# ingest API rejects every client, unless anonymous ingestion is explicitly allowed.
+WASTE_INGEST_TOKEN = config('WASTE_INGEST_TOKEN', default='')
+WASTE_INGEST_ALLOW_ANONYMOUS = config('WASTE_INGEST_ALLOW_ANONYMOUS', cast=bool,
+                                      default=False)
+# Maximum number of readings per ingest request and per INSERT statement.
+WASTE_INGEST_MAX_READINGS = config('WASTE_INGEST_MAX_READINGS', cast=int,
+                                   default=50000)
+WASTE_INGEST_BATCH_SIZE = config('WASTE_INGEST_BATCH_SIZE', cast=int,
+                                 default=1000)
+
+# MQTT broker and topic the bins publish their readings to, consumed by manage.py ingest_mqtt.
+MQTT_BROKER = config('MQTT_BROKER', default='')
+MQTT_PORT = config('MQTT_PORT', cast=int, default=1883)
+MQTT_USER = config('MQTT_USER', default='')
+MQTT_PASS = config('MQTT_PASS', default='')
+MQTT_WASTE_TOPIC = config('MQTT_WASTE_TOPIC', default='b6510545641/waste')
+# Client ID of the persistent session, so the broker queues the readings published while the worker is down.
+MQTT_CLIENT_ID = config('MQTT_CLIENT_ID', default='waste-ingest')
+
+# Weather provider used by manage.py ingest_weather, and the endpoint and key of weatherapi.com.
+WEATHER_PROVIDER = config('WEATHER_PROVIDER',
+                          default='waste.services.WeatherAPIProvider')
+WEATHER_API_URL = config('WEATHER_API_URL',
+                         default='https://api.weatherapi.com/v1/current.json')
+WEATHER_API_KEY = config('WEATHER_API_KEY', default='')
+
+# Backend aggregating the waste and weather readings of the list and comparison endpoints:
+# 'sql' (GROUP BY in the database) or 'numpy' (requires numpy). Overridable per request with ?backend=.
+WASTE_AGGREGATION_BACKEND = config('WASTE_AGGREGATION_BACKEND', default='sql')
+
+# Log the SQL of requests issuing more database queries than this budget (0 disables the log).
+WASTE_QUERY_BUDGET = config('WASTE_QUERY_BUDGET', cast=int, default=0)
+
+# Serve the waste endpoints with their async views, which only pays off under an ASGI server.
+WASTE_ASYNC_VIEWS = config('WASTE_ASYNC_VIEWS', cast=bool, default=False)
+
+# Worker threads running the concurrent waste and weather queries of the async views.
+WASTE_ASYNC_QUERY_THREADS = config('WASTE_ASYNC_QUERY_THREADS', cast=int, default=16)
+
+# Database aliases of the read replicas. The analytics views read from a replica lagging behind
+# by at most WASTE_REPLICA_MAX_ANALYTICS_LAG seconds, the views of the latest readings from one
+# lagging behind by at most WASTE_REPLICA_MAX_LAG seconds, and both fall back to the primary.
+# The lag of a replica is queried at most every WASTE_REPLICA_LAG_CHECK_INTERVAL seconds.
+WASTE_REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+WASTE_REPLICA_MAX_LAG = config('WASTE_REPLICA_MAX_LAG', cast=float, default=5)
+WASTE_REPLICA_MAX_ANALYTICS_LAG = config('WASTE_REPLICA_MAX_ANALYTICS_LAG', cast=float,
+                                         default=300)
+WASTE_REPLICA_LAG_CHECK_INTERVAL = config('WASTE_REPLICA_LAG_CHECK_INTERVAL', cast=float,
+                                          default=5)
+
+# Monthly partitions of the waste and weather_api tables (MySQL): the number of future months
+# partition_tables creates partitions for, the number of months of readings it keeps (0 keeps
+# every month), and whether it archives expired months to their own tables instead of dropping them.
+WASTE_PARTITION_MONTHS_AHEAD = config('WASTE_PARTITION_MONTHS_AHEAD', cast=int, default=3)
+WASTE_PARTITION_RETENTION_MONTHS = config('WASTE_PARTITION_RETENTION_MONTHS', cast=int,
+                                          default=0)
+WASTE_PARTITION_ARCHIVE = config('WASTE_PARTITION_ARCHIVE', cast=bool, default=True)
+
+# Days of raw waste readings apply_retention keeps, including the current day (0 keeps every
+# reading), and the maximum number of readings it deletes per transaction. Older readings are
+# only kept in the hourly and daily rollups.
+WASTE_RAW_RETENTION_DAYS = config('WASTE_RAW_RETENTION_DAYS', cast=int, default=0)
+WASTE_RETENTION_BATCH_SIZE = config('WASTE_RETENTION_BATCH_SIZE', cast=int, default=10000)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
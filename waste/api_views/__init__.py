@@ -6,3 +6,17 @@ from .specific_latest_waste_api import SpecificLatestWasteAPI
 
 from .list_period_wastes_api import ListPeriodWastesAPI
 from .specific_period_waste_api import SpecificPeriodWasteAPI
+
+from .async_list_latest_wastes_api import AsyncListLatestWastesAPI
+from .async_specific_latest_waste_api import AsyncSpecificLatestWasteAPI
+from .async_list_period_wastes_api import AsyncListPeriodWastesAPI
+from .async_specific_period_waste_api import AsyncSpecificPeriodWasteAPI
+
+from .response_cache_stats_api import ResponseCacheStatsAPI
+
+from .ingest_wastes_api import IngestWastesAPI
+
+from .waste_series_api import WasteSeriesAPI
+
+from .request_metrics_api import RequestMetricsAPI
+from .connection_pool_stats_api import ConnectionPoolStatsAPI
@@ -0,0 +1,55 @@
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class AsyncAPIView:
+    """
+    Mixin serving the async GET handler of an API view natively under ASGI.
+
+    DRF dispatches requests synchronously, so the view is dispatched by Django instead and its
+    handler runs on the event loop. The request is wrapped in a DRF request for its query
+    parameters, and DRF responses are always rendered as JSON. Authentication, permissions and
+    content negotiation of DRF are not applied, so only public, read-only views should use it.
+    """
+    http_method_names = ["get", "head"]
+    http_method_not_allowed = View.http_method_not_allowed
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """
+        Create the async view function of the view.
+
+        :return: The view function.
+        """
+        return csrf_exempt(View.as_view.__func__(cls, **initkwargs))
+
+    def setup(self, request: HttpRequest, *args, **kwargs):
+        """
+        Initialize the attributes of the view for a request.
+
+        :param request: The request.
+        """
+        super().setup(request, *args, **kwargs)
+        self.request = Request(request)
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        """
+        Call the handler of the request method and prepare DRF responses for rendering.
+
+        :param request: The request.
+
+        :return: The response.
+        """
+        response = await View.dispatch(self, request, *args, **kwargs)
+        if isinstance(response, Response):
+            response.accepted_renderer = JSONRenderer()
+            response.accepted_media_type = JSONRenderer.media_type
+            response.renderer_context = {"view": self, "args": args,
+                                         "kwargs": kwargs, "request": self.request,
+                                         "response": response}
+        return response
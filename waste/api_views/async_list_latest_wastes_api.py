@@ -0,0 +1,37 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..db import read_from_replica
+from ..services import asummarize_bins, get_latest_readings
+from .async_api_view import AsyncAPIView
+from .cached_response import cached_response
+from .conditional_response import conditional_response
+from .list_latest_wastes_api import ListLatestWastesAPI
+
+
+class AsyncListLatestWastesAPI(AsyncAPIView, ListLatestWastesAPI):
+    """
+    Async version of ListLatestWastesAPI, which fetches the waste totals and weather summaries concurrently.
+    """
+
+    @read_from_replica(latest=True)
+    @conditional_response
+    @cached_response
+    async def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the aggregated waste and weather data of every bin for the latest date.
+
+        :returns: A list of dictionaries containing aggregated waste data and corresponding weather information for each bin for the latest date.
+        """
+        try:
+            backend = self.get_backend()
+        except ValueError as error:
+            return Response({"Error": str(error)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        readings = await sync_to_async(get_latest_readings)()
+        if readings is None:
+            return Response([], status=status.HTTP_200_OK)
+        _, wastes, weathers = readings
+        return Response(await asummarize_bins(wastes, weathers, backend),
+                        status=status.HTTP_200_OK)
@@ -0,0 +1,34 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..db import read_from_replica
+from ..services import asummarize_bins, get_period_totals
+from .async_api_view import AsyncAPIView
+from .cached_response import cached_response
+from .conditional_response import conditional_response
+from .list_period_wastes_api import ListPeriodWastesAPI
+
+
+class AsyncListPeriodWastesAPI(AsyncAPIView, ListPeriodWastesAPI):
+    """
+    Async version of ListPeriodWastesAPI, which fetches the waste totals and weather summaries concurrently.
+    """
+
+    @read_from_replica()
+    @conditional_response
+    @cached_response
+    async def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the aggregated waste and weather data of every bin for the specified period.
+
+        :return: A list of dictionaries containing aggregated waste data and corresponding weather information for each bin.
+        """
+        try:
+            start, end, backend = self.get_options(**kwargs)
+        except ValueError as error:
+            return Response({"Error": str(error)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        wastes, weathers = await sync_to_async(get_period_totals)(start, end)
+        return Response(await asummarize_bins(wastes, weathers, backend),
+                        status=status.HTTP_200_OK)
@@ -0,0 +1,40 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..db import read_from_replica
+from ..models import Bin
+from ..services import amerge_weather, get_latest_readings
+from .async_api_view import AsyncAPIView
+from .cached_response import cached_response
+from .conditional_response import conditional_response
+from .specific_latest_waste_api import SpecificLatestWasteAPI
+
+
+class AsyncSpecificLatestWasteAPI(AsyncAPIView, SpecificLatestWasteAPI):
+    """
+    Async version of SpecificLatestWasteAPI, which fetches the waste and weather readings concurrently.
+    """
+
+    @read_from_replica(latest=True)
+    @conditional_response
+    @cached_response
+    async def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve waste and weather data for the specified bin or location for the latest date.
+
+        :return: Response containing waste and weather data for the specified bin or location and latest date.
+        """
+        bin_id = kwargs.get("bin")
+        location = kwargs.get("location")
+        try:
+            readings = await sync_to_async(get_latest_readings)(bin_id, location)
+        except Bin.DoesNotExist:
+            return self.get_not_found(bin_id)
+        if readings is None:
+            return Response({"Error": "No Waste Data"},
+                            status=status.HTTP_404_NOT_FOUND)
+        latest_date, wastes, weathers = readings
+        return Response(self.get_data(bin_id, location, latest_date,
+                                      await amerge_weather(wastes, weathers)),
+                        status=status.HTTP_200_OK)
@@ -0,0 +1,88 @@
+import json
+from typing import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from ..db import get_read_database, read_from_replica
+from ..models import Bin
+from ..services import amerge_weather, get_period_readings, get_record_pages
+from .async_api_view import AsyncAPIView
+from .cached_response import cached_response
+from .conditional_response import conditional_response
+from .specific_period_waste_api import SpecificPeriodWasteAPI
+
+
+class AsyncSpecificPeriodWasteAPI(AsyncAPIView, SpecificPeriodWasteAPI):
+    """
+    Async version of SpecificPeriodWasteAPI, which fetches the waste and weather readings concurrently.
+
+    A page of records only loads the weather readings within the time range of its waste
+    readings, so pages and streams fetch them one after the other in a worker thread.
+    """
+
+    async def astream_records(self, data: dict, pages: Iterator,
+                              location: str) -> AsyncIterator[str]:
+        """
+        Write the response as a JSON object whose records are written page by page.
+
+        :param data: The response data without the records.
+        :param pages: The pages of (waste, weather) pairs.
+        :param location: The requested location, if any.
+
+        :return: An async iterator of JSON fragments.
+        """
+        yield json.dumps(data | {"records": []}, cls=JSONEncoder)[:-2]
+        separator = ""
+        while (page := await sync_to_async(next)(pages, None)) is not None:
+            records, _ = page
+            if records:
+                yield separator + self.format_records(records, location)
+                separator = ", "
+        yield "]}"
+
+    @read_from_replica()
+    @conditional_response
+    @cached_response
+    async def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve waste and weather data for the specified bin or location and period.
+
+        The records are returned newest first. Passing page_size or cursor returns a single page
+        of records along with the cursor of the next page, and passing stream=1 writes all records
+        page by page into a streaming response.
+
+        :return: Response containing waste and weather data for the specified bin or location and period.
+        """
+        kwargs = {"bin": "", "location": ""} | kwargs
+        bin_id = kwargs["bin"]
+        location = kwargs["location"]
+        try:
+            start, end, paging = self.get_options(**kwargs)
+        except ValueError as error:
+            return Response({"Error": str(error)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            wastes, weathers = await sync_to_async(get_period_readings)(
+                start, end, bin_id, location)
+        except Bin.DoesNotExist:
+            return self.get_not_found(bin_id)
+        data = self.get_data(**kwargs)
+        if paging is None:
+            records = await amerge_weather(wastes, weathers)
+        else:
+            # Streamed pages are read after the handler returns, so pin the database chosen
+            # for the request.
+            alias = get_read_database()
+            pages = get_record_pages(wastes.using(alias), weathers.using(alias), *paging)
+            if self.request.query_params.get("stream"):
+                return StreamingHttpResponse(
+                    self.astream_records(data, pages, location),
+                    content_type="application/json")
+            records, data["next"] = await sync_to_async(next)(pages)
+        data["records"] = [self.get_record(waste, weather_data, location)
+                           for waste, weather_data in records]
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,84 @@
+from datetime import datetime
+from functools import wraps
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..db import reading_from_lagging_replica
+from ..services import (get_cached_response, get_response_cache_key,
+                        resolve_period)
+
+
+def get_period_end(**kwargs) -> datetime | None:
+    """
+    Get the end of the period requested from an API endpoint.
+
+    :return: The end of the requested period (exclusive), or None if the endpoint does not
+             cover a fixed period or the period is invalid.
+    """
+    if "year" not in kwargs:
+        return None
+    try:
+        return resolve_period(kwargs["year"], kwargs.get("month", ""),
+                              kwargs.get("day", ""))[1]
+    except ValueError:
+        return None
+
+
+def get_cached_data(view, **kwargs) -> tuple[str, int | None, dict | list | None]:
+    """
+    Look up the cached response data of a request to an API view.
+
+    :param view: The API view handling the request.
+
+    :return: The cache key and timeout of the response, and the cached data, or None on a miss.
+    """
+    key, timeout = get_response_cache_key(
+        type(view).__name__, view.request.get_full_path(),
+        get_period_end(**kwargs))
+    return key, timeout, get_cached_response(key)
+
+
+def cached_response(get: Callable[..., Response]) -> Callable[..., Response]:
+    """
+    Cache the successful responses of the GET handler of an API view.
+
+    Responses of closed periods are cached until the archive version is bumped by a change of a
+    previous day, or for WASTE_ARCHIVE_CACHE_TIMEOUT seconds; any other response is cached until
+    the data version is bumped by a change of the waste, weather or bin data. Streaming responses
+    and responses read from a lagging replica, which may miss the latest changes, are not
+    cached. Async handlers access the cache from a worker thread.
+
+    :param get: The GET handler of the API view.
+
+    :return: The GET handler serving its responses from the cache.
+    """
+    if iscoroutinefunction(get):
+        @wraps(get)
+        async def async_wrapper(self, *args, **kwargs) -> Response:
+            key, timeout, data = await sync_to_async(get_cached_data)(self, **kwargs)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+            response = await get(self, *args, **kwargs)
+            if isinstance(response, Response) \
+                    and response.status_code == status.HTTP_200_OK \
+                    and not reading_from_lagging_replica():
+                await sync_to_async(cache.set)(key, response.data, timeout)
+            return response
+        return async_wrapper
+
+    @wraps(get)
+    def wrapper(self, *args, **kwargs) -> Response:
+        key, timeout, data = get_cached_data(self, **kwargs)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+        response = get(self, *args, **kwargs)
+        if isinstance(response, Response) \
+                and response.status_code == status.HTTP_200_OK \
+                and not reading_from_lagging_replica():
+            cache.set(key, response.data, timeout)
+        return response
+    return wrapper
@@ -0,0 +1,103 @@
+from datetime import datetime
+from functools import wraps
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from ..db import reading_from_lagging_replica
+from ..services import get_response_cache_key
+from .cached_response import get_period_end
+
+
+def get_cached_validators(view, **kwargs) -> tuple[str, datetime | None] | None:
+    """
+    Get the validators of the data requested from an API view, from the cache if possible.
+
+    Validators computed from a lagging replica are not cached, since they may miss the latest
+    changes.
+
+    :param view: The API view handling the request, with a get_validators(**kwargs) method.
+
+    :return: The ETag and the timestamp of the latest reading, or None to skip the check.
+    """
+    key, timeout = get_response_cache_key(
+        f"{type(view).__name__}:validators",
+        view.request.get_full_path(), get_period_end(**kwargs))
+    validators = cache.get(key)
+    if validators is None:
+        validators = view.get_validators(**kwargs)
+        if validators is None:
+            return None
+        if not reading_from_lagging_replica():
+            cache.set(key, validators, timeout)
+    return validators
+
+
+def add_validators(response: HttpResponseBase, etag: str,
+                   last_modified: int | None) -> HttpResponseBase:
+    """
+    Add the ETag and Last-Modified headers to a successful response.
+
+    :param response: The response.
+    :param etag: The quoted ETag.
+    :param last_modified: The time of the latest reading in seconds since the epoch, if any.
+
+    :return: The response.
+    """
+    if response.status_code == status.HTTP_200_OK:
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def conditional_response(get: Callable[..., Response]) -> Callable[..., Response]:
+    """
+    Answer conditional GET requests to an API view with 304 (Not Modified) when its data is unchanged.
+
+    The view provides its validators through get_validators(**kwargs), which returns the ETag
+    and last modification time of the requested data, or None to skip the check. The validators
+    are cached like responses, so an unchanged scope is answered without querying the database.
+    Async handlers compute the validators in a worker thread.
+
+    :param get: The GET handler of the API view.
+
+    :return: The GET handler answering conditional requests.
+    """
+    if iscoroutinefunction(get):
+        @wraps(get)
+        async def async_wrapper(self, *args, **kwargs) -> Response:
+            validators = await sync_to_async(get_cached_validators)(self, **kwargs)
+            if validators is None:
+                return await get(self, *args, **kwargs)
+            etag, last_modified = validators
+            etag = quote_etag(etag)
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(self.request, etag=etag,
+                                                last_modified=last_modified)
+            if response is not None:
+                return response
+            return add_validators(await get(self, *args, **kwargs), etag,
+                                  last_modified)
+        return async_wrapper
+
+    @wraps(get)
+    def wrapper(self, *args, **kwargs) -> Response:
+        validators = get_cached_validators(self, **kwargs)
+        if validators is None:
+            return get(self, *args, **kwargs)
+        etag, last_modified = validators
+        etag = quote_etag(etag)
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag,
+                                            last_modified=last_modified)
+        if response is not None:
+            return response
+        return add_validators(get(self, *args, **kwargs), etag, last_modified)
+    return wrapper
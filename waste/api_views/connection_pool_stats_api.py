@@ -0,0 +1,22 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..db import get_connection_pool_stats
+
+
+class ConnectionPoolStatsAPI(APIView):
+    """
+    API endpoint for retrieving the statistics of the database connection pools of this process.
+
+    This endpoint returns, for each database alias, the number of open, idle and in-use connections
+    along with the number of connections opened, reused, expired and discarded by the pool.
+    """
+
+    def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the connection pool statistics.
+
+        :return: A dictionary containing the statistics of the pool of each database alias.
+        """
+        return Response(get_connection_pool_stats(), status=status.HTTP_200_OK)
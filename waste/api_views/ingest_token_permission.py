@@ -0,0 +1,32 @@
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+
+class IngestTokenPermission(BasePermission):
+    """
+    Permission that requires the ingest token in the Authorization header.
+
+    The header has the form "Token <WASTE_INGEST_TOKEN>". When WASTE_INGEST_TOKEN is empty every
+    request is rejected, unless WASTE_INGEST_ALLOW_ANONYMOUS opts in to anonymous ingestion.
+    """
+    message = "Invalid ingest token."
+
+    def has_permission(self, request: Request, view: APIView) -> bool:
+        """
+        Check the ingest token of the request.
+
+        :param request: The request.
+        :param view: The view being accessed.
+
+        :return: Whether the request carries the configured ingest token, or anonymous ingestion
+                 is allowed without one.
+        """
+        if not settings.WASTE_INGEST_TOKEN:
+            return settings.WASTE_INGEST_ALLOW_ANONYMOUS
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        return scheme == "Token" and hmac.compare_digest(
+            token.encode(), settings.WASTE_INGEST_TOKEN.encode())
@@ -0,0 +1,49 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..services import ingest_readings, parse_readings
+from .ingest_token_permission import IngestTokenPermission
+from .ndjson_parser import NDJSONParser
+
+
+class IngestWastesAPI(APIView):
+    """
+    API endpoint for ingesting batches of waste readings.
+
+    This endpoint accepts a JSON array or newline-delimited JSON of readings with bin_id, timestamp
+    and level, validates the whole batch and inserts the readings that are not stored yet.
+    """
+    authentication_classes = []
+    permission_classes = [IngestTokenPermission]
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, *args, **kwargs) -> Response:
+        """
+        Validate and insert a batch of waste readings.
+
+        The batch is rejected as a whole if any reading is invalid. Readings whose bin and
+        timestamp are already stored are skipped, so a batch can safely be sent again, and so are
+        readings older than the retention horizon.
+
+        :return: Response containing the number of received, inserted, duplicate and expired
+                 readings, or the errors of the invalid readings.
+        """
+        rows = self.request.data
+        if not isinstance(rows, list):
+            return Response({"Error": "Expected a list of readings"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.WASTE_INGEST_MAX_READINGS:
+            return Response({"Error": "Too Many Readings"},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        readings, errors = parse_readings(rows)
+        if errors:
+            return Response({"Error": "Invalid Readings", "readings": errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+        inserted, expired = ingest_readings(readings, settings.WASTE_INGEST_BATCH_SIZE)
+        return Response({"received": len(rows), "inserted": inserted,
+                         "duplicates": len(rows) - inserted - expired,
+                         "expired": expired},
+                        status=status.HTTP_201_CREATED)
@@ -1,7 +1,11 @@
 from rest_framework import generics
+from rest_framework.response import Response
 
 from ..models import Bin
 from ..serializers import BinSerializer
+from ..services import get_bin_validators
+from .cached_response import cached_response
+from .conditional_response import conditional_response
 
 
 class ListBinsAPI(generics.ListAPIView):
@@ -12,3 +16,21 @@ class ListBinsAPI(generics.ListAPIView):
     """
     serializer_class = BinSerializer
     queryset = Bin.objects.all()
+
+    def get_validators(self, **kwargs) -> tuple[str, None]:
+        """
+        Compute the validators of the list of bins.
+
+        :return: The ETag and no modification time.
+        """
+        return get_bin_validators()
+
+    @conditional_response
+    @cached_response
+    def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the list of all bins, served from the cache when possible.
+
+        :return: Response containing the serialized bins.
+        """
+        return super().get(*args, **kwargs)
@@ -1,11 +1,16 @@
-from datetime import date
+from datetime import datetime
 
-from django.db.models import Avg, Min, Max, Sum, QuerySet
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ..models import Bin, Waste, Weather
+from ..db import read_from_replica
+from ..services import (get_aggregation_backend, get_latest_readings,
+                        get_latest_timestamp, get_reading_validators,
+                        resolve_date, summarize_bins)
+from .cached_response import cached_response
+from .conditional_response import conditional_response
 
 
 class ListLatestWastesAPI(APIView):
@@ -15,65 +20,51 @@ class ListLatestWastesAPI(APIView):
     This endpoint fetches data from the 'Waste' and 'Weather' models, aggregates it, and serializes it to be returned as a response.
     """
 
-    def get_weather_data(self, latest_date: date) -> QuerySet:
+    def get_validators(self, **kwargs) -> tuple[str, datetime | None] | None:
         """
-        Retrieve aggregated weather data for the latest date.
+        Compute the validators of the waste and weather data for the latest date.
 
-        :params latest_date: The latest date for which weather data is available.
-
-        :returns: Aggregated weather data including minimum, maximum, and average temperature, precipitation, and humidity.
+        :return: The ETag and the timestamp of the latest reading, or None if there is no waste data.
         """
-        return Weather.objects.filter(timestamp__date=latest_date) \
-            .values("location") \
-            .annotate(
-            min_temp=Min("temp"),
-            max_temp=Max("temp"),
-            avg_temp=Avg("temp"),
-            min_precip=Min("precip"),
-            max_precip=Max("precip"),
-            sum_precip=Sum("precip"),
-            min_humid=Min("humid"),
-            max_humid=Max("humid"),
-            avg_humid=Avg("humid"),
-        )
+        latest_timestamp = get_latest_timestamp()
+        if latest_timestamp is None:
+            return None
+        return get_reading_validators(
+            *resolve_date(timezone.localdate(latest_timestamp)))
 
-    def get_waste_data(self, latest_date: date) -> QuerySet:
+    def get_backend(self) -> str:
         """
-        Retrieve aggregated waste data for the latest date.
+        Get the aggregation backend requested with the backend query parameter.
 
-        :params latest_date: The latest date for which waste data is available.
+        :return: The aggregation backend.
 
-        :returns: Aggregated waste data including the total waste level for each bin.
+        :raises ValueError: If the backend is unknown, with the error message of the response.
         """
-        return Waste.objects.filter(timestamp__date=latest_date) \
-            .values('bin__bin_id') \
-            .annotate(total_waste=Sum('level'))
+        try:
+            return get_aggregation_backend(self.request.query_params.get("backend"))
+        except ValueError:
+            raise ValueError("Invalid Backend")
 
+    @read_from_replica(latest=True)
+    @conditional_response
+    @cached_response
     def get(self, *args, **kwargs) -> Response:
         """
         Retrieve the queryset for the API endpoint.
 
+        The readings are aggregated by the backend given with the backend query parameter,
+        "sql" or "numpy", or by WASTE_AGGREGATION_BACKEND.
+
         :returns: A list of dictionaries containing aggregated waste data and corresponding weather information for each bin for the latest date.
         """
-        latest_date = Waste.objects.latest('timestamp').timestamp.date()
-        weathers = self.get_weather_data(latest_date)
-        total_waste_by_bin = self.get_waste_data(latest_date)
-        data = []
-        for bin in total_waste_by_bin:
-            bin_location = Bin.objects.get(bin_id=bin['bin__bin_id']).location
-            weather_data = weathers.get(location=bin_location)
-            data.append({
-                "bin": bin['bin__bin_id'],
-                "total_waste": bin['total_waste'],
-                "min_temp": weather_data['min_temp'],
-                "max_temp": weather_data['max_temp'],
-                "avg_temp": weather_data['avg_temp'],
-                "min_precip": weather_data['min_precip'],
-                "max_precip": weather_data['max_precip'],
-                "sum_precip": weather_data['sum_precip'],
-                "min_humid": weather_data['min_humid'],
-                "max_humid": weather_data['max_humid'],
-                "avg_humid": weather_data['avg_humid']
-            })
-        return Response(data,
+        try:
+            backend = self.get_backend()
+        except ValueError as error:
+            return Response({"Error": str(error)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        readings = get_latest_readings()
+        if readings is None:
+            return Response([], status=status.HTTP_200_OK)
+        _, wastes, weathers = readings
+        return Response(summarize_bins(wastes, weathers, backend),
                         status=status.HTTP_200_OK)
@@ -1,9 +1,14 @@
-from django.db.models import Avg, Min, Max, Sum, QuerySet
+from datetime import datetime
+
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ..models import Bin, Waste, Weather
+from ..db import read_from_replica
+from ..services import (get_aggregation_backend, get_period_totals,
+                        get_reading_validators, resolve_period, summarize_bins)
+from .cached_response import cached_response
+from .conditional_response import conditional_response
 
 
 class ListPeriodWastesAPI(APIView):
@@ -11,85 +16,64 @@ class ListPeriodWastesAPI(APIView):
     API endpoint for retrieving aggregated waste data along with corresponding weather information for a specified date.
 
     This endpoint fetches data from the 'Waste' and 'Weather' models, aggregates it based on the provided date parameters,
-    and serializes it to be returned as a response.
+    and serializes it to be returned as a response. Periods fully covered by the daily rollups are read from
+    the 'WasteDaily' and 'WeatherDaily' models instead.
     """
 
-    def get_weather_data(self, year: str, month: str, day: str) -> QuerySet:
+    def get_validators(self, **kwargs) -> tuple[str, datetime | None] | None:
         """
-        Retrieve aggregated weather data for the specified date.
-
-        :param year: The year of the date.
-        :param month: The month of the date.
-        :param day: The day of the date.
+        Compute the validators of the waste and weather data for the specified period.
 
-        :return: Aggregated weather data including minimum, maximum, and average temperature, precipitation, and humidity.
+        :return: The ETag and the timestamp of the latest reading, or None if the period is invalid.
         """
-        weather_data = Weather.objects.all()
-        if year:
-            weather_data = weather_data.filter(timestamp__year=year)
-        if month:
-            weather_data = weather_data.filter(timestamp__month=month)
-        if day:
-            weather_data = weather_data.filter(timestamp__day=day)
-        return weather_data.values("location") \
-            .annotate(
-            min_temp=Min("temp"),
-            max_temp=Max("temp"),
-            avg_temp=Avg("temp"),
-            min_precip=Min("precip"),
-            max_precip=Max("precip"),
-            sum_precip=Sum("precip"),
-            min_humid=Min("humid"),
-            max_humid=Max("humid"),
-            avg_humid=Avg("humid"))
+        kwargs = {"year": "", "month": "", "day": ""} | kwargs
+        try:
+            start, end = resolve_period(kwargs["year"], kwargs["month"],
+                                        kwargs["day"])
+        except ValueError:
+            return None
+        return get_reading_validators(start, end)
 
-    def get_waste_data(self, year: str, month: str, day: str) -> QuerySet:
+    def get_options(self, **kwargs) -> tuple[datetime, datetime, str]:
         """
-        Retrieve aggregated waste data for the specified date.
+        Get the period and the aggregation backend of the request.
 
-        :param year: The year of the date.
-        :param month: The month of the date.
-        :param day: The day of the date.
+        :return: The start (inclusive) and end (exclusive) of the period, and the backend given
+                 with the backend query parameter or WASTE_AGGREGATION_BACKEND.
 
-        :return: Aggregated waste data including the total waste level for each bin.
+        :raises ValueError: If the period or backend is invalid, with the error message of the
+                            response.
         """
-        waste_data = Waste.objects.all()
-        if year:
-            waste_data = waste_data.filter(timestamp__year=year)
-        if month:
-            waste_data = waste_data.filter(timestamp__month=month)
-        if day:
-            waste_data = waste_data.filter(timestamp__day=day)
-        return waste_data.values('bin__bin_id') \
-            .annotate(total_waste=Sum('level'))
+        kwargs = {"year": "", "month": "", "day": ""} | kwargs
+        try:
+            start, end = resolve_period(kwargs["year"], kwargs["month"],
+                                        kwargs["day"])
+        except ValueError:
+            raise ValueError("Invalid Date")
+        try:
+            backend = get_aggregation_backend(
+                self.request.query_params.get("backend"))
+        except ValueError:
+            raise ValueError("Invalid Backend")
+        return start, end, backend
 
+    @read_from_replica()
+    @conditional_response
+    @cached_response
     def get(self, *args, **kwargs) -> Response:
         """
         Retrieve the queryset for the API endpoint.
 
+        The readings are aggregated by the backend given with the backend query parameter,
+        "sql" or "numpy", or by WASTE_AGGREGATION_BACKEND.
+
         :return: A list of dictionaries containing aggregated waste data and corresponding weather information for each bin.
         """
-        kwargs = {"year": "", "month": "", "day": ""} | kwargs
-        year = str(kwargs["year"])
-        month = str(kwargs["month"])
-        day = str(kwargs["day"])
-        weathers = self.get_weather_data(year, month, day)
-        total_waste_by_bin = self.get_waste_data(year, month, day)
-        data = []
-        for bin in total_waste_by_bin:
-            bin_location = Bin.objects.get(bin_id=bin['bin__bin_id']).location
-            weather_data = weathers.get(location=bin_location)
-            data.append({
-                "bin": bin['bin__bin_id'],
-                "total_waste": bin['total_waste'],
-                "min_temp": weather_data['min_temp'],
-                "max_temp": weather_data['max_temp'],
-                "avg_temp": weather_data['avg_temp'],
-                "min_precip": weather_data['min_precip'],
-                "max_precip": weather_data['max_precip'],
-                "sum_precip": weather_data['sum_precip'],
-                "min_humid": weather_data['min_humid'],
-                "max_humid": weather_data['max_humid'],
-                "avg_humid": weather_data['avg_humid']
-            })
-        return Response(data, status=status.HTTP_200_OK)
+        try:
+            start, end, backend = self.get_options(**kwargs)
+        except ValueError as error:
+            return Response({"Error": str(error)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        wastes, weathers = get_period_totals(start, end)
+        return Response(summarize_bins(wastes, weathers, backend),
+                        status=status.HTTP_200_OK)
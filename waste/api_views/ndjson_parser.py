@@ -0,0 +1,33 @@
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parser for newline-delimited JSON, with one JSON value per line.
+
+    Blank lines are ignored.
+    """
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None) -> list:
+        """
+        Parse the request body into a list with one item per line.
+
+        :param stream: The request body stream.
+        :param media_type: The media type of the request body.
+        :param parser_context: The parser context.
+
+        :return: The parsed values.
+        """
+        values = []
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                values.append(json.loads(line))
+            except ValueError as error:
+                raise ParseError(f"NDJSON parse error on line {number} - {error}")
+        return values
@@ -0,0 +1,22 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..services import get_request_metrics
+
+
+class RequestMetricsAPI(APIView):
+    """
+    API endpoint for retrieving the query and timing metrics of the requests served by this process.
+
+    This endpoint returns, for each route, the number of requests along with their average number of
+    database queries, database time, Python time and response size.
+    """
+
+    def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the request metrics.
+
+        :return: A dictionary containing the start of the measurement and the metrics of each route.
+        """
+        return Response(get_request_metrics(), status=status.HTTP_200_OK)
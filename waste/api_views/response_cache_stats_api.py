@@ -0,0 +1,22 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..services import get_response_cache_stats
+
+
+class ResponseCacheStatsAPI(APIView):
+    """
+    API endpoint for retrieving the hit and miss counters of the API response cache.
+
+    This endpoint returns the number of cache hits and misses since the cache was created,
+    along with the hit ratio and the current data version.
+    """
+
+    def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the response cache statistics.
+
+        :return: A dictionary containing the hits, misses, hit ratio and current data version.
+        """
+        return Response(get_response_cache_stats(), status=status.HTTP_200_OK)
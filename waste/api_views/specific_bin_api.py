@@ -1,7 +1,11 @@
 from rest_framework import generics
+from rest_framework.response import Response
 
 from ..models import Bin
 from ..serializers import BinSerializer
+from ..services import get_bin_validators
+from .cached_response import cached_response
+from .conditional_response import conditional_response
 
 
 class SpecificBinAPI(generics.RetrieveAPIView):
@@ -12,3 +16,21 @@ class SpecificBinAPI(generics.RetrieveAPIView):
     """
     serializer_class = BinSerializer
     queryset = Bin.objects.all()
+
+    def get_validators(self, **kwargs) -> tuple[str, None]:
+        """
+        Compute the validators of the bin.
+
+        :return: The ETag and no modification time.
+        """
+        return get_bin_validators(kwargs["pk"])
+
+    @conditional_response
+    @cached_response
+    def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the details of the bin, served from the cache when possible.
+
+        :return: Response containing the serialized bin.
+        """
+        return super().get(*args, **kwargs)
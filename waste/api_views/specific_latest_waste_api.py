@@ -1,11 +1,17 @@
-from datetime import date
+from datetime import date, datetime
+from typing import Iterable
 
-from django.db.models import QuerySet
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ..models import Bin, Waste, Weather
+from ..db import read_from_replica
+from ..models import Bin
+from ..services import (get_latest_readings, get_latest_timestamp,
+                        get_reading_validators, merge_weather, resolve_date)
+from .cached_response import cached_response
+from .conditional_response import conditional_response
 
 
 class SpecificLatestWasteAPI(APIView):
@@ -17,79 +23,89 @@ class SpecificLatestWasteAPI(APIView):
     fetching associated weather data for each waste record, and returning the aggregated data as a response.
     """
 
-    def get_weather_data(self, weather_data: QuerySet,
-                         latest_date: date) -> QuerySet:
+    def get_validators(self, **kwargs) -> tuple[str, datetime | None] | None:
         """
-        Retrieve weather data for the specified location and latest date.
+        Compute the validators of the waste and weather data for the specified bin or location and latest date.
 
-        :param weather_data: The queryset containing weather data.
-        :param location: The location for which weather data is requested.
-        :param latest_date: The latest date.
+        :return: The ETag and the timestamp of the latest reading, or None if there is no waste data.
+        """
+        bin_id = kwargs.get("bin")
+        location = kwargs.get("location")
+        latest_timestamp = get_latest_timestamp(bin_id=bin_id, location=location)
+        if latest_timestamp is None:
+            return None
+        return get_reading_validators(
+            *resolve_date(timezone.localdate(latest_timestamp)),
+            bin_id=bin_id, location=location)
+
+    def get_record(self, waste: dict, weather_data: dict | None) -> dict:
+        """
+        Build the record of a waste reading and its weather reading.
+
+        :param waste: The waste reading.
+        :param weather_data: The weather reading at the same location and time, if any.
 
-        :return: Weather data queryset filtered by location and latest date.
+        :return: The record.
         """
-        return weather_data.filter(timestamp__date=latest_date)
+        return {
+            "datetime": waste["timestamp"],
+            "level": waste["level"],
+            "temp": weather_data["temp"] if weather_data else 0,
+            "precip": weather_data["precip"] if weather_data else 0,
+            "humid": weather_data["humid"] if weather_data else 0
+        }
 
-    def get_waste_data(self, waste_data: QuerySet,
-                       latest_date: date) -> QuerySet:
+    def get_data(self, bin_id: str, location: str, latest_date: date,
+                 pairs: Iterable[tuple[dict, dict | None]]) -> dict:
         """
-        Retrieve waste data for the specified bin or location and latest date.
+        Build the response data of the readings of a bin or location.
 
-        :param waste_data: The queryset containing waste data.
-        :param location: The location for which waste data is requested.
+        :param bin_id: The requested bin ID, if any.
+        :param location: The requested location, if any.
         :param latest_date: The latest date.
+        :param pairs: The (waste, weather) pairs of the readings, newest first.
 
-        :return: Waste data queryset filtered by bin or location and latest date, ordered by timestamp.
+        :return: The response data.
         """
-        return waste_data.filter(timestamp__date=latest_date).order_by(
-            "-timestamp")
+        data = {"bin": bin_id} if bin_id else {"location": location}
+        data["date"] = latest_date
+        data["records"] = [self.get_record(waste, weather_data)
+                           for waste, weather_data in pairs]
+        return data
+
+    def get_not_found(self, bin_id: str) -> Response:
+        """
+        Build the response of a bin or location that does not exist.
+
+        :param bin_id: The requested bin ID, if any.
+
+        :return: The error response.
+        """
+        if bin_id:
+            return Response({"Error": "Invalid Bin ID"},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response({"Error": "Invalid Location"},
+                        status=status.HTTP_404_NOT_FOUND)
 
+    @read_from_replica(latest=True)
+    @conditional_response
+    @cached_response
     def get(self, *args, **kwargs) -> Response:
         """
         Retrieve waste and weather data for the specified bin or location for the latest date.
 
         :return: Response containing waste and weather data for the specified bin or location and latest date.
         """
+        bin_id = kwargs.get("bin")
+        location = kwargs.get("location")
         try:
-            kwargs = {"bin": "", "location": ""} | kwargs
-            bin_id = self.kwargs.get("bin")
-            location = self.kwargs.get("location")
-            if bin_id:
-                bin = Bin.objects.get(bin_id=bin_id)
-                weather_queryset = Weather.objects.filter(
-                    location=bin.location)
-                waste_queryset = Waste.objects.filter(bin=bin)
-                latest_date = waste_queryset.latest(
-                    'timestamp').timestamp.date()
-            elif location:
-                bin = Bin.objects.get(location=location)
-                weather_queryset = Weather.objects.filter(location=location)
-                waste_queryset = Waste.objects.filter(bin__location=location)
-                latest_date = waste_queryset.latest(
-                    'timestamp').timestamp.date()
-            weathers = self.get_weather_data(weather_queryset, latest_date)
-            wastes = self.get_waste_data(waste_queryset, latest_date)
-            if bin_id:
-                data = {"bin": bin_id}
-            elif location:
-                data = {"location": location}
-            data["date"] = latest_date
-            data["records"] = []
-            for waste in wastes:
-                weather_data = weathers.filter(
-                    timestamp=waste.timestamp).first()
-                record = {
-                    "datetime": waste.timestamp,
-                    "level": waste.level,
-                    "temp": weather_data.temp if weather_data else 0,
-                    "precip": weather_data.precip if weather_data else 0,
-                    "humid": weather_data.humid if weather_data else 0
-                }
-                data["records"].append(record)
+            readings = get_latest_readings(bin_id, location)
         except Bin.DoesNotExist:
-            if bin_id:
-                return Response({"Error": "Invalid Bin ID"},
-                                status=status.HTTP_404_NOT_FOUND)
-            return Response({"Error": "Invalid Location"},
+            return self.get_not_found(bin_id)
+        if readings is None:
+            return Response({"Error": "No Waste Data"},
                             status=status.HTTP_404_NOT_FOUND)
-        return Response(data, status=status.HTTP_200_OK)
+        latest_date, wastes, weathers = readings
+        return Response(self.get_data(bin_id, location, latest_date,
+                                      merge_weather(wastes, weathers)),
+                        status=status.HTTP_200_OK)
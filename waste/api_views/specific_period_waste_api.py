@@ -1,9 +1,21 @@
-from django.db.models import QuerySet
+import json
+from datetime import datetime
+from typing import Iterator
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 
-from ..models import Bin, Waste, Weather
+from ..db import get_read_database, read_from_replica
+from ..models import Bin
+from ..services import (decode_cursor, get_period_readings,
+                        get_reading_validators, get_record_pages,
+                        merge_weather, resolve_period)
+from .cached_response import cached_response
+from .conditional_response import conditional_response
 
 
 class SpecificPeriodWasteAPI(APIView):
@@ -15,102 +27,186 @@ class SpecificPeriodWasteAPI(APIView):
     fetching associated weather data for each waste record, and returning the aggregated data as a response.
     """
 
-    def get_weather_data(self, weather_data: QuerySet, year: str, month: str,
-                         day: str) -> QuerySet:
+    def get_validators(self, **kwargs) -> tuple[str, datetime | None] | None:
+        """
+        Compute the validators of the waste and weather data for the specified bin or location and period.
+
+        :return: The ETag and the timestamp of the latest reading, or None if the period is invalid.
+        """
+        kwargs = {"year": "", "month": "", "day": ""} | kwargs
+        try:
+            start, end = resolve_period(kwargs["year"], kwargs["month"],
+                                        kwargs["day"])
+        except ValueError:
+            return None
+        return get_reading_validators(start, end, bin_id=kwargs.get("bin"),
+                                      location=kwargs.get("location"))
+
+    def get_page_size(self) -> int:
+        """
+        Get the number of records per page requested with the page_size query parameter.
+
+        :return: The requested page size, or WASTE_RECORDS_PAGE_SIZE if none is requested.
+
+        :raises ValueError: If the page size is not between 1 and WASTE_RECORDS_MAX_PAGE_SIZE.
+        """
+        page_size = int(self.request.query_params.get(
+            "page_size", settings.WASTE_RECORDS_PAGE_SIZE))
+        if not 1 <= page_size <= settings.WASTE_RECORDS_MAX_PAGE_SIZE:
+            raise ValueError(f"Invalid page size: {page_size}")
+        return page_size
+
+    def get_options(self, **kwargs) -> tuple[datetime, datetime, tuple[int, str | None] | None]:
+        """
+        Get the period and the paging of the request.
+
+        :return: The start (inclusive) and end (exclusive) of the period, and the page size and
+                 cursor if page_size, cursor or stream is passed, None otherwise.
+
+        :raises ValueError: If the period, page size or cursor is invalid, with the error message
+                            of the response.
+        """
+        kwargs = {"year": "", "month": "", "day": ""} | kwargs
+        try:
+            start, end = resolve_period(str(kwargs["year"]), str(kwargs["month"]),
+                                        str(kwargs["day"]))
+        except ValueError:
+            raise ValueError("Invalid Date")
+        query_params = self.request.query_params
+        if "cursor" not in query_params and "page_size" not in query_params \
+                and not query_params.get("stream"):
+            return start, end, None
+        try:
+            page_size = self.get_page_size()
+        except ValueError:
+            raise ValueError("Invalid Page Size")
+        cursor = query_params.get("cursor") or None
+        try:
+            if cursor:
+                decode_cursor(cursor)
+        except ValueError:
+            raise ValueError("Invalid Cursor")
+        return start, end, (page_size, cursor)
+
+    def get_data(self, **kwargs) -> dict:
         """
-        Retrieve weather data for the specified location and period.
+        Build the response data of the requested bin or location and period, without the records.
 
-        :param weather_data: The queryset containing weather data.
-        :param year: The year of the period.
-        :param month: The month of the period.
-        :param day: The day of the period.
+        :return: The response data.
+        """
+        kwargs = {"year": "", "month": "", "day": "", "bin": "",
+                  "location": ""} | kwargs
+        data = {"bin": kwargs["bin"]} if kwargs["bin"] else {"location": kwargs["location"]}
+        for field in ("year", "month", "day"):
+            if str(kwargs[field]):
+                data[field] = int(kwargs[field])
+        return data
+
+    def get_not_found(self, bin_id: str) -> Response:
+        """
+        Build the response of a bin or location that does not exist.
+
+        :param bin_id: The requested bin ID, if any.
+
+        :return: The error response.
+        """
+        if bin_id:
+            return Response({"Error": "Invalid Bin ID"},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response({"Error": "Invalid Location"},
+                        status=status.HTTP_404_NOT_FOUND)
+
+    def get_record(self, waste: dict, weather_data: dict | None,
+                   location: str) -> dict:
+        """
+        Build the record of a waste reading and its weather reading.
+
+        :param waste: The waste reading.
+        :param weather_data: The weather reading at the same location and time, if any.
+        :param location: The requested location, if any.
 
-        :return: Weather data queryset filtered by location and period.
+        :return: The record, including the bin ID when a location is requested.
         """
-        if year:
-            weather_data = weather_data.filter(timestamp__year=year)
-        if month:
-            weather_data = weather_data.filter(timestamp__month=month)
-        if day:
-            weather_data = weather_data.filter(timestamp__day=day)
-        return weather_data
+        record = {"datetime": waste["timestamp"]}
 
-    def get_waste_data(self, waste_data: QuerySet, year: str, month: str,
-                       day: str) -> QuerySet:
+        if location:
+            record["bin"] = waste["bin_id"]
+
+        record["level"] = waste["level"]
+        record["temp"] = weather_data["temp"] if weather_data else 0
+        record["precip"] = weather_data["precip"] if weather_data else 0
+        record["humid"] = weather_data["humid"] if weather_data else 0
+        return record
+
+    def stream_records(self, data: dict, pages: Iterator, location: str) -> Iterator[str]:
         """
-        Retrieve waste data for the specified bin or location and period.
+        Write the response as a JSON object whose records are written page by page.
 
-        :param waste_data: The queryset containing waste data.
-        :param year: The year of the period.
-        :param month: The month of the period.
-        :param day: The day of the period.
+        :param data: The response data without the records.
+        :param pages: The pages of (waste, weather) pairs.
+        :param location: The requested location, if any.
 
-        :return: Waste data queryset filtered by bin or location and period, ordered by timestamp.
+        :return: An iterator of JSON fragments.
+        """
+        yield json.dumps(data | {"records": []}, cls=JSONEncoder)[:-2]
+        separator = ""
+        for records, _ in pages:
+            if records:
+                yield separator + self.format_records(records, location)
+                separator = ", "
+        yield "]}"
+
+    def format_records(self, records: list[tuple[dict, dict | None]], location: str) -> str:
         """
-        if year:
-            waste_data = waste_data.filter(timestamp__year=year)
-        if month:
-            waste_data = waste_data.filter(timestamp__month=month)
-        if day:
-            waste_data = waste_data.filter(timestamp__day=day)
-        return waste_data.order_by("-timestamp")
+        Write a page of records as comma-separated JSON objects.
 
+        :param records: The (waste, weather) pairs of the page.
+        :param location: The requested location, if any.
+
+        :return: The JSON fragment.
+        """
+        return ", ".join(json.dumps(self.get_record(waste, weather_data, location),
+                                    cls=JSONEncoder)
+                         for waste, weather_data in records)
+
+    @read_from_replica()
+    @conditional_response
+    @cached_response
     def get(self, *args, **kwargs) -> Response:
         """
         Retrieve waste and weather data for the specified bin or location and period.
 
+        The records are returned newest first. Passing page_size or cursor returns a single page
+        of records along with the cursor of the next page, and passing stream=1 writes all records
+        page by page into a streaming response.
+
         :return: Response containing waste and weather data for the specified bin or location and period.
         """
+        kwargs = {"bin": "", "location": ""} | kwargs
+        bin_id = kwargs["bin"]
+        location = kwargs["location"]
         try:
-            kwargs = {"year": "", "month": "", "day": "", "bin": "",
-                      "location": ""} | kwargs
-            year = str(kwargs["year"])
-            month = str(kwargs["month"])
-            day = str(kwargs["day"])
-            bin_id = kwargs["bin"]
-            location = kwargs["location"]
-            if bin_id:
-                bin = Bin.objects.get(bin_id=bin_id)
-                weather_queryset = Weather.objects.filter(
-                    location=bin.location)
-                waste_queryset = Waste.objects.filter(bin=bin)
-            elif location:
-                bin = Bin.objects.get(location=location)
-                weather_queryset = Weather.objects.filter(location=location)
-                waste_queryset = Waste.objects.filter(bin__location=location)
-            weathers = self.get_weather_data(weather_queryset, year, month,
-                                             day)
-            wastes = self.get_waste_data(waste_queryset, year, month, day)
-
-            if bin_id:
-                data = {"bin": bin_id}
-            elif location:
-                data = {"location": location}
-            if year:
-                data["year"] = int(year)
-            if month:
-                data["month"] = int(month)
-            if day:
-                data["day"] = int(day)
-            data["records"] = []
-
-            for waste in wastes:
-                weather_data = weathers.filter(
-                    timestamp=waste.timestamp).first()
-                record = {"datetime": waste.timestamp}
-
-                if location:
-                    record["bin"] = waste.bin.bin_id
-
-                record["level"] = waste.level
-                record["temp"] = weather_data.temp if weather_data else 0
-                record["precip"] = weather_data.precip if weather_data else 0
-                record["humid"] = weather_data.humid if weather_data else 0
-                data["records"].append(record)
+            start, end, paging = self.get_options(**kwargs)
+        except ValueError as error:
+            return Response({"Error": str(error)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            wastes, weathers = get_period_readings(start, end, bin_id, location)
         except Bin.DoesNotExist:
-            if bin_id:
-                return Response({"Error": "Invalid Bin ID"},
-                                status=status.HTTP_404_NOT_FOUND)
-            return Response({"Error": "Invalid Location"},
-                            status=status.HTTP_404_NOT_FOUND)
+            return self.get_not_found(bin_id)
+        data = self.get_data(**kwargs)
+        if paging is None:
+            records = merge_weather(wastes, weathers)
+        else:
+            # Streamed pages are read after the handler returns, so pin the database chosen
+            # for the request.
+            alias = get_read_database()
+            pages = get_record_pages(wastes.using(alias), weathers.using(alias), *paging)
+            if self.request.query_params.get("stream"):
+                return StreamingHttpResponse(
+                    self.stream_records(data, pages, location),
+                    content_type="application/json")
+            records, data["next"] = next(pages)
+        data["records"] = [self.get_record(waste, weather_data, location)
+                           for waste, weather_data in records]
         return Response(data, status=status.HTTP_200_OK)
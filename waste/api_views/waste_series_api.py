@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..models import Bin
+from ..services import (SERIES_RESOLUTION, get_reading_validators,
+                        get_waste_series, resolve_period, rollups_cover)
+from .cached_response import cached_response
+from .conditional_response import conditional_response
+
+
+class WasteSeriesAPI(APIView):
+    """
+    API endpoint for retrieving the hourly waste levels of a specific bin or location on a date.
+
+    The levels are sliced from the stored daily series when the rollups include every reading of
+    the date, and computed from the raw readings otherwise.
+    """
+
+    def get_validators(self, **kwargs) -> tuple[str, datetime | None] | None:
+        """
+        Compute the validators of the waste and weather data for the specified bin or location and date.
+
+        :return: The ETag and the timestamp of the latest reading, or None if the date is invalid.
+        """
+        try:
+            start, end = resolve_period(kwargs["year"], kwargs["month"],
+                                        kwargs["day"])
+        except ValueError:
+            return None
+        return get_reading_validators(start, end, bin_id=kwargs.get("bin"),
+                                      location=kwargs.get("location"))
+
+    def get_hours(self, slots: int) -> tuple[int, int]:
+        """
+        Get the range of hours requested with the start and end query parameters.
+
+        :param slots: The number of hours of the date.
+
+        :return: The first hour (inclusive) and last hour (exclusive), the whole date by default.
+
+        :raises ValueError: If the range is not within the date.
+        """
+        first = int(self.request.query_params.get("start", 0))
+        last = int(self.request.query_params.get("end", slots))
+        if not 0 <= first <= last <= slots:
+            raise ValueError(f"Invalid hours: {first}-{last}")
+        return first, last
+
+    @conditional_response
+    @cached_response
+    def get(self, *args, **kwargs) -> Response:
+        """
+        Retrieve the hourly waste levels of the specified bin or location and date.
+
+        :return: Response containing the total waste level of each hour, null for hours without readings.
+        """
+        bin_id = kwargs.get("bin")
+        location = kwargs.get("location")
+        try:
+            start, end = resolve_period(kwargs["year"], kwargs["month"],
+                                        kwargs["day"])
+        except ValueError:
+            return Response({"Error": "Invalid Date"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            first, last = self.get_hours(
+                (end - start) // SERIES_RESOLUTION)
+        except ValueError:
+            return Response({"Error": "Invalid Hours"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if bin_id:
+            if not Bin.objects.filter(bin_id=bin_id).exists():
+                return Response({"Error": "Invalid Bin ID"},
+                                status=status.HTTP_404_NOT_FOUND)
+            data = {"bin": bin_id}
+            filters = {"bin_id": bin_id}
+        else:
+            if not Bin.objects.filter(location=location).exists():
+                return Response({"Error": "Invalid Location"},
+                                status=status.HTTP_404_NOT_FOUND)
+            data = {"location": location}
+            filters = {"bin__location": location}
+        waste_date = timezone.localdate(start)
+        data["date"] = waste_date
+        data["start"] = start + first * SERIES_RESOLUTION
+        data["resolution"] = int(SERIES_RESOLUTION.total_seconds())
+        data["levels"] = get_waste_series(
+            waste_date, rollups_cover(start, end, weather=False), first, last,
+            **filters)
+        return Response(data, status=status.HTTP_200_OK)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class WasteConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'waste'
+
+    def ready(self):
+        """
+        Connect the signal receivers of the app.
+        """
+        from . import signals  # noqa: F401
@@ -0,0 +1,5 @@
+from .connection_pool import (ConnectionPool, close_connection_pools,
+                              get_connection_pool, get_connection_pool_stats)
+from .pooled_database_wrapper import PooledDatabaseWrapperMixin
+from .replica_router import (ReplicaRouter, get_read_database, read_from_replica,
+                             reading_from_lagging_replica, use_replica)
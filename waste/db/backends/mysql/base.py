@@ -0,0 +1,9 @@
+from django.db.backends.mysql import base
+
+from ...pooled_database_wrapper import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    MySQL backend taking its connections from a connection pool.
+    """
@@ -0,0 +1,9 @@
+from django.db.backends.sqlite3 import base
+
+from ...pooled_database_wrapper import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    SQLite backend taking its connections from a connection pool, e.g. as a stand-in for MySQL in benchmarks.
+    """
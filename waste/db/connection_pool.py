@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of open DB-API connections to one database.
+
+    Connections are handed out most recently returned first, so a lightly loaded process keeps
+    reusing a few warm connections while the others expire. A connection idle for longer than
+    idle_timeout seconds is closed, and one idle for longer than health_check_interval seconds
+    is pinged before it is handed out again. When max_size connections are in use, acquire
+    waits up to timeout seconds for one to be returned.
+    """
+
+    def __init__(self, connect: Callable[[], Any], max_size: int = 10,
+                 idle_timeout: float = 300, health_check_interval: float = 30,
+                 timeout: float = 10, clock: Callable[[], float] = time.monotonic):
+        """
+        Create an empty pool.
+
+        :param connect: Opens a new connection.
+        :param max_size: The maximum number of open connections, idle or in use.
+        :param idle_timeout: The number of seconds after which an idle connection is closed.
+        :param health_check_interval: The number of idle seconds after which a connection is
+                                      pinged before it is reused, or 0 to always ping it.
+        :param timeout: The number of seconds acquire waits for a connection when the pool is exhausted.
+        :param clock: The monotonic clock used to measure idle and waiting times.
+        """
+        self.connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.clock = clock
+        self.idle = deque()
+        self.size = 0
+        self.condition = threading.Condition()
+        self.stats = {"connects": 0, "reuses": 0, "expired": 0, "failed_checks": 0,
+                      "discarded": 0, "waits": 0, "timeouts": 0}
+
+    def take_expired(self) -> list:
+        """
+        Remove the connections that have been idle for longer than idle_timeout.
+
+        Must be called with the condition held.
+
+        :return: The removed connections, to be closed once the condition is released.
+        """
+        expired = []
+        deadline = self.clock() - self.idle_timeout
+        while self.idle and self.idle[0][1] <= deadline:
+            expired.append(self.idle.popleft()[0])
+        self.size -= len(expired)
+        self.stats["expired"] += len(expired)
+        return expired
+
+    def acquire(self) -> Any:
+        """
+        Take an idle connection, or open a new one if the pool is not full.
+
+        :return: The connection.
+
+        :raises TimeoutError: If no connection is returned within timeout seconds.
+        """
+        deadline = self.clock() + self.timeout
+        while True:
+            with self.condition:
+                expired = self.take_expired()
+                connection = returned_at = None
+                if self.idle:
+                    connection, returned_at = self.idle.pop()
+                elif self.size < self.max_size:
+                    self.size += 1
+                else:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        raise TimeoutError(f"No database connection was returned to the pool "
+                                           f"within {self.timeout} seconds.")
+                    self.stats["waits"] += 1
+                    self.condition.wait(remaining)
+                    continue
+            close_all(expired)
+            if connection is None:
+                return self.open()
+            if self.clock() - returned_at < self.health_check_interval \
+                    or is_usable(connection):
+                with self.condition:
+                    self.stats["reuses"] += 1
+                return connection
+            with self.condition:
+                self.stats["failed_checks"] += 1
+            self.discard(connection)
+
+    def open(self) -> Any:
+        """
+        Open a new connection in a slot reserved by acquire.
+
+        :return: The connection.
+        """
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.stats["connects"] += 1
+        return connection
+
+    def release(self, connection: Any) -> None:
+        """
+        Return a connection to the pool.
+
+        :param connection: The connection, without an open transaction.
+        """
+        with self.condition:
+            self.idle.append((connection, self.clock()))
+            expired = self.take_expired()
+            self.condition.notify()
+        close_all(expired)
+
+    def discard(self, connection: Any) -> None:
+        """
+        Close a connection taken from the pool instead of returning it.
+
+        :param connection: The connection.
+        """
+        with self.condition:
+            self.size -= 1
+            self.stats["discarded"] += 1
+            self.condition.notify()
+        close_all([connection])
+
+    def close(self) -> None:
+        """
+        Close every idle connection.
+        """
+        with self.condition:
+            idle = [connection for connection, _ in self.idle]
+            self.idle.clear()
+            self.size -= len(idle)
+        close_all(idle)
+
+    def get_stats(self) -> dict:
+        """
+        Get the size and counters of the pool.
+
+        :return: A dictionary containing the number of open, idle and in-use connections, the
+                 settings of the pool, and the counters since it was created.
+        """
+        with self.condition:
+            return {
+                "size": self.size,
+                "idle": len(self.idle),
+                "in_use": self.size - len(self.idle),
+                "max_size": self.max_size,
+                "idle_timeout": self.idle_timeout,
+                "health_check_interval": self.health_check_interval,
+                **self.stats,
+            }
+
+
+def is_usable(connection: Any) -> bool:
+    """
+    Check whether a DB-API connection still works by running a trivial query.
+
+    :param connection: The connection.
+
+    :return: Whether the query succeeded.
+    """
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+    except Exception:
+        return False
+    return True
+
+
+def close_all(connections: list) -> None:
+    """
+    Close DB-API connections, ignoring the errors of connections that are already broken.
+
+    :param connections: The connections.
+    """
+    for connection in connections:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(alias: str, key: tuple, connect: Callable[[], Any],
+                        options: dict) -> ConnectionPool:
+    """
+    Get the connection pool of a database alias, creating it on first use.
+
+    :param alias: The database alias.
+    :param key: The connection settings the pool was created for. A pool created for other
+                settings, e.g. before the test database was set up, is closed and replaced.
+    :param connect: Opens a new connection.
+    :param options: The POOL settings of the database: MAX_SIZE, IDLE_TIMEOUT,
+                    HEALTH_CHECK_INTERVAL and TIMEOUT.
+
+    :return: The connection pool.
+    """
+    with _pools_lock:
+        pool_key, pool = _pools.get(alias, (None, None))
+        if pool_key == key:
+            return pool
+        if pool is not None:
+            pool.close()
+        pool = ConnectionPool(connect, max_size=options["MAX_SIZE"],
+                              idle_timeout=options.get("IDLE_TIMEOUT", 300),
+                              health_check_interval=options.get("HEALTH_CHECK_INTERVAL", 30),
+                              timeout=options.get("TIMEOUT", 10))
+        _pools[alias] = key, pool
+        return pool
+
+
+def get_connection_pool_stats() -> dict:
+    """
+    Get the statistics of the connection pool of every database alias.
+
+    The pools live in the memory of the process, so every worker process reports its own pools.
+
+    :return: The statistics of each pool, keyed by database alias.
+    """
+    with _pools_lock:
+        pools = {alias: pool for alias, (_, pool) in _pools.items()}
+    return {alias: pool.get_stats() for alias, pool in sorted(pools.items())}
+
+
+def close_connection_pools() -> None:
+    """
+    Close the idle connections of every pool and forget the pools.
+    """
+    with _pools_lock:
+        pools = [pool for _, pool in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def forget_connection_pools() -> None:
+    """
+    Forget the pools without closing their connections, which belong to the parent process after a fork.
+    """
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    _pools.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=forget_connection_pools)
@@ -0,0 +1,70 @@
+from functools import partial
+from typing import Any
+
+from .connection_pool import ConnectionPool, get_connection_pool
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixin for a Django database backend that takes its connections from a ConnectionPool.
+
+    The pool is configured with the POOL setting of the database, e.g.
+    {"MAX_SIZE": 10, "IDLE_TIMEOUT": 300, "HEALTH_CHECK_INTERVAL": 30, "TIMEOUT": 10}. Closing
+    the connection, e.g. at the end of a request when CONN_MAX_AGE is 0, returns it to the pool
+    instead, so the next request skips the connect and authentication handshake. A connection
+    closed inside a transaction or after an error that left it unusable is discarded. Without a
+    MAX_SIZE, or for an in-memory SQLite database, connections are not pooled.
+    """
+
+    def get_pool(self, conn_params: dict | None = None) -> ConnectionPool | None:
+        """
+        Get the connection pool of the database.
+
+        :param conn_params: The connection parameters, if already computed.
+
+        :return: The connection pool, or None if connections are not pooled.
+        """
+        options = self.settings_dict.get("POOL") or {}
+        if not options.get("MAX_SIZE"):
+            return None
+        if getattr(self, "is_in_memory_db", lambda: False)():
+            return None
+        if conn_params is None:
+            conn_params = self.get_connection_params()
+        key = tuple(self.settings_dict.get(setting)
+                    for setting in ("NAME", "USER", "HOST", "PORT"))
+        return get_connection_pool(self.alias, key,
+                                   partial(super().get_new_connection, conn_params),
+                                   options)
+
+    def get_new_connection(self, conn_params: dict) -> Any:
+        """
+        Take a connection from the pool, or open one if connections are not pooled.
+
+        :param conn_params: The connection parameters.
+
+        :return: The connection.
+        """
+        pool = self.get_pool(conn_params)
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.acquire()
+
+    def _close(self):
+        """
+        Return the connection to the pool, or close it if connections are not pooled.
+        """
+        pool = self.get_pool()
+        if pool is None:
+            return super()._close()
+        connection = self.connection
+        if self.in_atomic_block or (self.errors_occurred and not self.is_usable()):
+            pool.discard(connection)
+            return
+        if not self.autocommit:
+            try:
+                connection.rollback()
+            except Exception:
+                pool.discard(connection)
+                return
+        pool.release(connection)
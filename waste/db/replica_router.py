@@ -0,0 +1,240 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+_read_database = ContextVar("read_database", default=None)
+_lags = {}
+_lags_lock = threading.Lock()
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads of the analytics and latest views to a read replica.
+
+    Reads go to the database chosen by use_replica for the current request, and to the
+    primary otherwise. Writes always go to the primary, and migrations only run on it.
+    """
+
+    def db_for_read(self, model, **hints) -> str | None:
+        """
+        Get the database to read a model from.
+
+        :param model: The model.
+
+        :return: The replica chosen for the current request, or None for the primary.
+        """
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints) -> str:
+        """
+        Get the database to write a model to.
+
+        :param model: The model.
+
+        :return: The primary database.
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        """
+        Allow relations between objects read from the primary and from its replicas.
+
+        :param obj1: The first object.
+        :param obj2: The second object.
+
+        :return: True if both objects come from the primary or a replica, None otherwise.
+        """
+        databases = {DEFAULT_DB_ALIAS, *settings.WASTE_REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None,
+                      **hints) -> bool | None:
+        """
+        Prevent migrations on the replicas, which receive the schema from the primary.
+
+        :param db: The database alias.
+        :param app_label: The app label of the migrated model.
+        :param model_name: The name of the migrated model.
+
+        :return: False for a replica, None otherwise.
+        """
+        if db in settings.WASTE_REPLICA_DATABASES:
+            return False
+        return None
+
+
+def get_replica_lag(alias: str) -> float | None:
+    """
+    Query how many seconds a replica lags behind the primary.
+
+    :param alias: The database alias of the replica.
+
+    :return: The lag in seconds, 0 if the database does not replicate from a primary, or None
+             if replication is stopped or the replica cannot be reached.
+    """
+    connection = connections[alias]
+    if connection.vendor != "mysql":
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except DatabaseError:
+                cursor.execute("SHOW SLAVE STATUS")
+            row = cursor.fetchone()
+            if row is None:
+                return 0
+            status = dict(zip((column[0] for column in cursor.description), row))
+    except DatabaseError:
+        logger.warning("Could not query the replication status of %s.", alias,
+                       exc_info=True)
+        return None
+    lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+    return None if lag is None else float(lag)
+
+
+def get_cached_replica_lag(alias: str) -> float | None:
+    """
+    Get the lag of a replica, querying it at most every WASTE_REPLICA_LAG_CHECK_INTERVAL seconds.
+
+    :param alias: The database alias of the replica.
+
+    :return: The lag in seconds, or None if replication is stopped or the replica cannot be reached.
+    """
+    now = time.monotonic()
+    with _lags_lock:
+        checked_at, lag = _lags.get(alias, (None, None))
+    if checked_at is not None \
+            and now - checked_at < settings.WASTE_REPLICA_LAG_CHECK_INTERVAL:
+        return lag
+    lag = get_replica_lag(alias)
+    with _lags_lock:
+        _lags[alias] = now, lag
+    return lag
+
+
+def forget_replica_lags() -> None:
+    """
+    Forget the cached lags, so every replica is queried again on its next use.
+    """
+    with _lags_lock:
+        _lags.clear()
+
+
+def get_read_database() -> str:
+    """
+    Get the database the reads of the current request go to.
+
+    :return: The alias of the replica chosen by use_replica, or of the primary.
+    """
+    return _read_database.get() or DEFAULT_DB_ALIAS
+
+
+def reading_from_lagging_replica() -> bool:
+    """
+    Check whether the reads of the current request go to a replica lagging behind the primary.
+
+    Data read from such a replica may miss writes whose data version bump already happened, so
+    it must not be cached under the current version.
+
+    :return: True if the reads go to a replica whose last known lag is not 0, False otherwise.
+    """
+    alias = _read_database.get()
+    if alias is None or alias == DEFAULT_DB_ALIAS:
+        return False
+    with _lags_lock:
+        lag = _lags.get(alias, (None, None))[1]
+    return lag != 0
+
+
+def choose_read_database(max_lag: float) -> str:
+    """
+    Choose a replica lagging behind by at most max_lag seconds, or the primary if there is none.
+
+    Replicas are tried in random order to spread the load. The primary is chosen inside a
+    transaction as well, since the replicas do not see its uncommitted changes.
+
+    :param max_lag: The maximum lag in seconds.
+
+    :return: The database alias.
+    """
+    replicas = list(settings.WASTE_REPLICA_DATABASES)
+    if not replicas or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    random.shuffle(replicas)
+    for alias in replicas:
+        lag = get_cached_replica_lag(alias)
+        if lag is not None and lag <= max_lag:
+            return alias
+    return DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_replica(max_lag: float) -> Iterator[str]:
+    """
+    Route the reads of the enclosed code to a replica lagging behind by at most max_lag seconds.
+
+    The choice holds for the worker threads started through sync_to_async as well, since they
+    run in a copy of the context.
+
+    :param max_lag: The maximum lag in seconds.
+
+    :return: The alias of the chosen database.
+    """
+    alias = choose_read_database(max_lag)
+    token = _read_database.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_database.reset(token)
+
+
+def read_from_replica(latest: bool = False) -> Callable[[Callable], Callable]:
+    """
+    Serve the GET handler of a view from a read replica.
+
+    Analytics views accept a replica lagging behind by up to WASTE_REPLICA_MAX_ANALYTICS_LAG
+    seconds, and views of the latest readings one lagging behind by up to WASTE_REPLICA_MAX_LAG
+    seconds. They fall back to the primary when no replica is close enough. Async handlers
+    check the lag in a worker thread.
+
+    :param latest: Whether the view shows the latest readings.
+
+    :return: The decorator of the GET handler.
+    """
+    def decorator(get: Callable[..., Any]) -> Callable[..., Any]:
+        def get_max_lag() -> float:
+            if latest:
+                return settings.WASTE_REPLICA_MAX_LAG
+            return settings.WASTE_REPLICA_MAX_ANALYTICS_LAG
+
+        if iscoroutinefunction(get):
+            @wraps(get)
+            async def async_wrapper(self, *args, **kwargs) -> Any:
+                alias = await sync_to_async(choose_read_database)(get_max_lag())
+                token = _read_database.set(alias)
+                try:
+                    return await get(self, *args, **kwargs)
+                finally:
+                    _read_database.reset(token)
+            return async_wrapper
+
+        @wraps(get)
+        def wrapper(self, *args, **kwargs) -> Any:
+            with use_replica(get_max_lag()):
+                return get(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...services import purge_raw_wastes, refresh_rollups
+from ...services.retention import get_retention_cutoff
+
+
+class Command(BaseCommand):
+    """
+    Management command for applying the retention policy of the raw waste readings.
+
+    The raw readings are first folded into the hourly and daily rollups, which keep their
+    totals, and the readings older than the retention period are then deleted in bounded
+    batches. Run it periodically, e.g. daily from cron.
+    """
+    help = "Downsample raw waste readings older than WASTE_RAW_RETENTION_DAYS into the rollups " \
+           "and delete them."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--days", type=int, default=settings.WASTE_RAW_RETENTION_DAYS,
+                            help="Number of days of raw readings to keep, including the current "
+                                 "day, or 0 to keep every reading.")
+        parser.add_argument("--batch-size", type=int,
+                            default=settings.WASTE_RETENTION_BATCH_SIZE,
+                            help="Maximum number of readings deleted per transaction.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Count the readings that would be deleted without deleting them.")
+
+    def handle(self, *args, **options):
+        """
+        Refresh the rollups, delete the expired raw readings and report how many were deleted.
+        """
+        if not options["days"]:
+            self.stdout.write("Raw waste readings are kept forever; set "
+                              "WASTE_RAW_RETENTION_DAYS or pass --days to delete old ones.")
+            return
+        if not options["dry_run"]:
+            refresh_rollups()
+        deleted = purge_raw_wastes(options["days"], options["batch_size"], options["dry_run"])
+        cutoff = get_retention_cutoff(options["days"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Would delete' if options['dry_run'] else 'Deleted'} {deleted} raw waste "
+            f"readings before {cutoff:%Y-%m-%d %H:%M %Z}."))
@@ -0,0 +1,116 @@
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from ...models import Bin, Waste, Weather
+from ...services import bump_data_version, invalidate_latest
+
+BENCHMARK_BIN_NAME = "Benchmark Bin"
+BENCHMARK_LOCATION = "Benchmark Location"
+
+
+class Command(BaseCommand):
+    """
+    Management command for generating synthetic bins with waste and weather readings.
+
+    Every bin gets its own location, and every location a waste and a weather reading per
+    cadence interval. The generated bins are named "Benchmark Bin <n>", so they can be removed
+    again with --clear without touching any other data.
+    """
+    help = "Generate N bins x M days of synthetic waste and weather readings for benchmarks."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--bins", type=int, default=10,
+                            help="Number of bins to generate, each in its own location.")
+        parser.add_argument("--days", type=int, default=30,
+                            help="Number of days of readings per bin.")
+        parser.add_argument("--cadence", type=int, default=60,
+                            help="Number of minutes between two readings of a bin.")
+        parser.add_argument("--end", type=date.fromisoformat,
+                            help="Day after the last generated day (YYYY-MM-DD), today by default.")
+        parser.add_argument("--seed", type=int, default=0,
+                            help="Seed of the random waste levels and weather.")
+        parser.add_argument("--batch-size", type=int, default=5000,
+                            help="Number of rows inserted per query.")
+        parser.add_argument("--clear", action="store_true",
+                            help="Delete the previously generated bins and their readings first.")
+
+    def handle(self, *args, **options):
+        """
+        Generate the bins and readings and report how many rows were inserted.
+        """
+        if options["bins"] < 1 or options["days"] < 1 or options["cadence"] < 1:
+            raise CommandError("--bins, --days and --cadence must be positive.")
+        if options["clear"]:
+            self.clear()
+        end = timezone.make_aware(datetime.combine(
+            options["end"] or timezone.localdate(), datetime.min.time()))
+        start = end - timedelta(days=options["days"])
+        cadence = timedelta(minutes=options["cadence"])
+        timestamps = [start + cadence * step
+                      for step in range((end - start) // cadence)]
+        generator = random.Random(options["seed"])
+        with transaction.atomic():
+            bins = self.create_bins(options["bins"], generator)
+            Waste.objects.bulk_create(
+                (Waste(bin=bin, timestamp=timestamp,
+                       level=Decimal(f"{generator.uniform(0, 5):.2f}"))
+                 for timestamp in timestamps for bin in bins),
+                batch_size=options["batch_size"])
+            Weather.objects.bulk_create(
+                (Weather(timestamp=timestamp, location=bin.location, lat=bin.lat,
+                         lon=bin.lon,
+                         temp=Decimal(f"{generator.uniform(25, 38):.2f}"),
+                         precip=Decimal(f"{generator.uniform(0, 3):.2f}"),
+                         humid=Decimal(f"{generator.uniform(40, 90):.2f}"))
+                 for timestamp in timestamps for bin in bins),
+                batch_size=options["batch_size"])
+        invalidate_latest()
+        bump_data_version()
+        rows = len(timestamps) * len(bins)
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(bins)} bins with {rows} waste and {rows} weather "
+            f"readings from {start:%Y-%m-%d} to {end:%Y-%m-%d}."))
+
+    def create_bins(self, count: int, generator: random.Random) -> list[Bin]:
+        """
+        Create the benchmark bins after the bins that already exist.
+
+        :param count: The number of bins to create.
+        :param generator: The random generator of the coordinates.
+
+        :return: The created bins.
+        """
+        first_id = (Bin.objects.aggregate(last_id=Max("bin_id"))["last_id"] or 0) + 1
+        bins = [
+            Bin(bin_id=bin_id, name=f"{BENCHMARK_BIN_NAME} {bin_id}",
+                location=f"{BENCHMARK_LOCATION} {bin_id}",
+                lat=Decimal(f"{generator.uniform(13.5, 14.5):.6f}"),
+                lon=Decimal(f"{generator.uniform(100, 101):.6f}"),
+                waste_type="General", capacity=Decimal("100.00"),
+                collect_freq="Daily")
+            for bin_id in range(first_id, first_id + count)
+        ]
+        return Bin.objects.bulk_create(bins)
+
+    def clear(self):
+        """
+        Delete the previously generated bins and their readings.
+        """
+        bins = Bin.objects.filter(name__startswith=f"{BENCHMARK_BIN_NAME} ")
+        with transaction.atomic():
+            Waste.objects.filter(bin__in=bins).delete()
+            Weather.objects.filter(
+                location__startswith=f"{BENCHMARK_LOCATION} ").delete()
+            deleted, _ = bins.delete()
+        self.stdout.write(f"Deleted {deleted} generated bins and their readings.")
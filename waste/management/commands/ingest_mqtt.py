@@ -0,0 +1,197 @@
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...services import WasteMessageBuffer
+
+
+class Command(BaseCommand):
+    """
+    Management command for consuming the waste readings that bins publish over MQTT.
+
+    Messages are received on the MQTT network thread and handed to the main thread through a
+    bounded queue. The main thread buffers them and flushes them to the waste table in
+    transactions bounded by size and time. A full queue blocks the network thread, which stops
+    acknowledging messages, so a slow database pushes back on the broker instead of growing
+    the memory of the worker.
+    """
+    help = "Subscribe to the waste topic of an MQTT broker, or read a replay file, and insert the readings."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--broker", default=settings.MQTT_BROKER,
+                            help="Host name of the MQTT broker.")
+        parser.add_argument("--port", type=int, default=settings.MQTT_PORT,
+                            help="Port of the MQTT broker.")
+        parser.add_argument("--topic", default=settings.MQTT_WASTE_TOPIC,
+                            help="Topic the bins publish their readings to.")
+        parser.add_argument("--client-id", default=settings.MQTT_CLIENT_ID,
+                            help="Client ID of the persistent session on the broker.")
+        parser.add_argument("--replay",
+                            help="Read one message payload per line from this file instead of subscribing.")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Maximum number of readings inserted per transaction.")
+        parser.add_argument("--flush-interval", type=float, default=5,
+                            help="Maximum number of seconds a reading waits before it is inserted.")
+        parser.add_argument("--max-queue", type=int, default=10000,
+                            help="Maximum number of received messages waiting to be buffered.")
+        parser.add_argument("--stats-interval", type=float, default=60,
+                            help="Report the metrics every STATS_INTERVAL seconds.")
+        parser.add_argument("--max-messages", type=int, default=0,
+                            help="Stop after receiving MAX_MESSAGES messages.")
+
+    def handle(self, *args, **options):
+        """
+        Consume waste readings until interrupted, then flush the buffer and report the metrics.
+        """
+        self.buffer = WasteMessageBuffer(options["batch_size"],
+                                         options["flush_interval"])
+        self.started = time.monotonic()
+        self.stalls = 0
+        self.max_depth = 0
+        try:
+            if options["replay"]:
+                self.replay(options["replay"], options["max_messages"])
+            else:
+                self.subscribe(options)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.buffer.flush()
+            self.report(0, final=True)
+
+    def replay(self, path: str, max_messages: int = 0):
+        """
+        Buffer and insert the message payloads of a replay file, one payload per line.
+
+        :param path: The path of the replay file.
+        :param max_messages: The number of messages after which to stop, or 0 for the whole file.
+        """
+        with open(path, encoding="utf-8") as replay_file:
+            for line in replay_file:
+                if not line.strip():
+                    continue
+                self.buffer.add(line, timezone.now())
+                if self.buffer.should_flush():
+                    self.buffer.flush()
+                if max_messages and self.buffer.stats["received"] >= max_messages:
+                    break
+
+    def create_client(self, client_id: str):
+        """
+        Create an MQTT client with paho-mqtt.
+
+        The client keeps a persistent session, so the broker queues the QoS 1 messages published
+        while the worker is down or reconnecting and delivers them once it is back.
+
+        :param client_id: The client ID identifying the session on the broker.
+
+        :return: The MQTT client.
+
+        :raises CommandError: If paho-mqtt is not installed.
+        """
+        try:
+            from paho.mqtt import client as mqtt
+        except ImportError:
+            raise CommandError("Subscribing to a broker requires paho-mqtt "
+                               "(pip install paho-mqtt). Use --replay to read a file instead.")
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=client_id,
+                                 clean_session=False)
+        else:
+            client = mqtt.Client(client_id=client_id, clean_session=False)
+        if settings.MQTT_USER:
+            client.username_pw_set(settings.MQTT_USER, settings.MQTT_PASS)
+        return client
+
+    def subscribe(self, options: dict):
+        """
+        Subscribe to the waste topic and insert the received readings until interrupted.
+
+        :param options: The command line options.
+        """
+        if not options["broker"]:
+            raise CommandError("No broker given. Set MQTT_BROKER or use --broker.")
+        messages = queue.Queue(maxsize=options["max_queue"])
+        stopping = threading.Event()
+
+        def on_connect(client, *args):
+            client.subscribe(options["topic"], qos=1)
+
+        def on_message(client, userdata, message):
+            item = (message.payload, timezone.now())
+            try:
+                messages.put_nowait(item)
+                return
+            except queue.Full:
+                self.stalls += 1
+            while not stopping.is_set():
+                try:
+                    messages.put(item, timeout=1)
+                    return
+                except queue.Full:
+                    pass
+
+        if not options["client_id"]:
+            raise CommandError("No client ID given. Set MQTT_CLIENT_ID or use --client-id.")
+        client = self.create_client(options["client_id"])
+        client.on_connect = on_connect
+        client.on_message = on_message
+        client.connect(options["broker"], options["port"])
+        client.loop_start()
+        try:
+            next_report = time.monotonic() + options["stats_interval"]
+            while not options["max_messages"] \
+                    or self.buffer.stats["received"] < options["max_messages"]:
+                self.max_depth = max(self.max_depth, messages.qsize())
+                timeout = self.buffer.time_until_flush()
+                timeout = min(timeout if timeout is not None else 1,
+                              max(next_report - time.monotonic(), 0))
+                try:
+                    payload, received_at = messages.get(timeout=timeout)
+                except queue.Empty:
+                    pass
+                else:
+                    self.buffer.add(payload, received_at)
+                if self.buffer.should_flush():
+                    self.buffer.flush()
+                if time.monotonic() >= next_report:
+                    self.report(messages.qsize())
+                    next_report = time.monotonic() + options["stats_interval"]
+        finally:
+            stopping.set()
+            client.loop_stop()
+            client.disconnect()
+            while not messages.empty():
+                self.buffer.add(*messages.get_nowait())
+
+    def report(self, depth: int, final: bool = False):
+        """
+        Write the throughput and backpressure metrics.
+
+        :param depth: The number of received messages waiting in the queue.
+        :param final: Whether this is the report after the worker stopped.
+        """
+        stats = self.buffer.stats
+        elapsed = time.monotonic() - self.started
+        rate = stats["inserted"] / elapsed if elapsed else 0
+        flush_ms = stats["flush_seconds"] / stats["flushes"] * 1000 \
+            if stats["flushes"] else 0
+        message = (f"received={stats['received']} inserted={stats['inserted']} "
+                   f"duplicates={stats['duplicates']} expired={stats['expired']} "
+                   f"invalid={stats['invalid']} flushes={stats['flushes']} "
+                   f"avg_flush={flush_ms:.1f}ms "
+                   f"rate={rate:.0f} rows/s buffered={len(self.buffer)} "
+                   f"queue={depth} max_queue={self.max_depth} stalls={self.stalls}")
+        if final:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(message)
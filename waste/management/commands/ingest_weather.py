@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services import ingest_weather
+
+
+class Command(BaseCommand):
+    """
+    Management command for fetching the current weather of every bin location.
+
+    The observations of all locations are fetched concurrently from the provider configured with
+    WEATHER_PROVIDER and stored in weather_api in one bulk insert, replacing the Node-RED flows
+    that requested one location at a time.
+    """
+    help = "Fetch the current weather of every bin location and store the new observations."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--concurrency", type=int, default=10,
+                            help="Maximum number of requests in flight.")
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Keep running and fetch the weather every INTERVAL seconds.")
+
+    def handle(self, *args, **options):
+        """
+        Fetch and store the weather, and report the inserted observations and failed locations.
+        """
+        while True:
+            started = time.perf_counter()
+            inserted, errors = ingest_weather(concurrency=options["concurrency"])
+            for location, error in errors.items():
+                self.stderr.write(f"Could not fetch the weather of {location}: {error}")
+            self.stdout.write(self.style.SUCCESS(
+                f"Inserted {inserted} weather observations in "
+                f"{time.perf_counter() - started:.2f}s."))
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,77 @@
+from argparse import BooleanOptionalAction
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...services import filter_period, maintain_partitions, resolve_period
+from ...services.partitions import PARTITIONED_MODELS
+
+
+class Command(BaseCommand):
+    """
+    Management command for maintaining the monthly partitions of the waste and weather_api tables.
+
+    The first run converts the tables to monthly partitions. Run it periodically afterwards,
+    e.g. monthly from cron, to create the partitions of the coming months before readings
+    arrive for them and to drop or archive the partitions of expired months. Partitions are
+    split at midnight in the current time zone, so run it with the TIME_ZONE of the site.
+    """
+    help = "Partition the waste and weather_api tables by month, create future partitions and " \
+           "drop or archive expired ones (MySQL only)."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--months-ahead", type=int,
+                            default=settings.WASTE_PARTITION_MONTHS_AHEAD,
+                            help="Number of future months to create partitions for.")
+        parser.add_argument("--retain-months", type=int,
+                            default=settings.WASTE_PARTITION_RETENTION_MONTHS,
+                            help="Number of months of readings to keep, including the current "
+                                 "one, or 0 to keep every month.")
+        parser.add_argument("--archive", action=BooleanOptionalAction,
+                            default=settings.WASTE_PARTITION_ARCHIVE,
+                            help="Move the readings of expired months to a table per partition, "
+                                 "e.g. waste_p202401, instead of dropping them.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Print the SQL statements without running them.")
+        parser.add_argument("--explain", metavar="YEAR[-MONTH[-DAY]]",
+                            help="Print the query plans of the readings of a period, whose "
+                                 "partitions column shows the pruned partitions.")
+
+    def handle(self, *args, **options):
+        """
+        Maintain the partitions, or explain the queries of a period, and report the statements.
+        """
+        if connection.vendor != "mysql":
+            raise CommandError("Partitioning is only supported on MySQL.")
+        if options["explain"]:
+            self.explain(options["explain"])
+            return
+        statements = maintain_partitions(options["months_ahead"], options["retain_months"],
+                                         options["archive"], options["dry_run"])
+        for table, table_statements in statements.items():
+            for statement in table_statements:
+                self.stdout.write(f"{statement};")
+            self.stdout.write(self.style.SUCCESS(
+                f"{'Planned' if options['dry_run'] else 'Ran'} "
+                f"{len(table_statements)} statements for {table}."))
+
+    def explain(self, period: str):
+        """
+        Print the query plans of the waste and weather readings of a period.
+
+        :param period: The period, e.g. 2024, 2024-04 or 2024-04-14.
+        """
+        try:
+            start, end = resolve_period(*period.split("-"))
+        except (TypeError, ValueError):
+            raise CommandError(f"Invalid period: {period}")
+        for model in PARTITIONED_MODELS:
+            self.stdout.write(model._meta.db_table)
+            self.stdout.write(
+                filter_period(model.objects.all(), start, end).explain())
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from ...services import refresh_rollups
+from ...services.rollups import ROLLUP_BATCH_SIZE, rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    Management command for folding new waste and weather readings into the rollup tables.
+
+    Run it periodically, e.g. from cron, to keep the rollups current. Views fall back to
+    the raw readings for any period that still has readings newer than the rollups.
+    """
+    help = "Fold new waste and weather readings into the hourly and daily rollups and series."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--batch-size", type=int,
+                            default=ROLLUP_BATCH_SIZE,
+                            help="Maximum number of readings processed per transaction.")
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Discard the rollups and rebuild them from the raw readings, "
+                                 "e.g. after changing TIME_ZONE. Rollups before the retention "
+                                 "horizon, whose raw readings were deleted, are kept.")
+
+    def handle(self, *args, **options):
+        """
+        Refresh the rollups and report how many readings were processed.
+        """
+        if options["rebuild"]:
+            processed = rebuild_rollups(options["batch_size"])
+        else:
+            processed = refresh_rollups(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up {processed['waste']} waste readings and "
+            f"{processed['weather']} weather readings."))
@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...models import WasteRecord, Watermark
+from ...services import append_waste_records
+from ...services.waste_records import (WASTE_RECORD, WASTE_RECORD_BATCH_SIZE,
+                                       WEATHER_GRACE_PERIOD)
+
+
+class Command(BaseCommand):
+    """
+    Management command for keeping the denormalized waste_record table current.
+
+    Only waste readings newer than the stored watermark are joined and appended, in
+    bounded batches, instead of rebuilding the table with data/data_integration.sql.
+    """
+    help = "Append new waste readings, joined with their bin and weather data, to waste_record."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--batch-size", type=int,
+                            default=WASTE_RECORD_BATCH_SIZE,
+                            help="Maximum number of waste readings processed per transaction.")
+        parser.add_argument("--grace-minutes", type=int,
+                            default=int(WEATHER_GRACE_PERIOD.total_seconds() // 60),
+                            help="How long to wait for the weather data of a reading before skipping it.")
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Keep running and check for new readings every INTERVAL seconds.")
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Empty waste_record and append every waste reading again.")
+
+    def handle(self, *args, **options):
+        """
+        Append new waste records and report the throughput.
+        """
+        if options["rebuild"]:
+            with transaction.atomic():
+                Watermark.objects.filter(name=WASTE_RECORD).delete()
+                WasteRecord.objects.all().delete()
+        elif not Watermark.objects.filter(name=WASTE_RECORD).exists() \
+                and WasteRecord.objects.exists():
+            raise CommandError(
+                "waste_record already has rows that were not appended by this "
+                "command. Run it once with --rebuild.")
+        grace_period = timedelta(minutes=options["grace_minutes"])
+        while True:
+            self.refresh(options["batch_size"], grace_period)
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def refresh(self, batch_size: int, grace_period: timedelta):
+        """
+        Append batches of waste records until no new waste readings are ready.
+
+        :param batch_size: The maximum number of waste readings processed per batch.
+        :param grace_period: How long to wait for the weather data of a reading.
+        """
+        started = time.perf_counter()
+        total_processed = total_appended = 0
+        while True:
+            processed, appended = append_waste_records(batch_size,
+                                                       grace_period)
+            total_processed += processed
+            total_appended += appended
+            if processed < batch_size:
+                break
+        elapsed = time.perf_counter() - started
+        rate = total_appended / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Appended {total_appended} records from {total_processed} "
+            f"waste readings in {elapsed:.2f}s ({rate:.0f} rows/s)."))
@@ -0,0 +1,259 @@
+import json
+import math
+import re
+import subprocess
+import time
+import tracemalloc
+from statistics import mean
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http.response import HttpResponseBase
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+
+from ...models import Bin, Waste, Weather
+from ...services import get_latest_timestamp
+
+ROUTE_PARAMETER = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    Get a percentile of some values with the nearest-rank method.
+
+    :param values: The values.
+    :param percent: The percentile, between 0 and 100.
+
+    :return: The smallest value that is greater than or equal to percent % of the values.
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    """
+    Management command for benchmarking every route of the site.
+
+    Every route in the URL configuration is requested through the test client with parameters
+    taken from the latest waste reading, e.g. after manage.py generate_benchmark_data. The latency
+    of repeated requests is measured first; the query count and peak memory are then measured on
+    one more request, so tracing does not distort the timings. The results are written to a JSON
+    report that can be compared with the report of another commit.
+    """
+    help = "Request every route through the test client and write latency, query and memory metrics to a JSON report."
+
+    def add_arguments(self, parser):
+        """
+        Add the command line arguments of the command.
+
+        :param parser: The argument parser of the command.
+        """
+        parser.add_argument("--repeat", type=int, default=20,
+                            help="Number of timed requests per route.")
+        parser.add_argument("--warmup", type=int, default=1,
+                            help="Number of untimed requests per route before the timed ones.")
+        parser.add_argument("--cold", action="store_true",
+                            help="Clear the cache before every request instead of measuring cached responses.")
+        parser.add_argument("--output", default="benchmark-report.json",
+                            help="Path of the JSON report.")
+        parser.add_argument("--compare",
+                            help="Path of a previous report to compare the results with.")
+
+    def handle(self, *args, **options):
+        """
+        Benchmark every route, write the report and print a summary.
+        """
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be positive.")
+        params = self.get_route_params()
+        host = self.get_host()
+        self.client = Client(HTTP_HOST=host)
+        report = {
+            "created": timezone.now().isoformat(),
+            "commit": self.get_commit(),
+            "database": connection.vendor,
+            "rows": {"bins": Bin.objects.count(), "waste": Waste.objects.count(),
+                     "weather": Weather.objects.count()},
+            "repeat": options["repeat"],
+            "cold_cache": options["cold"],
+            "routes": {},
+        }
+        with override_settings(ALLOWED_HOSTS=[host]):
+            for route in self.get_routes(get_resolver()):
+                path = "/" + ROUTE_PARAMETER.sub(
+                    lambda match: quote(str(params[match.group(1)])), route)
+                report["routes"][route] = self.benchmark(path, options)
+                self.stdout.write(self.format_result(route, report["routes"][route]))
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote the results of {len(report['routes'])} routes to {options['output']}."))
+        if options["compare"]:
+            self.compare(options["compare"], report)
+
+    def get_routes(self, resolver: URLResolver, prefix: str = "") -> list[str]:
+        """
+        List the routes of a URL configuration, including the routes of included configurations.
+
+        :param resolver: The resolver of the URL configuration.
+        :param prefix: The route the configuration is included under.
+
+        :return: The routes, e.g. "api/waste/<int:year>/".
+        """
+        routes = []
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLResolver):
+                routes += self.get_routes(pattern, prefix + str(pattern.pattern))
+            else:
+                routes.append(prefix + str(pattern.pattern))
+        return routes
+
+    def get_route_params(self) -> dict:
+        """
+        Get the values of the route parameters from the latest waste reading.
+
+        :return: The value of each route parameter.
+
+        :raises CommandError: If there is no waste reading.
+        """
+        latest_timestamp = get_latest_timestamp()
+        if latest_timestamp is None:
+            raise CommandError("There are no waste readings to benchmark. "
+                               "Run manage.py generate_benchmark_data first.")
+        waste = Waste.objects.select_related("bin") \
+            .filter(timestamp=latest_timestamp).order_by("bin_id").first()
+        latest_date = timezone.localdate(latest_timestamp)
+        return {"year": latest_date.year, "month": latest_date.month,
+                "day": latest_date.day, "bin": waste.bin_id, "pk": waste.bin_id,
+                "location": waste.bin.location,
+                "undefined_path": "benchmark/undefined"}
+
+    def get_host(self) -> str:
+        """
+        Get a host name to send the requests to.
+
+        :return: The first host name in ALLOWED_HOSTS without a wildcard, or localhost.
+        """
+        return next((host for host in settings.ALLOWED_HOSTS
+                     if host and "*" not in host and not host.startswith(".")), "localhost")
+
+    def get_commit(self) -> str | None:
+        """
+        Get the commit the benchmark runs on.
+
+        :return: The abbreviated commit hash, or None outside of a git checkout.
+        """
+        try:
+            result = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                    cwd=settings.BASE_DIR, capture_output=True,
+                                    text=True, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.strip()
+
+    def request(self, path: str, cold: bool) -> HttpResponseBase:
+        """
+        Request a path the way its view is used, and read the whole response.
+
+        Views without a GET handler are posted the latest waste readings, which are already
+        stored and so do not change the data, with a temporary ingest token if none is set.
+
+        :param path: The path to request.
+        :param cold: Whether to clear the cache first.
+
+        :return: The response.
+        """
+        if cold:
+            cache.clear()
+        view_class = getattr(resolve(path).func, "view_class", None)
+        if view_class is not None and not hasattr(view_class, "get") \
+                and hasattr(view_class, "post"):
+            readings = [{"bin_id": bin_id, "timestamp": timestamp.isoformat(),
+                         "level": str(level)} for bin_id, timestamp, level in
+                        Waste.objects.order_by("-timestamp")
+                        .values_list("bin_id", "timestamp", "level")[:100]]
+            token = settings.WASTE_INGEST_TOKEN or "benchmark"
+            with override_settings(WASTE_INGEST_TOKEN=token):
+                response = self.client.post(path, json.dumps(readings),
+                                            content_type="application/json",
+                                            HTTP_AUTHORIZATION=f"Token {token}")
+        else:
+            response = self.client.get(path)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def benchmark(self, path: str, options: dict) -> dict:
+        """
+        Measure the latency, query count and peak memory of a path.
+
+        :param path: The path to request.
+        :param options: The command line options.
+
+        :return: The metrics of the path.
+        """
+        for _ in range(options["warmup"]):
+            self.request(path, options["cold"])
+        timings = []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            self.request(path, options["cold"])
+            timings.append((time.perf_counter() - started) * 1000)
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                response = self.request(path, options["cold"])
+                peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+        return {
+            "path": path,
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "mean_ms": round(mean(timings), 3),
+            "queries": len(queries),
+            "peak_memory_kb": round(peak_memory / 1024, 1),
+        }
+
+    def format_result(self, route: str, result: dict) -> str:
+        """
+        Format the metrics of a route for the summary.
+
+        :param route: The route.
+        :param result: The metrics of the route.
+
+        :return: One line of the summary.
+        """
+        return (f"{route}: {result['status']} p50={result['p50_ms']:.2f}ms "
+                f"p95={result['p95_ms']:.2f}ms queries={result['queries']} "
+                f"peak={result['peak_memory_kb']:.0f}KiB")
+
+    def compare(self, path: str, report: dict):
+        """
+        Print how the latency and query count of every route changed since a previous report.
+
+        :param path: The path of the previous report.
+        :param report: The current report.
+        """
+        with open(path, encoding="utf-8") as previous_file:
+            previous = json.load(previous_file)
+        self.stdout.write(f"Compared with {previous.get('commit') or path}:")
+        for route, result in report["routes"].items():
+            before = previous["routes"].get(route)
+            if before is None:
+                self.stdout.write(f"{route}: new")
+                continue
+            ratio = result["p50_ms"] / before["p50_ms"] if before["p50_ms"] else 0
+            self.stdout.write(
+                f"{route}: p50 {before['p50_ms']:.2f} -> {result['p50_ms']:.2f}ms "
+                f"({ratio:.2f}x), p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f}ms, "
+                f"queries {before['queries']} -> {result['queries']}")
@@ -0,0 +1 @@
+from .query_metrics_middleware import QueryMetricsMiddleware
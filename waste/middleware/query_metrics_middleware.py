@@ -0,0 +1,94 @@
+import logging
+import time
+from typing import Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+from ..services import capture_queries, record_request_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class QueryMetricsMiddleware:
+    """
+    Middleware measuring the database queries and time of every request.
+
+    The number and duration of the queries are added to the response as a Server-Timing header,
+    e.g. db;dur=4.2;desc="5 queries", app;dur=10.3, and to the in-process request metrics. When
+    a request issues more queries than WASTE_QUERY_BUDGET, its SQL is logged as a warning.
+    Queries issued while a streaming response is being sent are not included, and the durations
+    of concurrent queries are added up.
+
+    The middleware supports both WSGI and ASGI, so async views run without a thread switch.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase | Awaitable[HttpResponseBase]]):
+        """
+        Create the middleware.
+
+        :param get_response: The next middleware or view.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        Handle a request and record its queries and timings.
+
+        :param request: The request.
+
+        :return: The response, with a Server-Timing header.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with capture_queries() as queries:
+            response = self.get_response(request)
+        return self.process_metrics(request, response, queries, started)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        Handle a request under ASGI and record its queries and timings.
+
+        :param request: The request.
+
+        :return: The response, with a Server-Timing header.
+        """
+        started = time.perf_counter()
+        with capture_queries() as queries:
+            response = await self.get_response(request)
+        return self.process_metrics(request, response, queries, started)
+
+    def process_metrics(self, request: HttpRequest, response: HttpResponseBase,
+                        queries: list[tuple[str, float]], started: float) -> HttpResponseBase:
+        """
+        Add the Server-Timing header, record the request metrics and log requests over the query budget.
+
+        :param request: The request.
+        :param response: The response.
+        :param queries: The (SQL, seconds) of the queries of the request.
+        :param started: The performance counter when the request started.
+
+        :return: The response, with a Server-Timing header.
+        """
+        budget = settings.WASTE_QUERY_BUDGET
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = sum(seconds for _, seconds in queries) * 1000
+        python_ms = max(total_ms - db_ms, 0)
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.2f};desc="{len(queries)} queries", app;dur={python_ms:.2f}')
+        match = request.resolver_match
+        record_request_metrics(match.route if match else request.path, len(queries),
+                               db_ms, python_ms,
+                               None if response.streaming else len(response.content))
+        if budget and len(queries) > budget:
+            logger.warning("%s %s issued %d queries (budget %d):\n%s",
+                           request.method, request.get_full_path(), len(queries),
+                           budget, "\n".join(sql for sql, _ in queries))
+        return response
@@ -0,0 +1,77 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+INDEXED_MODELS = ("Waste", "Weather")
+
+
+def create_indexes(apps, schema_editor):
+    """
+    Create the indexes declared on the unmanaged waste and weather models.
+
+    The tables are created outside of Django from data/data.sql, so tables that do not
+    exist yet are skipped and indexes that already exist are left untouched.
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        for model_name in INDEXED_MODELS:
+            model = apps.get_model("waste", model_name)
+            table = model._meta.db_table
+            if table not in tables:
+                continue
+            constraints = connection.introspection.get_constraints(cursor,
+                                                                   table)
+            for index in model._meta.indexes:
+                if index.name not in constraints:
+                    schema_editor.add_index(model, index)
+
+
+def drop_indexes(apps, schema_editor):
+    """
+    Drop the indexes declared on the unmanaged waste and weather models.
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        for model_name in INDEXED_MODELS:
+            model = apps.get_model("waste", model_name)
+            table = model._meta.db_table
+            if table not in tables:
+                continue
+            constraints = connection.introspection.get_constraints(cursor,
+                                                                   table)
+            for index in model._meta.indexes:
+                if index.name in constraints:
+                    schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waste', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='waste',
+                    name='bin',
+                    field=models.ForeignKey(db_column='bin_id', on_delete=django.db.models.deletion.CASCADE, to='waste.bin', verbose_name='Associated Bin'),
+                ),
+                migrations.AddIndex(
+                    model_name='waste',
+                    index=models.Index(fields=['bin', 'timestamp', 'level'], name='waste_bin_timestamp_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='waste',
+                    index=models.Index(fields=['timestamp', 'bin', 'level'], name='waste_timestamp_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='weather',
+                    index=models.Index(fields=['location', 'timestamp', 'temp', 'precip', 'humid'], name='weather_location_timestamp_idx'),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waste', '0002_waste_weather_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Watermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Name')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='Last ID')),
+                ('last_timestamp', models.DateTimeField(blank=True, null=True, verbose_name='Last Timestamp')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'db_table': 'watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='WeatherDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=100, verbose_name='Location')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('min_temp', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Minimum Temperature')),
+                ('max_temp', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Maximum Temperature')),
+                ('sum_temp', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Sum of Temperature')),
+                ('min_precip', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Minimum Precipitation')),
+                ('max_precip', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Maximum Precipitation')),
+                ('sum_precip', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Sum of Precipitation')),
+                ('min_humid', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Minimum Humidity')),
+                ('max_humid', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Maximum Humidity')),
+                ('sum_humid', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Sum of Humidity')),
+                ('count', models.IntegerField(verbose_name='Number of Readings')),
+            ],
+            options={
+                'db_table': 'weather_daily',
+                'constraints': [models.UniqueConstraint(fields=('location', 'date'), name='weather_daily_location_date_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WasteDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('total_level', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Total Waste Level')),
+                ('min_level', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Minimum Waste Level')),
+                ('max_level', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Maximum Waste Level')),
+                ('count', models.IntegerField(verbose_name='Number of Readings')),
+                ('bin', models.ForeignKey(db_column='bin_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to='waste.bin', verbose_name='Associated Bin')),
+            ],
+            options={
+                'db_table': 'waste_daily',
+                'indexes': [models.Index(fields=['date', 'bin', 'total_level'], name='waste_daily_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('bin', 'date'), name='waste_daily_bin_date_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WasteHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(verbose_name='Start of Hour')),
+                ('total_level', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Total Waste Level')),
+                ('min_level', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Minimum Waste Level')),
+                ('max_level', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Maximum Waste Level')),
+                ('count', models.IntegerField(verbose_name='Number of Readings')),
+                ('bin', models.ForeignKey(db_column='bin_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to='waste.bin', verbose_name='Associated Bin')),
+            ],
+            options={
+                'db_table': 'waste_hourly',
+                'indexes': [models.Index(fields=['timestamp', 'bin', 'total_level'], name='waste_hourly_timestamp_idx')],
+                'constraints': [models.UniqueConstraint(fields=('bin', 'timestamp'), name='waste_hourly_bin_timestamp_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waste', '0003_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WasteRecord',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='Record ID')),
+                ('timestamp', models.DateTimeField(verbose_name='Timestamp')),
+                ('bin_id', models.IntegerField(verbose_name='Bin ID')),
+                ('location', models.CharField(max_length=100, verbose_name='Location')),
+                ('lat', models.DecimalField(decimal_places=6, max_digits=9, verbose_name='Latitude')),
+                ('lon', models.DecimalField(decimal_places=6, max_digits=9, verbose_name='Longitude')),
+                ('temp', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Temperature')),
+                ('precip', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Precipitation')),
+                ('humid', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Humidity')),
+                ('capacity', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Bin Capacity')),
+                ('level', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Waste Level')),
+            ],
+            options={
+                'db_table': 'waste_record',
+                'managed': False,
+            },
+        ),
+    ]
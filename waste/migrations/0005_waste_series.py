@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waste', '0004_waste_record'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WasteSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('levels', models.BinaryField(verbose_name='Hourly Waste Levels')),
+                ('bin', models.ForeignKey(db_column='bin_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to='waste.bin', verbose_name='Associated Bin')),
+            ],
+            options={
+                'db_table': 'waste_series',
+                'indexes': [models.Index(fields=['date', 'bin'], name='waste_series_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('bin', 'date'), name='waste_series_bin_date_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waste', '0005_waste_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='watermark',
+            name='gaps',
+            field=models.JSONField(blank=True, default=list, verbose_name='Gaps'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations, models
+
+UNIQUE_KEY = "waste_bin_timestamp_uniq"
+
+
+def create_unique_key(apps, schema_editor):
+    """
+    Create the unique key on the bin and timestamp of the unmanaged waste table.
+
+    The table is created outside of Django from data/data.sql, so it is skipped if it does not
+    exist yet or already has the key. Duplicate readings, which concurrent ingests could store
+    before the key existed, are deleted first, keeping the first stored one.
+    """
+    connection = schema_editor.connection
+    model = apps.get_model("waste", "Waste")
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if table not in connection.introspection.table_names(cursor):
+            return
+        if UNIQUE_KEY in connection.introspection.get_constraints(cursor, table):
+            return
+    quote_name = schema_editor.quote_name
+    schema_editor.execute(
+        f"DELETE FROM {quote_name(table)} WHERE {quote_name('waste_id')} IN ("
+        f"SELECT {quote_name('waste_id')} FROM (SELECT duplicate.{quote_name('waste_id')} "
+        f"FROM {quote_name(table)} duplicate JOIN {quote_name(table)} original "
+        f"ON original.{quote_name('bin_id')} = duplicate.{quote_name('bin_id')} "
+        f"AND original.{quote_name('timestamp')} = duplicate.{quote_name('timestamp')} "
+        f"AND original.{quote_name('waste_id')} < duplicate.{quote_name('waste_id')}"
+        f") duplicates)")
+    schema_editor.execute(
+        f"CREATE UNIQUE INDEX {quote_name(UNIQUE_KEY)} ON {quote_name(table)} "
+        f"({quote_name('bin_id')}, {quote_name('timestamp')})")
+
+
+def drop_unique_key(apps, schema_editor):
+    """
+    Drop the unique key on the bin and timestamp of the unmanaged waste table.
+    """
+    connection = schema_editor.connection
+    model = apps.get_model("waste", "Waste")
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if table not in connection.introspection.table_names(cursor):
+            return
+        if UNIQUE_KEY not in connection.introspection.get_constraints(cursor, table):
+            return
+    schema_editor.execute(schema_editor.sql_delete_index % {
+        "table": schema_editor.quote_name(table),
+        "name": schema_editor.quote_name(UNIQUE_KEY),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waste', '0006_watermark_gaps'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='waste',
+                    constraint=models.UniqueConstraint(fields=('bin', 'timestamp'), name='waste_bin_timestamp_uniq'),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_unique_key, drop_unique_key),
+    ]
@@ -1,3 +1,9 @@
 from .bin import Bin
 from .waste import Waste
 from .weather import Weather
+from .watermark import Watermark
+from .waste_hourly import WasteHourly
+from .waste_daily import WasteDaily
+from .weather_daily import WeatherDaily
+from .waste_record import WasteRecord
+from .waste_series import WasteSeries
@@ -7,7 +7,7 @@ class Waste(models.Model):
     """
     Model representing waste data.
     """
-    waste_id = models.IntegerField(primary_key=True, verbose_name="Waste ID")
+    waste_id = models.AutoField(primary_key=True, verbose_name="Waste ID")
     bin = models.ForeignKey(Bin, on_delete=models.CASCADE,
                             verbose_name="Associated Bin", db_column="bin_id")
     timestamp = models.DateTimeField(verbose_name="Timestamp")
@@ -17,6 +17,16 @@ class Waste(models.Model):
     class Meta:
         managed = False
         db_table = 'waste'
+        indexes = [
+            models.Index(fields=["bin", "timestamp", "level"],
+                         name="waste_bin_timestamp_idx"),
+            models.Index(fields=["timestamp", "bin", "level"],
+                         name="waste_timestamp_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["bin", "timestamp"],
+                                    name="waste_bin_timestamp_uniq"),
+        ]
 
     def __str__(self):
         """
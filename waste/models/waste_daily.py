@@ -0,0 +1,39 @@
+from django.db import models
+
+from .bin import Bin
+
+
+class WasteDaily(models.Model):
+    """
+    Model representing waste data of a bin rolled up per day in the configured time zone.
+    """
+    bin = models.ForeignKey(Bin, on_delete=models.CASCADE,
+                            db_constraint=False, verbose_name="Associated Bin",
+                            db_column="bin_id")
+    date = models.DateField(verbose_name="Date")
+    total_level = models.DecimalField(max_digits=12, decimal_places=2,
+                                      verbose_name="Total Waste Level")
+    min_level = models.DecimalField(max_digits=6, decimal_places=2,
+                                    verbose_name="Minimum Waste Level")
+    max_level = models.DecimalField(max_digits=6, decimal_places=2,
+                                    verbose_name="Maximum Waste Level")
+    count = models.IntegerField(verbose_name="Number of Readings")
+
+    class Meta:
+        db_table = 'waste_daily'
+        constraints = [
+            models.UniqueConstraint(fields=["bin", "date"],
+                                    name="waste_daily_bin_date_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["date", "bin", "total_level"],
+                         name="waste_daily_date_idx"),
+        ]
+
+    def __str__(self):
+        """
+        Return a string representation of the daily waste rollup.
+
+        :return: A string containing the associated bin ID and date.
+        """
+        return f"Bin: {self.bin_id}, Date: {self.date}"
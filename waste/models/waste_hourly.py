@@ -0,0 +1,39 @@
+from django.db import models
+
+from .bin import Bin
+
+
+class WasteHourly(models.Model):
+    """
+    Model representing waste data of a bin rolled up per hour.
+    """
+    bin = models.ForeignKey(Bin, on_delete=models.CASCADE,
+                            db_constraint=False, verbose_name="Associated Bin",
+                            db_column="bin_id")
+    timestamp = models.DateTimeField(verbose_name="Start of Hour")
+    total_level = models.DecimalField(max_digits=12, decimal_places=2,
+                                      verbose_name="Total Waste Level")
+    min_level = models.DecimalField(max_digits=6, decimal_places=2,
+                                    verbose_name="Minimum Waste Level")
+    max_level = models.DecimalField(max_digits=6, decimal_places=2,
+                                    verbose_name="Maximum Waste Level")
+    count = models.IntegerField(verbose_name="Number of Readings")
+
+    class Meta:
+        db_table = 'waste_hourly'
+        constraints = [
+            models.UniqueConstraint(fields=["bin", "timestamp"],
+                                    name="waste_hourly_bin_timestamp_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["timestamp", "bin", "total_level"],
+                         name="waste_hourly_timestamp_idx"),
+        ]
+
+    def __str__(self):
+        """
+        Return a string representation of the hourly waste rollup.
+
+        :return: A string containing the associated bin ID and start of hour.
+        """
+        return f"Bin: {self.bin_id}, Hour: {self.timestamp}"
@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class WasteRecord(models.Model):
+    """
+    Model representing a denormalized waste record joined with its bin and weather data.
+    """
+    id = models.AutoField(primary_key=True, verbose_name="Record ID")
+    timestamp = models.DateTimeField(verbose_name="Timestamp")
+    bin_id = models.IntegerField(verbose_name="Bin ID")
+    location = models.CharField(max_length=100, verbose_name="Location")
+    lat = models.DecimalField(max_digits=9, decimal_places=6,
+                              verbose_name="Latitude")
+    lon = models.DecimalField(max_digits=9, decimal_places=6,
+                              verbose_name="Longitude")
+    temp = models.DecimalField(max_digits=5, decimal_places=2,
+                               verbose_name="Temperature")
+    precip = models.DecimalField(max_digits=5, decimal_places=2,
+                                 verbose_name="Precipitation")
+    humid = models.DecimalField(max_digits=5, decimal_places=2,
+                                verbose_name="Humidity")
+    capacity = models.DecimalField(max_digits=10, decimal_places=2,
+                                   verbose_name="Bin Capacity")
+    level = models.DecimalField(max_digits=6, decimal_places=2,
+                                verbose_name="Waste Level")
+
+    class Meta:
+        managed = False
+        db_table = 'waste_record'
+
+    def __str__(self):
+        """
+        Return a string representation of the waste record.
+
+        :return: A string containing record ID, bin ID, and timestamp.
+        """
+        return f"Record ID: {self.id}, Bin ID: {self.bin_id}, Timestamp: {self.timestamp}"
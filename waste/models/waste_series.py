@@ -0,0 +1,35 @@
+from django.db import models
+
+from .bin import Bin
+
+
+class WasteSeries(models.Model):
+    """
+    Model representing the waste levels of a bin during a day as a fixed-resolution series.
+
+    The levels are stored as a packed array of little-endian doubles, one per hour from
+    midnight in the configured time zone, with NaN for hours without readings.
+    """
+    bin = models.ForeignKey(Bin, on_delete=models.CASCADE,
+                            db_constraint=False, verbose_name="Associated Bin",
+                            db_column="bin_id")
+    date = models.DateField(verbose_name="Date")
+    levels = models.BinaryField(verbose_name="Hourly Waste Levels")
+
+    class Meta:
+        db_table = 'waste_series'
+        constraints = [
+            models.UniqueConstraint(fields=["bin", "date"],
+                                    name="waste_series_bin_date_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["date", "bin"], name="waste_series_date_idx"),
+        ]
+
+    def __str__(self):
+        """
+        Return a string representation of the daily waste series.
+
+        :return: A string containing the associated bin ID and date.
+        """
+        return f"Bin: {self.bin_id}, Date: {self.date}"
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class Watermark(models.Model):
+    """
+    Model representing how far a background job has processed a source table.
+
+    IDs up to last_id may still be missing from the table because the transactions inserting them
+    had not committed yet; gaps lists them as [first ID, last ID, ISO time first seen] ranges so
+    they are processed once they appear.
+    """
+    name = models.CharField(max_length=50, primary_key=True,
+                            verbose_name="Name")
+    last_id = models.BigIntegerField(default=0, verbose_name="Last ID")
+    last_timestamp = models.DateTimeField(null=True, blank=True,
+                                          verbose_name="Last Timestamp")
+    gaps = models.JSONField(default=list, blank=True, verbose_name="Gaps")
+    updated_at = models.DateTimeField(auto_now=True,
+                                      verbose_name="Updated At")
+
+    class Meta:
+        db_table = 'watermark'
+
+    def __str__(self):
+        """
+        Return a string representation of the watermark.
+
+        :return: A string containing the watermark name and last processed ID.
+        """
+        return f"Watermark: {self.name}, Last ID: {self.last_id}"
@@ -5,8 +5,8 @@ class Weather(models.Model):
     """
     Model representing weather data.
     """
-    weather_id = models.IntegerField(primary_key=True,
-                                     verbose_name="Weather ID")
+    weather_id = models.AutoField(primary_key=True,
+                                  verbose_name="Weather ID")
     timestamp = models.DateTimeField(verbose_name="Timestamp")
     location = models.CharField(max_length=100, verbose_name="Location")
     lat = models.DecimalField(max_digits=9, decimal_places=6,
@@ -23,6 +23,11 @@ class Weather(models.Model):
     class Meta:
         managed = False
         db_table = 'weather_api'
+        indexes = [
+            models.Index(fields=["location", "timestamp", "temp", "precip",
+                                 "humid"],
+                         name="weather_location_timestamp_idx"),
+        ]
 
     def __str__(self):
         """
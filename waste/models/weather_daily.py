@@ -0,0 +1,45 @@
+from django.db import models
+
+
+class WeatherDaily(models.Model):
+    """
+    Model representing weather data of a location rolled up per day in the configured time zone.
+
+    Sums and the number of readings are kept instead of averages so that days can be combined.
+    """
+    location = models.CharField(max_length=100, verbose_name="Location")
+    date = models.DateField(verbose_name="Date")
+    min_temp = models.DecimalField(max_digits=5, decimal_places=2,
+                                   verbose_name="Minimum Temperature")
+    max_temp = models.DecimalField(max_digits=5, decimal_places=2,
+                                   verbose_name="Maximum Temperature")
+    sum_temp = models.DecimalField(max_digits=12, decimal_places=2,
+                                   verbose_name="Sum of Temperature")
+    min_precip = models.DecimalField(max_digits=5, decimal_places=2,
+                                     verbose_name="Minimum Precipitation")
+    max_precip = models.DecimalField(max_digits=5, decimal_places=2,
+                                     verbose_name="Maximum Precipitation")
+    sum_precip = models.DecimalField(max_digits=12, decimal_places=2,
+                                     verbose_name="Sum of Precipitation")
+    min_humid = models.DecimalField(max_digits=5, decimal_places=2,
+                                    verbose_name="Minimum Humidity")
+    max_humid = models.DecimalField(max_digits=5, decimal_places=2,
+                                    verbose_name="Maximum Humidity")
+    sum_humid = models.DecimalField(max_digits=12, decimal_places=2,
+                                    verbose_name="Sum of Humidity")
+    count = models.IntegerField(verbose_name="Number of Readings")
+
+    class Meta:
+        db_table = 'weather_daily'
+        constraints = [
+            models.UniqueConstraint(fields=["location", "date"],
+                                    name="weather_daily_location_date_uniq"),
+        ]
+
+    def __str__(self):
+        """
+        Return a string representation of the daily weather rollup.
+
+        :return: A string containing the location and date.
+        """
+        return f"Location: {self.location}, Date: {self.date}"
@@ -0,0 +1,30 @@
+from .concurrent_queries import run_concurrently
+from .weather_merge import amerge_weather, merge_weather
+from .aggregation import (get_weather_aggregates, summarize_waste,
+                          summarize_weather)
+from .array_aggregation import (get_aggregation_backend,
+                                summarize_waste_arrays,
+                                summarize_weather_arrays)
+from .bin_summary import asummarize_bins, summarize_bins
+from .period import filter_period, resolve_date, resolve_period
+from .rollups import filter_dates, refresh_rollups, rollups_cover
+from .bin_readings import (get_bin_readings, get_latest_readings,
+                           get_period_readings, get_period_totals)
+from .waste_records import append_waste_records
+from .latest import (get_latest_timestamp, invalidate_latest,
+                     record_latest_readings)
+from .response_cache import (bump_data_version, get_cached_response,
+                             get_response_cache_key, get_response_cache_stats)
+from .validators import get_bin_validators, get_reading_validators
+from .records import (RECORD_ORDERING, decode_cursor, encode_cursor,
+                      get_record_pages)
+from .ingest import ingest_readings, parse_readings
+from .message_buffer import WasteMessageBuffer
+from .weather_ingest import (WeatherAPIProvider, fetch_observations,
+                             ingest_weather, store_observations)
+from .series import SERIES_RESOLUTION, get_waste_series, rebuild_waste_series
+from .request_metrics import (capture_queries, get_request_metrics,
+                              install_query_recorder, record_request_metrics,
+                              reset_request_metrics)
+from .retention import purge_raw_wastes
+from .partitions import maintain_partitions
@@ -0,0 +1,87 @@
+from django.db.models import Avg, Min, Max, Sum, QuerySet
+
+from ..models import Waste, WeatherDaily
+
+WEATHER_SUMMARY_FIELDS = ("min_temp", "max_temp", "avg_temp",
+                          "min_precip", "max_precip", "sum_precip",
+                          "min_humid", "max_humid", "avg_humid")
+
+
+def get_weather_aggregates() -> dict:
+    """
+    Build the aggregate expressions used to summarize weather readings.
+
+    :return: Aggregate expressions keyed by the name of the summary field.
+    """
+    return {
+        "min_temp": Min("temp"),
+        "max_temp": Max("temp"),
+        "avg_temp": Avg("temp"),
+        "min_precip": Min("precip"),
+        "max_precip": Max("precip"),
+        "sum_precip": Sum("precip"),
+        "min_humid": Min("humid"),
+        "max_humid": Max("humid"),
+        "avg_humid": Avg("humid"),
+    }
+
+
+def get_weather_rollup_aggregates() -> dict:
+    """
+    Build the aggregate expressions used to combine daily weather rollups.
+
+    Averages cannot be combined directly, so sums and the number of readings are
+    aggregated and the averages are derived afterwards.
+
+    :return: Aggregate expressions keyed by the name of the combined field.
+    """
+    return {
+        "min_temp": Min("min_temp"),
+        "max_temp": Max("max_temp"),
+        "total_temp": Sum("sum_temp"),
+        "min_precip": Min("min_precip"),
+        "max_precip": Max("max_precip"),
+        "sum_precip": Sum("sum_precip"),
+        "min_humid": Min("min_humid"),
+        "max_humid": Max("max_humid"),
+        "total_humid": Sum("sum_humid"),
+        "readings": Sum("count"),
+    }
+
+
+def summarize_weather(weather_queryset: QuerySet, *fields: str) -> list[dict]:
+    """
+    Summarize weather readings or daily weather rollups grouped by the given fields.
+
+    :param weather_queryset: Queryset of Weather or WeatherDaily records already narrowed to the requested scope.
+    :param fields: Fields or annotations to group by.
+
+    :return: A list of dictionaries containing the group fields and the weather summary fields.
+    """
+    if weather_queryset.model is not WeatherDaily:
+        return list(weather_queryset.values(*fields)
+                    .annotate(**get_weather_aggregates()).order_by())
+    summaries = []
+    for weather in weather_queryset.values(*fields) \
+            .annotate(**get_weather_rollup_aggregates()).order_by():
+        readings = weather.pop("readings")
+        total_temp = weather.pop("total_temp")
+        total_humid = weather.pop("total_humid")
+        weather["avg_temp"] = total_temp / readings if readings else None
+        weather["avg_humid"] = total_humid / readings if readings else None
+        summaries.append(weather)
+    return summaries
+
+
+def summarize_waste(waste_queryset: QuerySet, *fields: str) -> QuerySet:
+    """
+    Total waste readings or waste rollups grouped by the given fields.
+
+    :param waste_queryset: Queryset of Waste, WasteHourly or WasteDaily records already narrowed to the requested scope.
+    :param fields: Fields or annotations to group by.
+
+    :return: Queryset of dictionaries containing the group fields and the total waste level.
+    """
+    level = "level" if waste_queryset.model is Waste else "total_level"
+    return waste_queryset.values(*fields) \
+        .annotate(total_waste=Sum(level)).order_by()
@@ -0,0 +1,171 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, FloatField, QuerySet
+from django.db.models.functions import Cast
+
+from ..models import Waste, WeatherDaily
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AGGREGATION_BACKENDS = ("sql", "numpy")
+WEATHER_MEASURES = ("temp", "precip", "humid")
+
+
+def get_aggregation_backend(requested: str | None = None) -> str:
+    """
+    Get the backend that aggregates waste and weather readings for a request.
+
+    :param requested: The backend requested with the backend query parameter, if any.
+
+    :return: The requested backend, WASTE_AGGREGATION_BACKEND by default. The SQL backend is
+             used instead of the NumPy backend when NumPy is not installed.
+
+    :raises ValueError: If the backend is unknown.
+    """
+    backend = requested or settings.WASTE_AGGREGATION_BACKEND
+    if backend not in AGGREGATION_BACKENDS:
+        raise ValueError(f"Unknown aggregation backend: {backend}")
+    if backend == "numpy" and np is None:
+        return "sql"
+    return backend
+
+
+def to_decimal(value: float, decimal_places: int = 2) -> Decimal:
+    """
+    Convert an aggregated value back to a decimal like the ones returned by the database.
+
+    :param value: The aggregated value.
+    :param decimal_places: The number of decimal places to keep.
+
+    :return: The rounded value.
+    """
+    return Decimal(f"{value:.{decimal_places}f}")
+
+
+def get_float_columns(*fields: str) -> dict:
+    """
+    Build expressions reading numeric fields as floats.
+
+    Reading floats avoids building a Decimal for every value of the raw columns.
+
+    :param fields: The names of the numeric fields.
+
+    :return: Cast expressions keyed by an alias of each field.
+    """
+    return {f"{field}_value": Cast(F(field), FloatField()) for field in fields}
+
+
+def fetch_rows(queryset: QuerySet) -> list[tuple]:
+    """
+    Read the rows of a values_list queryset as returned by the database driver.
+
+    Skipping the per-value converters of the ORM keeps reading the raw columns of a period cheap.
+    Only use it for columns the driver already returns as Python numbers or strings.
+
+    :param queryset: The values_list queryset.
+
+    :return: The rows.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def group_rows(keys: tuple) -> tuple:
+    """
+    Group rows by key.
+
+    :param keys: The group key of each row.
+
+    :return: The distinct keys in ascending order, the group of each row, the rows ordered by
+             group, and the position of the first row of each group in that order.
+    """
+    distinct_keys, groups = np.unique(np.asarray(keys), return_inverse=True)
+    order = np.argsort(groups, kind="stable")
+    starts = np.searchsorted(groups[order], np.arange(len(distinct_keys)))
+    return distinct_keys, groups, order, starts
+
+
+def summarize_waste_arrays(waste_queryset: QuerySet, *fields: str) -> list[dict]:
+    """
+    Total waste readings or waste rollups grouped by a field, with NumPy.
+
+    The columns of the queryset are read with a single query and totalled with np.bincount
+    instead of a GROUP BY, e.g. for periods with few rows per group.
+
+    :param waste_queryset: Queryset of Waste, WasteHourly or WasteDaily records already narrowed to the requested scope.
+    :param fields: The field or annotation to group by, followed by fields that are constant within each group.
+
+    :return: A list of dictionaries containing the group fields and the total waste level, ordered by the first field.
+    """
+    level = "level" if waste_queryset.model is Waste else "total_level"
+    values = get_float_columns(level)
+    rows = fetch_rows(waste_queryset.annotate(**values)
+                      .values_list(*fields, *values).order_by())
+    if not rows:
+        return []
+    *columns, levels = zip(*rows)
+    keys, groups, order, starts = group_rows(columns[0])
+    totals = np.bincount(groups, weights=np.array(levels, dtype=float),
+                         minlength=len(keys))
+    first_rows = order[starts]
+    return [
+        {fields[0]: key,
+         **{field: columns[index][row] for index, field in enumerate(fields)
+            if index},
+         "total_waste": to_decimal(total)}
+        for key, row, total in zip(keys.tolist(), first_rows.tolist(), totals)
+    ]
+
+
+def summarize_weather_arrays(weather_queryset: QuerySet, field: str) -> list[dict]:
+    """
+    Summarize weather readings or daily weather rollups grouped by a field, with NumPy.
+
+    The columns of the queryset are read with a single query; minimums and maximums are
+    computed with np.minimum.reduceat and np.maximum.reduceat, sums and counts with np.bincount.
+
+    :param weather_queryset: Queryset of Weather or WeatherDaily records already narrowed to the requested scope.
+    :param field: The field or annotation to group by.
+
+    :return: A list of dictionaries containing the group field and the weather summary fields, ordered by the group field.
+    """
+    rollup = weather_queryset.model is WeatherDaily
+    if rollup:
+        columns = [f"{aggregate}_{measure}" for measure in WEATHER_MEASURES
+                   for aggregate in ("min", "max", "sum")] + ["count"]
+    else:
+        columns = list(WEATHER_MEASURES)
+    values = get_float_columns(*columns)
+    rows = fetch_rows(weather_queryset.annotate(**values)
+                      .values_list(field, *values).order_by())
+    if not rows:
+        return []
+    keys, *values = zip(*rows)
+    keys, groups, order, starts = group_rows(keys)
+    arrays = {column: np.array(value, dtype=float)
+              for column, value in zip(columns, values)}
+    counts = np.bincount(groups, weights=arrays["count"] if rollup else None,
+                         minlength=len(keys))
+    summaries = [{field: key} for key in keys.tolist()]
+    for measure in WEATHER_MEASURES:
+        lows, highs, totals = (arrays[f"{aggregate}_{measure}" if rollup else measure]
+                               for aggregate in ("min", "max", "sum"))
+        minimums = np.minimum.reduceat(lows[order], starts)
+        maximums = np.maximum.reduceat(highs[order], starts)
+        sums = np.bincount(groups, weights=totals, minlength=len(keys))
+        for summary, minimum, maximum, total, count in zip(
+                summaries, minimums, maximums, sums, counts):
+            summary[f"min_{measure}"] = to_decimal(minimum)
+            summary[f"max_{measure}"] = to_decimal(maximum)
+            if measure == "precip":
+                summary["sum_precip"] = to_decimal(total)
+            else:
+                summary[f"avg_{measure}"] = to_decimal(total / count, 6)
+    return summaries
@@ -0,0 +1,91 @@
+from datetime import date, datetime
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from ..models import Bin, Waste, WasteDaily, Weather, WeatherDaily
+from .latest import get_latest_timestamp
+from .period import filter_period, resolve_date
+from .records import RECORD_ORDERING
+from .rollups import filter_dates, rollups_cover
+
+
+def get_bin_readings(bin_id: int | str | None = None,
+                     location: str | None = None) -> tuple[QuerySet, QuerySet]:
+    """
+    Get the waste readings of a bin or location and the weather readings of its location.
+
+    :param bin_id: The ID of the bin, if any.
+    :param location: The location, if any. Without a bin or location every reading is returned.
+
+    :return: The waste and weather readings.
+
+    :raises Bin.DoesNotExist: If the bin or location does not exist.
+    """
+    if bin_id:
+        bin = Bin.objects.get(bin_id=bin_id)
+        return Waste.objects.filter(bin=bin), Weather.objects.filter(location=bin.location)
+    if location:
+        Bin.objects.get(location=location)
+        return (Waste.objects.filter(bin__location=location),
+                Weather.objects.filter(location=location))
+    return Waste.objects.all(), Weather.objects.all()
+
+
+def get_latest_readings(bin_id: int | str | None = None, location: str | None = None
+                        ) -> tuple[date, QuerySet, QuerySet] | None:
+    """
+    Get the waste and weather readings of the latest day with a waste reading.
+
+    :param bin_id: The ID of the bin, if any.
+    :param location: The location, if any. Without a bin or location every bin is included.
+
+    :return: The latest date and its waste readings, newest first, and weather readings, or None
+             if there is no waste reading.
+
+    :raises Bin.DoesNotExist: If the bin or location does not exist.
+    """
+    wastes, weathers = get_bin_readings(bin_id, location)
+    latest_timestamp = get_latest_timestamp(bin_id=bin_id, location=location)
+    if latest_timestamp is None:
+        return None
+    latest_date = timezone.localdate(latest_timestamp)
+    start, end = resolve_date(latest_date)
+    return (latest_date, filter_period(wastes, start, end).order_by(*RECORD_ORDERING),
+            filter_period(weathers, start, end))
+
+
+def get_period_readings(start: datetime, end: datetime, bin_id: int | str | None = None,
+                        location: str | None = None) -> tuple[QuerySet, QuerySet]:
+    """
+    Get the waste and weather readings within a period.
+
+    :param start: The start of the period (inclusive).
+    :param end: The end of the period (exclusive).
+    :param bin_id: The ID of the bin, if any.
+    :param location: The location, if any. Without a bin or location every bin is included.
+
+    :return: The waste readings, newest first, and the weather readings.
+
+    :raises Bin.DoesNotExist: If the bin or location does not exist.
+    """
+    wastes, weathers = get_bin_readings(bin_id, location)
+    return (filter_period(wastes, start, end).order_by(*RECORD_ORDERING),
+            filter_period(weathers, start, end))
+
+
+def get_period_totals(start: datetime, end: datetime) -> tuple[QuerySet, QuerySet]:
+    """
+    Get the waste and weather data to summarize every bin over a period.
+
+    Periods fully covered by the daily rollups are read from them instead of the raw readings.
+
+    :param start: The start of the period (inclusive), at midnight in the current time zone.
+    :param end: The end of the period (exclusive), at midnight in the current time zone.
+
+    :return: The waste and weather readings or daily rollups.
+    """
+    if rollups_cover(start, end):
+        return (filter_dates(WasteDaily.objects.all(), start, end),
+                filter_dates(WeatherDaily.objects.all(), start, end))
+    return get_period_readings(start, end)
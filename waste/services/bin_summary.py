@@ -0,0 +1,102 @@
+from functools import partial
+from typing import Iterable
+
+from django.db.models import QuerySet
+
+from .aggregation import (WEATHER_SUMMARY_FIELDS, summarize_waste,
+                          summarize_weather)
+from .array_aggregation import (summarize_waste_arrays,
+                                summarize_weather_arrays)
+from .concurrent_queries import run_concurrently
+
+
+def get_waste_summaries(waste_queryset: QuerySet, backend: str = "sql") -> list[dict]:
+    """
+    Compute the waste total of every bin.
+
+    :param waste_queryset: Waste data queryset already narrowed to the requested period.
+    :param backend: The aggregation backend, "sql" or "numpy".
+
+    :return: A list of dictionaries containing the ID, location and total waste of each bin,
+             ordered by bin ID.
+    """
+    if backend == "numpy":
+        return summarize_waste_arrays(waste_queryset, "bin__bin_id",
+                                      "bin__location")
+    return list(summarize_waste(waste_queryset, "bin__bin_id", "bin__location")
+                .order_by("bin__bin_id"))
+
+
+def get_weather_summaries(weather_queryset: QuerySet, backend: str = "sql") -> list[dict]:
+    """
+    Compute the weather summary of every location.
+
+    :param weather_queryset: Weather data queryset already narrowed to the requested period.
+    :param backend: The aggregation backend, "sql" or "numpy".
+
+    :return: A list of dictionaries containing the location and weather summary of each location.
+    """
+    if backend == "numpy":
+        return summarize_weather_arrays(weather_queryset, "location")
+    return list(summarize_weather(weather_queryset, "location"))
+
+
+def join_bin_summaries(bins: Iterable[dict],
+                       weather_summaries: Iterable[dict]) -> list[dict]:
+    """
+    Join the waste total of every bin with the weather summary of its location.
+
+    :param bins: The waste totals, as returned by get_waste_summaries.
+    :param weather_summaries: The weather summaries, as returned by get_weather_summaries.
+
+    :return: A list of dictionaries containing the total waste and weather summary for each bin.
+    """
+    weathers = {weather["location"]: weather for weather in weather_summaries}
+    data = []
+    for bin in bins:
+        weather_data = weathers.get(bin["bin__location"], {})
+        data.append({
+            "bin": bin["bin__bin_id"],
+            "total_waste": bin["total_waste"],
+            **{field: weather_data.get(field)
+               for field in WEATHER_SUMMARY_FIELDS}
+        })
+    return data
+
+
+def summarize_bins(waste_queryset: QuerySet, weather_queryset: QuerySet,
+                   backend: str = "sql") -> list[dict]:
+    """
+    Combine the waste total of every bin with the weather summary of its location.
+
+    Waste totals and weather summaries are fetched with one query each and joined
+    in memory by location, so the cost does not grow with the number of bins.
+    Raw readings and rollups are both accepted.
+
+    :param waste_queryset: Waste data queryset already narrowed to the requested period.
+    :param weather_queryset: Weather data queryset already narrowed to the requested period.
+    :param backend: The aggregation backend, "sql" to aggregate in the database or "numpy" to
+                    aggregate the raw columns with NumPy.
+
+    :return: A list of dictionaries containing the total waste and weather summary for each bin.
+    """
+    weather_summaries = get_weather_summaries(weather_queryset, backend)
+    return join_bin_summaries(get_waste_summaries(waste_queryset, backend),
+                              weather_summaries)
+
+
+async def asummarize_bins(waste_queryset: QuerySet, weather_queryset: QuerySet,
+                          backend: str = "sql") -> list[dict]:
+    """
+    Asynchronous version of summarize_bins, which fetches the waste totals and weather summaries concurrently.
+
+    :param waste_queryset: Waste data queryset already narrowed to the requested period.
+    :param weather_queryset: Weather data queryset already narrowed to the requested period.
+    :param backend: The aggregation backend, "sql" or "numpy".
+
+    :return: A list of dictionaries containing the total waste and weather summary for each bin.
+    """
+    bins, weather_summaries = await run_concurrently(
+        partial(get_waste_summaries, waste_queryset, backend),
+        partial(get_weather_summaries, weather_queryset, backend))
+    return join_bin_summaries(bins, weather_summaries)
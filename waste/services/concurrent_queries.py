@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+_executor = None
+
+
+def get_query_executor() -> ThreadPoolExecutor:
+    """
+    Get the pool of worker threads running the concurrent queries of the async views.
+
+    The pool has WASTE_ASYNC_QUERY_THREADS threads, which bounds the number of concurrent
+    queries and database connections of the process.
+
+    :return: The thread pool.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.WASTE_ASYNC_QUERY_THREADS,
+                                       thread_name_prefix="waste-query")
+    return _executor
+
+
+def in_transaction() -> bool:
+    """
+    Check whether the current thread is inside a transaction on any database.
+
+    :return: Whether a transaction is open.
+    """
+    return any(connection.in_atomic_block
+               for connection in connections.all(initialized_only=True))
+
+
+def run_in_worker(function: Callable[[], Any]) -> Any:
+    """
+    Call a blocking database function in a worker thread.
+
+    The connections of the worker thread are closed afterwards unless CONN_MAX_AGE keeps
+    them open, like Django does at the end of a request.
+
+    :param function: The function, without arguments.
+
+    :return: The result of the function.
+    """
+    close_old_connections()
+    try:
+        return function()
+    finally:
+        close_old_connections()
+
+
+async def run_concurrently(*functions: Callable[[], Any]) -> list:
+    """
+    Run independent blocking database functions concurrently.
+
+    Django's async ORM hands every query of a request to the one thread running the sync code
+    of the request, so awaiting several querysets at once still runs them one after the other.
+    Each function therefore runs in a worker thread of get_query_executor with its own
+    connection. Inside a transaction, e.g. in tests, other connections would not see its
+    changes, so the functions run one after the other on the connection of the transaction
+    instead.
+
+    :param functions: The functions, without arguments, e.g. evaluating a queryset.
+
+    :return: The results of the functions, in order.
+    """
+    if await sync_to_async(in_transaction)():
+        return [await sync_to_async(function)() for function in functions]
+    return list(await asyncio.gather(
+        *(sync_to_async(run_in_worker, thread_sensitive=False,
+                        executor=get_query_executor())(function)
+          for function in functions)))
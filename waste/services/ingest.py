@@ -0,0 +1,153 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Bin, Waste
+from .latest import record_latest_readings
+from .response_cache import bump_data_version
+from .rollups import get_retention_horizon
+
+MAX_LEVEL = Decimal("9999.99")
+
+
+def parse_level(value) -> Decimal:
+    """
+    Parse a waste level into a decimal with two decimal places.
+
+    :param value: The waste level as a number or string.
+
+    :return: The waste level.
+
+    :raises ValueError: If the waste level is not a number between 0 and MAX_LEVEL.
+    """
+    if isinstance(value, bool):
+        raise ValueError("level must be a number")
+    try:
+        level = Decimal(str(value)).quantize(Decimal("0.01"))
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError("level must be a number")
+    if not 0 <= level <= MAX_LEVEL:
+        raise ValueError(f"level must be between 0 and {MAX_LEVEL}")
+    return level
+
+
+def parse_timestamp(value) -> datetime:
+    """
+    Parse an ISO 8601 timestamp, interpreting naive timestamps in the current time zone.
+
+    :param value: The timestamp string.
+
+    :return: The aware timestamp.
+
+    :raises ValueError: If the timestamp is not a valid ISO 8601 date and time.
+    """
+    timestamp = parse_datetime(value) if isinstance(value, str) else None
+    if timestamp is None:
+        raise ValueError("timestamp must be an ISO 8601 date and time")
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    return timestamp
+
+
+def truncate_to_hour(timestamp: datetime) -> datetime:
+    """
+    Truncate a timestamp to the start of its hour in UTC.
+
+    Weather readings are stored on the hour, and waste readings are paired with them on their
+    exact timestamp, so readings taken at any time of the hour must be truncated the same way.
+
+    :param timestamp: The aware timestamp.
+
+    :return: The start of the hour.
+    """
+    return timestamp.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def parse_readings(rows: list) -> tuple[list[tuple[int, datetime, Decimal]], list[dict]]:
+    """
+    Validate a batch of waste readings in one pass.
+
+    The bins are looked up with a single query for the whole batch.
+
+    :param rows: The readings, each a dictionary with bin_id, timestamp and level.
+
+    :return: The parsed (bin_id, timestamp, level) readings and the errors, each with the index
+             of the invalid reading and a message.
+    """
+    bin_ids = {row.get("bin_id") for row in rows if isinstance(row, dict)}
+    known_bins = set(Bin.objects.filter(
+        bin_id__in=[bin_id for bin_id in bin_ids
+                    if isinstance(bin_id, int) and not isinstance(bin_id, bool)]
+    ).values_list("bin_id", flat=True))
+    readings = []
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("reading must be an object")
+            missing = [field for field in ("bin_id", "timestamp", "level")
+                       if field not in row]
+            if missing:
+                raise ValueError(f"missing {', '.join(missing)}")
+            if row["bin_id"] not in known_bins or isinstance(row["bin_id"], bool):
+                raise ValueError(f"unknown bin_id {row['bin_id']}")
+            readings.append((row["bin_id"], parse_timestamp(row["timestamp"]),
+                             parse_level(row["level"])))
+        except ValueError as error:
+            errors.append({"index": index, "error": str(error)})
+    return readings, errors
+
+
+def ingest_readings(readings: list[tuple[int, datetime, Decimal]],
+                    batch_size: int = 1000) -> tuple[int, int]:
+    """
+    Insert waste readings in batches, skipping readings whose bin and timestamp are already stored.
+
+    Readings are deduplicated within the batch and against the waste table, so a gateway can
+    safely resend a batch after a failed request. A reading stored by a concurrent request
+    between the lookup and the insert is skipped by the unique key on the bin and timestamp,
+    though it is still counted as inserted. Readings older than the retention horizon are
+    skipped and counted as expired: the raw readings they would duplicate may have been deleted,
+    so neither the waste table nor the rollups can tell whether they are already included. The
+    cached latest readings and API responses are updated once for the whole batch.
+
+    :param readings: The parsed (bin_id, timestamp, level) readings.
+    :param batch_size: The maximum number of readings per INSERT statement and duplicate lookup.
+
+    :return: The number of inserted readings and of expired readings.
+    """
+    unique_readings = {}
+    for bin_id, timestamp, level in readings:
+        unique_readings.setdefault((bin_id, timestamp), level)
+    horizon = get_retention_horizon()
+    keys = sorted(key for key in unique_readings
+                  if horizon is None or key[1] >= horizon)
+    expired = sum(1 for _, timestamp, _ in readings
+                  if horizon is not None and timestamp < horizon)
+    inserted = []
+    with transaction.atomic():
+        for offset in range(0, len(keys), batch_size):
+            batch = keys[offset:offset + batch_size]
+            existing = set(Waste.objects.filter(
+                bin_id__in={bin_id for bin_id, _ in batch},
+                timestamp__gte=min(timestamp for _, timestamp in batch),
+                timestamp__lte=max(timestamp for _, timestamp in batch),
+            ).values_list("bin_id", "timestamp"))
+            new_wastes = [Waste(bin_id=bin_id, timestamp=timestamp,
+                                level=unique_readings[bin_id, timestamp])
+                          for bin_id, timestamp in batch
+                          if (bin_id, timestamp) not in existing]
+            Waste.objects.bulk_create(new_wastes, batch_size=batch_size,
+                                     ignore_conflicts=True)
+            inserted += new_wastes
+    if inserted:
+        locations = dict(Bin.objects.filter(
+            bin_id__in={waste.bin_id for waste in inserted}
+        ).values_list("bin_id", "location"))
+        record_latest_readings([(waste.bin_id, locations[waste.bin_id], waste.timestamp)
+                                for waste in inserted])
+        bump_data_version([waste.timestamp for waste in inserted])
+    return len(inserted), expired
@@ -0,0 +1,93 @@
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import Waste
+
+LATEST_CACHE_PREFIX = "waste:latest"
+LATEST_GENERATION_KEY = f"{LATEST_CACHE_PREFIX}:generation"
+MISSING = object()
+
+
+def get_latest_cache_key(bin_id: int | str | None = None,
+                         location: str | None = None) -> str:
+    """
+    Build the cache key of the latest reading for all bins, a bin or a location.
+
+    :param bin_id: The ID of the bin, if any.
+    :param location: The location, if any.
+
+    :return: The cache key, including the current generation of the latest reading index.
+    """
+    generation = cache.get_or_set(LATEST_GENERATION_KEY, time.time_ns, None)
+    if bin_id:
+        scope = f"bin:{bin_id}"
+    elif location:
+        scope = f"location:{quote(location)}"
+    else:
+        scope = "all"
+    return f"{LATEST_CACHE_PREFIX}:{generation}:{scope}"
+
+
+def get_latest_timestamp(bin_id: int | str | None = None,
+                         location: str | None = None) -> datetime | None:
+    """
+    Get the timestamp of the latest waste reading for all bins, a bin or a location.
+
+    The timestamp is served from the cache and only looked up in the database on a miss.
+    Writers that bypass Django are picked up once the cached value expires after
+    WASTE_LATEST_CACHE_TIMEOUT seconds.
+
+    :param bin_id: The ID of the bin, if any.
+    :param location: The location, if any.
+
+    :return: The timestamp of the latest waste reading, or None if there is no reading.
+    """
+    key = get_latest_cache_key(bin_id, location)
+    timestamp = cache.get(key, MISSING)
+    if timestamp is MISSING:
+        wastes = Waste.objects.all()
+        if bin_id:
+            wastes = wastes.filter(bin_id=bin_id)
+        elif location:
+            wastes = wastes.filter(bin__location=location)
+        timestamp = wastes.order_by("-timestamp") \
+            .values_list("timestamp", flat=True).first()
+        cache.set(key, timestamp, settings.WASTE_LATEST_CACHE_TIMEOUT)
+    return timestamp
+
+
+def record_latest_readings(readings: list[tuple[int, str, datetime]]) -> None:
+    """
+    Update the cached latest readings after new waste readings have been written.
+
+    Only cached values are moved forward; scopes that are not cached yet are looked up
+    on their next use.
+
+    :param readings: The bin ID, bin location and timestamp of each new reading.
+    """
+    newest = {}
+    for bin_id, location, timestamp in readings:
+        for key in (get_latest_cache_key(),
+                    get_latest_cache_key(bin_id=bin_id),
+                    get_latest_cache_key(location=location)):
+            if key not in newest or timestamp > newest[key]:
+                newest[key] = timestamp
+    cached = cache.get_many(newest)
+    cache.set_many({key: timestamp for key, timestamp in newest.items()
+                    if key in cached and (cached[key] is None
+                                          or timestamp > cached[key])},
+                   settings.WASTE_LATEST_CACHE_TIMEOUT)
+
+
+def invalidate_latest() -> None:
+    """
+    Discard every cached latest reading, e.g. after waste readings have been deleted.
+    """
+    try:
+        cache.incr(LATEST_GENERATION_KEY)
+    except ValueError:
+        cache.set(LATEST_GENERATION_KEY, time.time_ns(), None)
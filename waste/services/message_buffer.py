@@ -0,0 +1,116 @@
+import json
+import time
+from datetime import datetime
+from typing import Callable
+
+from .ingest import ingest_readings, parse_readings, truncate_to_hour
+
+
+class WasteMessageBuffer:
+    """
+    Buffer of waste reading messages that is flushed to the waste table in bounded transactions.
+
+    A flush is due once the buffer holds batch_size readings or its oldest reading has waited
+    flush_interval seconds, whichever comes first.
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 5,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Create an empty buffer.
+
+        :param batch_size: The number of buffered readings that triggers a flush.
+        :param flush_interval: The number of seconds after which the oldest buffered message triggers a flush.
+        :param clock: The monotonic clock used to measure waiting times.
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.rows = []
+        self.oldest = None
+        self.stats = {"received": 0, "inserted": 0, "duplicates": 0, "expired": 0,
+                      "invalid": 0, "flushes": 0, "flush_seconds": 0.0}
+
+    def __len__(self) -> int:
+        """
+        Return the number of buffered readings.
+
+        :return: The number of buffered readings.
+        """
+        return len(self.rows)
+
+    def add(self, payload: bytes | str, received_at: datetime) -> None:
+        """
+        Buffer a message published by a bin.
+
+        Bins publish a single reading, {"bin_id": ..., "level": ...}, or a batch of readings,
+        {"bin_id": ..., "readings": [{"timestamp": ..., "level": ...}, ...]}. Readings without
+        a timestamp are stamped with the time they were received. Malformed messages are counted
+        as invalid and dropped. Like the former Node-RED flow, timestamps are truncated to the
+        hour on flush, so the readings match the weather readings of their location.
+
+        :param payload: The JSON payload of the message.
+        :param received_at: The time the message was received.
+        """
+        self.stats["received"] += 1
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            self.stats["invalid"] += 1
+            return
+        rows = [message]
+        if isinstance(message, dict) and isinstance(message.get("readings"), list):
+            rows = [{"bin_id": message.get("bin_id")} | reading
+                    if isinstance(reading, dict) else reading
+                    for reading in message["readings"]]
+        for row in rows:
+            if isinstance(row, dict):
+                row.setdefault("timestamp", received_at.isoformat())
+        if not self.rows:
+            self.oldest = self.clock()
+        self.rows += rows
+
+    def time_until_flush(self) -> float | None:
+        """
+        Get the number of seconds until the oldest buffered message is due to be flushed.
+
+        :return: The number of seconds, or None if the buffer is empty.
+        """
+        if not self.rows:
+            return None
+        return max(self.oldest + self.flush_interval - self.clock(), 0)
+
+    def should_flush(self) -> bool:
+        """
+        Check whether the buffer is full or its oldest message has waited long enough.
+
+        :return: Whether a flush is due.
+        """
+        return len(self.rows) >= self.batch_size or self.time_until_flush() == 0
+
+    def flush(self) -> int:
+        """
+        Insert the buffered readings in one transaction and empty the buffer.
+
+        Invalid readings are counted and dropped; readings already stored or older than the
+        retention horizon are counted and skipped. The buffer
+        is only emptied once the transaction has committed, so a failed flush keeps the readings
+        for the next one.
+
+        :return: The number of inserted readings.
+        """
+        if not self.rows:
+            return 0
+        started = time.perf_counter()
+        readings, errors = parse_readings(self.rows)
+        readings = [(bin_id, truncate_to_hour(timestamp), level)
+                    for bin_id, timestamp, level in readings]
+        inserted, expired = ingest_readings(readings, self.batch_size)
+        self.rows, self.oldest = [], None
+        self.stats["inserted"] += inserted
+        self.stats["duplicates"] += len(readings) - inserted - expired
+        self.stats["expired"] += expired
+        self.stats["invalid"] += len(errors)
+        self.stats["flushes"] += 1
+        self.stats["flush_seconds"] += time.perf_counter() - started
+        return inserted
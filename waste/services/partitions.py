@@ -0,0 +1,311 @@
+import re
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from ..models import Waste, Weather
+from .latest import invalidate_latest
+from .period import to_datetime
+from .response_cache import bump_data_version
+from .retention import advance_retention_horizon
+from .rollups import rollups_complete
+
+PARTITIONED_MODELS = (Waste, Weather)
+FUTURE_PARTITION = "pfuture"
+MONTH_PARTITION = re.compile(r"p(\d{4})(\d{2})")
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    Get the first day of the month a number of months after another month.
+
+    :param month: A day of the month.
+    :param months: The number of months to add, negative to go back.
+
+    :return: The first day of the resulting month.
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(month: date) -> str:
+    """
+    Get the name of the partition holding the readings of a month.
+
+    :param month: A day of the month.
+
+    :return: The partition name, e.g. p202404.
+    """
+    return f"p{month:%Y%m}"
+
+
+def get_partition_month(name: str) -> date | None:
+    """
+    Get the month whose readings a partition holds.
+
+    :param name: The partition name.
+
+    :return: The first day of the month, or None for the future partition or a partition not
+             created by this module.
+    """
+    match = MONTH_PARTITION.fullmatch(name)
+    if match is None:
+        return None
+    return date(int(match[1]), int(match[2]), 1)
+
+
+def get_partition_bound(month: date) -> int:
+    """
+    Get the upper bound of the partition of a month.
+
+    Partitions are split at midnight of the first of the month in the current time zone, so the
+    periods resolved by resolve_period never straddle a partition boundary.
+
+    :param month: A day of the month.
+
+    :return: The UNIX timestamp of the start of the next month.
+    """
+    return int(to_datetime(add_months(month, 1)).timestamp())
+
+
+def format_partitions(months: list[date], future: bool = True) -> str:
+    """
+    Format the definitions of the partitions of some months.
+
+    :param months: The first day of each month, in order.
+    :param future: Whether to end with the future partition holding every later reading.
+
+    :return: The comma-separated partition definitions.
+    """
+    definitions = [f"PARTITION `{get_partition_name(month)}` "
+                   f"VALUES LESS THAN ({get_partition_bound(month)})"
+                   for month in months]
+    if future:
+        definitions.append(f"PARTITION `{FUTURE_PARTITION}` VALUES LESS THAN MAXVALUE")
+    return ", ".join(definitions)
+
+
+def get_months(first: date, last: date) -> list[date]:
+    """
+    Get the months between two months.
+
+    :param first: A day of the first month.
+    :param last: A day of the last month.
+
+    :return: The first day of each month, both months included.
+    """
+    months = []
+    month = add_months(first, 0)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def plan_partitioning(model: type[Model], constraints: dict, first: date,
+                      last: date) -> list[str]:
+    """
+    Plan the conversion of an unpartitioned table to monthly partitions.
+
+    MySQL requires the partitioning column in every unique key, so the timestamp is appended to
+    the primary key and other unique keys without it are dropped. Partitioning by
+    UNIX_TIMESTAMP is the only range partitioning MySQL supports on a TIMESTAMP column, and it
+    still prunes partitions for range conditions on the column.
+
+    :param model: The model of the table.
+    :param constraints: The constraints of the table, as returned by the introspection of the
+                        database.
+    :param first: A day of the month of the oldest reading.
+    :param last: A day of the last month to create a partition for.
+
+    :return: The SQL statements.
+    """
+    table = model._meta.db_table
+    primary_key = model._meta.pk.column
+    changes = []
+    for name, constraint in sorted(constraints.items()):
+        if not constraint["unique"] or "timestamp" in constraint["columns"]:
+            continue
+        if constraint["primary_key"]:
+            changes.append("DROP PRIMARY KEY")
+        else:
+            changes.append(f"DROP INDEX `{name}`")
+    statements = []
+    if changes:
+        changes.append(f"ADD PRIMARY KEY (`{primary_key}`, `timestamp`)")
+        statements.append(f"ALTER TABLE `{table}` {', '.join(changes)}")
+    statements.append(f"ALTER TABLE `{table}` PARTITION BY RANGE (UNIX_TIMESTAMP(`timestamp`)) "
+                      f"({format_partitions(get_months(first, last))})")
+    return statements
+
+
+def plan_future_partitions(model: type[Model], partitions: list[str],
+                           last: date) -> list[str]:
+    """
+    Plan the partitions of the months up to a month that do not exist yet.
+
+    The new partitions are split off the future partition, which is empty unless readings
+    arrived for a month without a partition, so the reorganization is quick.
+
+    :param model: The model of the table.
+    :param partitions: The names of the partitions of the table, in order.
+    :param last: A day of the last month to create a partition for.
+
+    :return: The SQL statements.
+    """
+    table = model._meta.db_table
+    months = [month for month in map(get_partition_month, partitions) if month]
+    if not months:
+        return []
+    months = get_months(add_months(max(months), 1), last)
+    if not months:
+        return []
+    if FUTURE_PARTITION in partitions:
+        return [f"ALTER TABLE `{table}` REORGANIZE PARTITION `{FUTURE_PARTITION}` "
+                f"INTO ({format_partitions(months)})"]
+    return [f"ALTER TABLE `{table}` ADD PARTITION "
+            f"({format_partitions(months, future=False)})"]
+
+
+def plan_expired_partitions(model: type[Model], partitions: list[str], before: date,
+                            archive: bool) -> list[str]:
+    """
+    Plan the removal of the partitions of the months before a month.
+
+    Archived partitions are exchanged with an empty copy of the table, which keeps their
+    readings in a table of their own, e.g. waste_p202401, without copying them.
+
+    :param model: The model of the table.
+    :param partitions: The names of the partitions to remove.
+    :param before: The first day of the oldest month to keep.
+    :param archive: Whether to archive the readings instead of dropping them.
+
+    :return: The SQL statements.
+    """
+    table = model._meta.db_table
+    statements = []
+    for partition in partitions:
+        month = get_partition_month(partition)
+        if month is None or month >= before:
+            continue
+        if archive:
+            archive_table = f"{table}_{partition}"
+            statements += [
+                f"CREATE TABLE `{archive_table}` LIKE `{table}`",
+                f"ALTER TABLE `{archive_table}` REMOVE PARTITIONING",
+                f"ALTER TABLE `{table}` EXCHANGE PARTITION `{partition}` "
+                f"WITH TABLE `{archive_table}`",
+            ]
+        statements.append(f"ALTER TABLE `{table}` DROP PARTITION `{partition}`")
+    return statements
+
+
+def get_partitions(model: type[Model]) -> list[str]:
+    """
+    Get the names of the partitions of a table.
+
+    :param model: The model of the table.
+
+    :return: The partition names in order, or an empty list if the table is not partitioned.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+            "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION",
+            [model._meta.db_table])
+        return [name for name, in cursor.fetchall()]
+
+
+def get_expired_months(partitions: list[str], before: date) -> list[date]:
+    """
+    Get the months of the partitions older than a month.
+
+    :param partitions: The partition names.
+    :param before: The first day of the oldest month to keep.
+
+    :return: The first day of each older month.
+    """
+    return [month for month in map(get_partition_month, partitions)
+            if month and month < before]
+
+
+def plan_partition_maintenance(model: type[Model], months_ahead: int,
+                               retain_months: int, archive: bool) -> list[str]:
+    """
+    Plan the maintenance of the monthly partitions of a table.
+
+    An unpartitioned table is converted to monthly partitions from the month of its oldest
+    reading. Partitions are then created up to months_ahead months after the current month,
+    and, if retain_months is set, the partitions of the months before the retained ones are
+    dropped or archived. Months whose readings are not all included in the rollups are kept,
+    so the views reading the rollups keep their totals.
+
+    :param model: The model of the table.
+    :param months_ahead: The number of future months to create partitions for.
+    :param retain_months: The number of months to keep, including the current one, or 0 to
+                          keep every month.
+    :param archive: Whether to archive the readings of expired months instead of dropping them.
+
+    :return: The SQL statements.
+    """
+    current = add_months(timezone.localdate(), 0)
+    last = add_months(current, months_ahead)
+    partitions = get_partitions(model)
+    if not partitions:
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, model._meta.db_table)
+        oldest = model.objects.order_by("timestamp") \
+            .values_list("timestamp", flat=True).first()
+        first = timezone.localdate(oldest) if oldest else current
+        return plan_partitioning(model, constraints, min(first, current), last)
+    statements = plan_future_partitions(model, partitions, last)
+    if retain_months:
+        before = add_months(current, 1 - retain_months)
+        for month in get_expired_months(partitions, before):
+            if not rollups_complete(to_datetime(month), to_datetime(add_months(month, 1))):
+                before = month
+                break
+        statements += plan_expired_partitions(model, partitions, before, archive)
+    return statements
+
+
+def maintain_partitions(months_ahead: int, retain_months: int = 0, archive: bool = True,
+                        dry_run: bool = False) -> dict[str, list[str]]:
+    """
+    Maintain the monthly partitions of the waste and weather_api tables on MySQL.
+
+    Removing waste partitions moves the retention horizon to the oldest remaining month, so the
+    views answer the ranges before it from the rollups.
+
+    :param months_ahead: The number of future months to create partitions for.
+    :param retain_months: The number of months to keep, including the current one, or 0 to
+                          keep every month.
+    :param archive: Whether to archive the readings of expired months instead of dropping them.
+    :param dry_run: Whether to only plan the statements without running them.
+
+    :return: The SQL statements run, or planned, for each table.
+    """
+    statements = {}
+    for model in PARTITIONED_MODELS:
+        statements[model._meta.db_table] = plan_partition_maintenance(
+            model, months_ahead, retain_months, archive)
+        if dry_run:
+            continue
+        with connection.cursor() as cursor:
+            for statement in statements[model._meta.db_table]:
+                cursor.execute(statement)
+    dropped = [table for table, table_statements in statements.items()
+               if any("DROP PARTITION" in statement for statement in table_statements)]
+    if dry_run or not dropped:
+        return statements
+    if Waste._meta.db_table in dropped:
+        months = [month for month in map(get_partition_month, get_partitions(Waste)) if month]
+        with transaction.atomic():
+            advance_retention_horizon(to_datetime(min(months)))
+        invalidate_latest()
+    bump_data_version()
+    return statements
@@ -0,0 +1,71 @@
+from datetime import date, datetime, timedelta
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+
+def resolve_period(year: int | str, month: int | str = "",
+                   day: int | str = "") -> tuple[datetime, datetime]:
+    """
+    Resolve a year, month or day into a half-open datetime range in the current time zone.
+
+    :param year: The year of the period.
+    :param month: The month of the period, or "" or None for the whole year.
+    :param day: The day of the period, or "" or None for the whole month.
+
+    :return: The start (inclusive) and end (exclusive) of the period.
+
+    :raises ValueError: If the period is not a valid calendar date or a day is given without a month.
+    """
+    year = int(year)
+    if day not in ("", None):
+        if month in ("", None):
+            raise ValueError("A day requires a month.")
+        start = date(year, int(month), int(day))
+        end = start + timedelta(days=1)
+    elif month not in ("", None):
+        start = date(year, int(month), 1)
+        end = date(year + start.month // 12, start.month % 12 + 1, 1)
+    else:
+        start = date(year, 1, 1)
+        end = date(year + 1, 1, 1)
+    return to_datetime(start), to_datetime(end)
+
+
+def resolve_date(day: date) -> tuple[datetime, datetime]:
+    """
+    Resolve a calendar date into a half-open datetime range in the current time zone.
+
+    :param day: The date to resolve.
+
+    :return: The start (inclusive) and end (exclusive) of the date.
+    """
+    return to_datetime(day), to_datetime(day + timedelta(days=1))
+
+
+def to_datetime(day: date) -> datetime:
+    """
+    Get the aware datetime at midnight of a date in the current time zone.
+
+    :param day: The date to convert.
+
+    :return: Midnight of the date in the current time zone.
+    """
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def filter_period(queryset: QuerySet, start: datetime,
+                  end: datetime) -> QuerySet:
+    """
+    Filter a queryset to records whose timestamp falls within a half-open range.
+
+    Comparing the raw column against constants lets the database use an index on the
+    timestamp instead of evaluating date functions on every row.
+
+    :param queryset: The queryset to filter.
+    :param start: The start of the range (inclusive).
+    :param end: The end of the range (exclusive).
+
+    :return: The filtered queryset.
+    """
+    return queryset.filter(timestamp__gte=start, timestamp__lt=end)
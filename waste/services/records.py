@@ -0,0 +1,85 @@
+import base64
+from datetime import datetime
+from typing import Iterator
+
+from django.db.models import Q, QuerySet
+
+from .weather_merge import WASTE_FIELDS, get_weather_index
+
+RECORD_ORDERING = ("-timestamp", "-waste_id")
+
+
+def encode_cursor(timestamp: datetime, waste_id: int) -> str:
+    """
+    Encode the position after a waste reading into an opaque cursor.
+
+    :param timestamp: The timestamp of the last waste reading of a page.
+    :param waste_id: The ID of the last waste reading of a page.
+
+    :return: The URL-safe cursor.
+    """
+    position = f"{timestamp.isoformat()}|{waste_id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    :param cursor: The cursor.
+
+    :return: The timestamp and ID of the waste reading the cursor points after.
+
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        timestamp, waste_id = base64.urlsafe_b64decode(
+            cursor.encode()).decode().split("|")
+    except (ValueError, UnicodeError) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
+    timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is None:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return timestamp, int(waste_id)
+
+
+def get_record_pages(waste_queryset: QuerySet, weather_queryset: QuerySet,
+                     page_size: int, cursor: str | None = None
+                     ) -> Iterator[tuple[list[tuple[dict, dict | None]], str | None]]:
+    """
+    Pair waste readings with their weather readings, page by page from newest to oldest.
+
+    Pages are read with keyset pagination on (timestamp, waste_id), so every page costs the same
+    index range scan however deep it is, and only the weather readings within the time range
+    of a page are loaded.
+
+    :param waste_queryset: Waste data queryset narrowed to the requested scope and period.
+    :param weather_queryset: Weather data queryset covering the same locations and period.
+    :param page_size: The maximum number of waste readings per page.
+    :param cursor: The cursor of the first page, if any.
+
+    :return: An iterator of pages of (waste, weather) pairs, each with the cursor of the next page,
+             or None for the last page.
+    """
+    waste_queryset = waste_queryset.order_by(*RECORD_ORDERING)
+    while True:
+        wastes = waste_queryset
+        if cursor:
+            timestamp, waste_id = decode_cursor(cursor)
+            wastes = wastes.filter(Q(timestamp__lt=timestamp)
+                                   | Q(timestamp=timestamp, waste_id__lt=waste_id))
+        wastes = list(wastes.values("waste_id", *WASTE_FIELDS)[:page_size + 1])
+        if not wastes:
+            yield [], None
+            return
+        cursor = None
+        if len(wastes) > page_size:
+            wastes = wastes[:page_size]
+            cursor = encode_cursor(wastes[-1]["timestamp"], wastes[-1]["waste_id"])
+        weather_index = get_weather_index(weather_queryset.filter(
+            timestamp__gte=wastes[-1]["timestamp"],
+            timestamp__lte=wastes[0]["timestamp"]))
+        yield [(waste, weather_index.get((waste["bin__location"], waste["timestamp"])))
+               for waste in wastes], cursor
+        if cursor is None:
+            return
@@ -0,0 +1,125 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.utils import timezone
+
+_lock = threading.Lock()
+_metrics = {}
+_since = timezone.now()
+_captured_queries = ContextVar("captured_queries", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute a query and record its SQL and duration in the queries being captured, if any.
+
+    Installed as an execute wrapper on every database connection, so queries issued in worker
+    threads are recorded as well, as long as they run in a copy of the capturing context, e.g.
+    through sync_to_async.
+
+    :param execute: The next execute wrapper, or the cursor method executing the query.
+    :param sql: The SQL of the query.
+    :param params: The parameters of the query.
+    :param many: Whether the query is executed with executemany.
+    :param context: The context of the query, with the connection and cursor.
+
+    :return: The result of the query.
+    """
+    queries = _captured_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        queries.append((sql, time.perf_counter() - started))
+
+
+def install_query_recorder(connection) -> None:
+    """
+    Install record_query on a database connection.
+
+    :param connection: The database connection.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def capture_queries() -> Iterator[list[tuple[str, float]]]:
+    """
+    Capture the queries issued in the current context.
+
+    :return: A context manager yielding the list of the (SQL, seconds) of the captured queries.
+    """
+    queries = []
+    token = _captured_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _captured_queries.reset(token)
+
+
+def record_request_metrics(route: str, queries: int, db_ms: float,
+                           python_ms: float, size: int | None) -> None:
+    """
+    Add the metrics of a request to the totals of its route.
+
+    The totals are kept in the memory of the process, so every worker process reports
+    its own requests.
+
+    :param route: The route of the request, e.g. "api/waste/<int:year>/".
+    :param queries: The number of database queries.
+    :param db_ms: The time spent in database queries, in milliseconds.
+    :param python_ms: The time spent outside of database queries, in milliseconds.
+    :param size: The size of the response body in bytes, or None for streaming responses.
+    """
+    with _lock:
+        totals = _metrics.setdefault(route, {
+            "requests": 0, "queries": 0, "max_queries": 0, "db_ms": 0.0,
+            "python_ms": 0.0, "bytes": 0})
+        totals["requests"] += 1
+        totals["queries"] += queries
+        totals["max_queries"] = max(totals["max_queries"], queries)
+        totals["db_ms"] += db_ms
+        totals["python_ms"] += python_ms
+        totals["bytes"] += size or 0
+
+
+def get_request_metrics() -> dict:
+    """
+    Get the request metrics of every route since the process started or the metrics were reset.
+
+    :return: A dictionary containing the start of the measurement and, for each route, the
+             number of requests and the average and maximum cost of a request.
+    """
+    with _lock:
+        metrics = {route: dict(totals) for route, totals in _metrics.items()}
+        since = _since
+    return {
+        "since": since,
+        "routes": {
+            route: {
+                "requests": totals["requests"],
+                "avg_queries": round(totals["queries"] / totals["requests"], 2),
+                "max_queries": totals["max_queries"],
+                "avg_db_ms": round(totals["db_ms"] / totals["requests"], 3),
+                "avg_python_ms": round(totals["python_ms"] / totals["requests"], 3),
+                "avg_bytes": round(totals["bytes"] / totals["requests"]),
+            }
+            for route, totals in sorted(metrics.items())
+        },
+    }
+
+
+def reset_request_metrics() -> None:
+    """
+    Discard the request metrics of every route.
+    """
+    global _since
+    with _lock:
+        _metrics.clear()
+        _since = timezone.now()
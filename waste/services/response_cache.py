@@ -0,0 +1,131 @@
+import hashlib
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+RESPONSE_CACHE_PREFIX = "waste:response"
+DATA_VERSION_KEY = f"{RESPONSE_CACHE_PREFIX}:data-version"
+ARCHIVE_VERSION_KEY = f"{RESPONSE_CACHE_PREFIX}:archive-version"
+HITS_KEY = f"{RESPONSE_CACHE_PREFIX}:hits"
+MISSES_KEY = f"{RESPONSE_CACHE_PREFIX}:misses"
+
+
+def get_version(key: str) -> int:
+    """
+    Get a version counter, initialising it on first use.
+
+    :param key: The cache key of the version counter.
+
+    :return: The current version.
+    """
+    return cache.get_or_set(key, time.time_ns, None)
+
+
+def bump_version(key: str) -> None:
+    """
+    Increment a version counter, so that every response cached under the previous version is ignored.
+
+    :param key: The cache key of the version counter.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def get_data_version() -> int:
+    """
+    Get the data version that responses of open periods are cached under.
+
+    :return: The current data version.
+    """
+    return get_version(DATA_VERSION_KEY)
+
+
+def bump_data_version(timestamps: list[datetime] | None = None) -> None:
+    """
+    Discard the cached responses affected by a change of the waste, weather or bin data.
+
+    Responses of open periods are always discarded. Responses of closed periods are only
+    discarded when a changed reading is older than the start of the current day, or when
+    the timestamps of the changed readings are unknown.
+
+    :param timestamps: The timestamps of the changed readings, if known.
+    """
+    bump_version(DATA_VERSION_KEY)
+    today = timezone.make_aware(
+        datetime.combine(timezone.localdate(), datetime.min.time()))
+    if timestamps is None or any(timestamp < today for timestamp in timestamps):
+        bump_version(ARCHIVE_VERSION_KEY)
+
+
+def get_response_cache_key(view: str, path: str,
+                           end: datetime | None = None) -> tuple[str, int | None]:
+    """
+    Build the cache key and timeout of a response.
+
+    Responses of closed periods, which end before now, are cached under the archive version for
+    WASTE_ARCHIVE_CACHE_TIMEOUT seconds. Any other response is cached under the data version for
+    WASTE_RESPONSE_CACHE_TIMEOUT seconds. The timeouts pick up writers that bypass Django, and
+    the version bumps of other processes when each process has a cache of its own.
+
+    :param view: The name of the view.
+    :param path: The full path of the request, including the query string.
+    :param end: The end of the requested period (exclusive), if the response covers a period.
+
+    :return: The cache key and timeout of the response.
+    """
+    digest = hashlib.sha1(path.encode()).hexdigest()
+    if end is not None and end <= timezone.now():
+        version = f"archive:{get_version(ARCHIVE_VERSION_KEY)}"
+        timeout = settings.WASTE_ARCHIVE_CACHE_TIMEOUT
+    else:
+        version = f"data:{get_data_version()}"
+        timeout = settings.WASTE_RESPONSE_CACHE_TIMEOUT
+    return f"{RESPONSE_CACHE_PREFIX}:{version}:{view}:{digest}", timeout
+
+
+def count_response_cache(key: str) -> None:
+    """
+    Increment a hit or miss counter of the response cache.
+
+    :param key: The cache key of the counter.
+    """
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_cached_response(key: str) -> dict | list | None:
+    """
+    Get the data of a cached response and count the hit or miss.
+
+    :param key: The cache key of the response.
+
+    :return: The data of the cached response, or None if it is not cached.
+    """
+    data = cache.get(key)
+    count_response_cache(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def get_response_cache_stats() -> dict:
+    """
+    Get the hit and miss counters of the response cache.
+
+    :return: A dictionary containing the hits, misses, hit ratio and current data version.
+    """
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "data_version": get_data_version(),
+    }
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import Waste, Watermark
+from .latest import invalidate_latest
+from .period import to_datetime
+from .response_cache import bump_data_version
+from .rollups import WASTE_RETENTION, WASTE_ROLLUP
+from .waste_records import WASTE_RECORD
+from .watermarks import get_pending_condition
+
+RETENTION_BATCH_SIZE = 10000
+
+
+def get_retention_cutoff(days: int) -> datetime:
+    """
+    Get the start of the oldest day whose raw waste readings are kept.
+
+    :param days: The number of days of raw readings to keep, including the current day.
+
+    :return: Midnight of the oldest kept day in the current time zone.
+    """
+    return to_datetime(timezone.localdate() - timedelta(days=days - 1))
+
+
+def advance_retention_horizon(horizon: datetime) -> None:
+    """
+    Move the retention horizon forward, so ranges before it are answered from the rollups.
+
+    Must be called inside a transaction. A horizon older than the stored one is ignored.
+
+    :param horizon: Midnight of the first day whose raw readings are all kept.
+    """
+    watermark, _ = Watermark.objects.select_for_update() \
+        .get_or_create(name=WASTE_RETENTION)
+    if watermark.last_timestamp is None or horizon > watermark.last_timestamp:
+        watermark.last_timestamp = horizon
+        watermark.save()
+
+
+def delete_wastes(waste_ids: list[int]) -> None:
+    """
+    Delete waste readings with a single statement.
+
+    The per-reading delete signals are skipped; the caller discards the cached latest readings
+    and responses once for every batch instead.
+
+    :param waste_ids: IDs of the readings.
+    """
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote_name(Waste._meta.db_table)} "
+            f"WHERE {quote_name(Waste._meta.pk.column)} IN "
+            f"({', '.join(['%s'] * len(waste_ids))})", waste_ids)
+
+
+def purge_raw_wastes(days: int, batch_size: int = RETENTION_BATCH_SIZE,
+                     dry_run: bool = False) -> int:
+    """
+    Delete the raw waste readings older than a number of days once the rollups include them.
+
+    The hourly and daily rollups keep the totals of the deleted readings, and the retention
+    horizon makes the views answer every range reaching back before the cutoff from the rollups,
+    so their totals do not change at the boundary between raw readings and rollups. Readings
+    not yet included in the rollups, or not yet appended to waste_record if that table is
+    maintained, are kept until a later run. Readings are deleted in batches of batch_size, each
+    in its own transaction, so ingestion is never blocked for long.
+
+    :param days: The number of days of raw readings to keep, including the current day.
+    :param batch_size: The maximum number of readings deleted per transaction.
+    :param dry_run: Whether to only count the readings that would be deleted.
+
+    :return: The number of deleted readings, or of readings that would be deleted.
+    """
+    cutoff = get_retention_cutoff(days)
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            watermarks = list(Watermark.objects.select_for_update()
+                              .filter(name__in=(WASTE_ROLLUP, WASTE_RECORD)))
+            if WASTE_ROLLUP not in {watermark.name for watermark in watermarks}:
+                break
+            expired = Waste.objects.filter(timestamp__lt=cutoff)
+            for watermark in watermarks:
+                expired = expired.exclude(get_pending_condition(watermark, "waste_id"))
+            if dry_run:
+                return expired.count()
+            advance_retention_horizon(cutoff)
+            waste_ids = list(expired.order_by("waste_id")
+                             .values_list("waste_id", flat=True)[:batch_size])
+            if waste_ids:
+                delete_wastes(waste_ids)
+        deleted += len(waste_ids)
+        if len(waste_ids) < batch_size:
+            break
+    if deleted:
+        invalidate_latest()
+        bump_data_version()
+    return deleted
@@ -0,0 +1,324 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, QuerySet, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from ..models import (Waste, WasteDaily, WasteHourly, WasteSeries, Watermark,
+                      Weather, WeatherDaily)
+from .period import filter_period, to_datetime
+from .series import rebuild_waste_series
+from .watermarks import advance_watermark, get_pending
+
+WASTE_ROLLUP = "waste_rollup"
+WEATHER_ROLLUP = "weather_rollup"
+WASTE_RETENTION = "waste_retention"
+ROLLUP_BATCH_SIZE = 10000
+
+
+def filter_dates(queryset: QuerySet, start: datetime,
+                 end: datetime) -> QuerySet:
+    """
+    Filter a queryset of daily rollups to the days within a half-open range.
+
+    :param queryset: The queryset of daily rollups to filter.
+    :param start: The start of the range (inclusive), at midnight in the current time zone.
+    :param end: The end of the range (exclusive), at midnight in the current time zone.
+
+    :return: The filtered queryset.
+    """
+    return queryset.filter(date__gte=timezone.localdate(start),
+                           date__lt=timezone.localdate(end))
+
+
+def has_pending_readings(watermarks: dict[str, Watermark], start: datetime, end: datetime,
+                         weather: bool = True) -> bool:
+    """
+    Check whether readings within a half-open range are not yet included in the rollups.
+
+    :param watermarks: The rollup watermarks by name.
+    :param start: The start of the range (inclusive).
+    :param end: The end of the range (exclusive).
+    :param weather: Whether to check the weather readings as well.
+
+    :return: True if a reading is pending or the rollups were never refreshed, False otherwise.
+    """
+    names = (WASTE_ROLLUP, WEATHER_ROLLUP) if weather else (WASTE_ROLLUP,)
+    if any(name not in watermarks for name in names):
+        return True
+    if filter_period(get_pending(Waste.objects.all(), watermarks[WASTE_ROLLUP]),
+                     start, end).exists():
+        return True
+    return weather and filter_period(get_pending(
+        Weather.objects.all(), watermarks[WEATHER_ROLLUP]), start, end).exists()
+
+
+def rollups_complete(start: datetime, end: datetime, weather: bool = True) -> bool:
+    """
+    Check whether the rollups include every reading within a half-open range.
+
+    Unlike rollups_cover, ranges before the retention horizon are checked as well, so readings
+    are never deleted before they are folded into the rollups.
+
+    :param start: The start of the range (inclusive).
+    :param end: The end of the range (exclusive).
+    :param weather: Whether the weather rollup must also be complete.
+
+    :return: True if no reading within the range is pending, False otherwise.
+    """
+    watermarks = {watermark.name: watermark for watermark in Watermark.objects.filter(
+        name__in=(WASTE_ROLLUP, WEATHER_ROLLUP))}
+    return not has_pending_readings(watermarks, start, end, weather)
+
+
+def rollups_cover(start: datetime, end: datetime,
+                  weather: bool = True) -> bool:
+    """
+    Check whether the rollups can answer queries for a half-open range.
+
+    Ranges starting before the retention horizon, before which raw waste readings may have been
+    deleted, can only be answered from the rollups, so they count as covered. Readings after the
+    horizon that are still pending are included once the scheduled refresh_rollups or
+    apply_retention folds them in. Other ranges are covered once every reading is included.
+
+    :param start: The start of the range (inclusive).
+    :param end: The end of the range (exclusive).
+    :param weather: Whether the weather rollup must also be complete.
+
+    :return: True if the rollups can answer queries for the range, False otherwise.
+    """
+    watermarks = {watermark.name: watermark for watermark in Watermark.objects.filter(
+        name__in=(WASTE_ROLLUP, WEATHER_ROLLUP, WASTE_RETENTION))}
+    retention = watermarks.pop(WASTE_RETENTION, None)
+    if retention is not None and start < retention.last_timestamp:
+        return True
+    return not has_pending_readings(watermarks, start, end, weather)
+
+
+def get_day_span(timestamps: list[datetime]) -> tuple[datetime, datetime]:
+    """
+    Get the whole days, in the current time zone, spanned by a list of timestamps.
+
+    :param timestamps: The timestamps to span.
+
+    :return: Midnight of the first day (inclusive) and of the day after the last (exclusive).
+    """
+    first = timezone.localdate(min(timestamps))
+    last = timezone.localdate(max(timestamps))
+    return to_datetime(first), to_datetime(last + timedelta(days=1))
+
+
+def get_retention_horizon() -> datetime | None:
+    """
+    Get the retention horizon, before which raw waste readings may have been deleted.
+
+    :return: Midnight of the first day whose raw readings are all kept, or None if no raw
+             readings have been deleted.
+    """
+    return Watermark.objects.filter(name=WASTE_RETENTION) \
+        .values_list("last_timestamp", flat=True).first()
+
+
+def rebuild_waste_rollups(bin_ids: set[int], start: datetime,
+                          end: datetime) -> None:
+    """
+    Recompute the hourly and daily waste rollups and daily waste series of some bins from the
+    raw readings.
+
+    :param bin_ids: IDs of the bins to recompute.
+    :param start: The start of the range to recompute, at midnight in the current time zone.
+    :param end: The end of the range to recompute, at midnight in the current time zone.
+    """
+    wastes = filter_period(Waste.objects.filter(bin_id__in=bin_ids), start,
+                           end)
+    rollup = {"total_level": Sum("level"), "min_level": Min("level"),
+              "max_level": Max("level"), "count": Count("waste_id")}
+    WasteHourly.objects.filter(bin_id__in=bin_ids, timestamp__gte=start,
+                               timestamp__lt=end).delete()
+    WasteHourly.objects.bulk_create(
+        WasteHourly(timestamp=hour.pop("hour"), **hour)
+        for hour in wastes.annotate(hour=TruncHour("timestamp"))
+        .values("bin_id", "hour").annotate(**rollup).order_by())
+    filter_dates(WasteDaily.objects.filter(bin_id__in=bin_ids), start,
+                 end).delete()
+    WasteDaily.objects.bulk_create(
+        WasteDaily(date=day.pop("day"), **day)
+        for day in wastes.annotate(day=TruncDate("timestamp"))
+        .values("bin_id", "day").annotate(**rollup).order_by())
+    rebuild_waste_series(bin_ids, start, end)
+
+
+def fold_waste_rollups(waste_ids: list[int]) -> None:
+    """
+    Add some waste readings to the hourly and daily rollups and daily waste series of their bins.
+
+    Used for readings older than the retention horizon, whose hours and days cannot be
+    recomputed from the raw readings because the others have been deleted.
+
+    :param waste_ids: IDs of the readings, which must not be included in the rollups yet.
+    """
+    wastes = Waste.objects.filter(waste_id__in=waste_ids)
+    rollup = {"total_level": Sum("level"), "min_level": Min("level"),
+              "max_level": Max("level"), "count": Count("waste_id")}
+    for model, field, truncate in ((WasteHourly, "timestamp", TruncHour),
+                                   (WasteDaily, "date", TruncDate)):
+        for group in wastes.annotate(bucket=truncate("timestamp")) \
+                .values("bin_id", "bucket").annotate(**rollup).order_by():
+            lookup = {"bin_id": group.pop("bin_id"), field: group.pop("bucket")}
+            existing = model.objects.filter(**lookup).first()
+            if existing is None:
+                model.objects.create(**lookup, **group)
+                continue
+            existing.total_level += group["total_level"]
+            existing.min_level = min(existing.min_level, group["min_level"])
+            existing.max_level = max(existing.max_level, group["max_level"])
+            existing.count += group["count"]
+            existing.save()
+    bins = list(wastes.values_list("bin_id", "timestamp"))
+    rebuild_waste_series({bin_id for bin_id, _ in bins},
+                         *get_day_span([timestamp for _, timestamp in bins]))
+
+
+def rebuild_weather_rollups(locations: set[str], start: datetime,
+                            end: datetime) -> None:
+    """
+    Recompute the daily weather rollups of some locations from the raw readings.
+
+    :param locations: The locations to recompute.
+    :param start: The start of the range to recompute, at midnight in the current time zone.
+    :param end: The end of the range to recompute, at midnight in the current time zone.
+    """
+    weathers = filter_period(Weather.objects.filter(location__in=locations),
+                             start, end)
+    filter_dates(WeatherDaily.objects.filter(location__in=locations), start,
+                 end).delete()
+    WeatherDaily.objects.bulk_create(
+        WeatherDaily(date=day.pop("day"), **day)
+        for day in weathers.annotate(day=TruncDate("timestamp"))
+        .values("location", "day").annotate(
+            min_temp=Min("temp"), max_temp=Max("temp"), sum_temp=Sum("temp"),
+            min_precip=Min("precip"), max_precip=Max("precip"),
+            sum_precip=Sum("precip"), min_humid=Min("humid"),
+            max_humid=Max("humid"), sum_humid=Sum("humid"),
+            count=Count("weather_id")).order_by())
+
+
+def refresh_waste_rollups(batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """
+    Fold waste readings added since the last refresh into the waste rollups.
+
+    Every hour and day touched by the new readings is recomputed from the raw readings,
+    so running the refresh again, or concurrently with ingestion, never counts a reading twice.
+    Readings committed after others with a higher ID are picked up from the watermark gaps.
+    Readings older than the retention horizon are added to the rollups instead, since the raw
+    readings of their hours may have been deleted.
+
+    :param batch_size: The maximum number of new readings to process.
+
+    :return: The number of new readings processed.
+    """
+    with transaction.atomic():
+        watermark, _ = Watermark.objects.select_for_update() \
+            .get_or_create(name=WASTE_ROLLUP)
+        wastes = list(get_pending(Waste.objects.all(), watermark)
+                      .values_list("waste_id", "bin_id", "timestamp")
+                      [:batch_size])
+        if not wastes:
+            return 0
+        timestamps = [timestamp for _, _, timestamp in wastes]
+        horizon = get_retention_horizon()
+        late = [waste for waste in wastes if horizon and waste[2] < horizon]
+        current = [waste for waste in wastes if not horizon or waste[2] >= horizon]
+        if late:
+            fold_waste_rollups([waste_id for waste_id, _, _ in late])
+        if current:
+            rebuild_waste_rollups({bin_id for _, bin_id, _ in current},
+                                  *get_day_span([timestamp for _, _, timestamp in current]))
+        advance_watermark(watermark, Waste, [waste_id for waste_id, _, _ in wastes],
+                          timestamps)
+        watermark.save()
+    return len(wastes)
+
+
+def refresh_weather_rollups(batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """
+    Fold weather readings added since the last refresh into the weather rollups.
+
+    :param batch_size: The maximum number of new readings to process.
+
+    :return: The number of new readings processed.
+    """
+    with transaction.atomic():
+        watermark, _ = Watermark.objects.select_for_update() \
+            .get_or_create(name=WEATHER_ROLLUP)
+        weathers = list(get_pending(Weather.objects.all(), watermark)
+                        .values_list("weather_id", "location", "timestamp")
+                        [:batch_size])
+        if not weathers:
+            return 0
+        timestamps = [timestamp for _, _, timestamp in weathers]
+        rebuild_weather_rollups({location for _, location, _ in weathers},
+                                *get_day_span(timestamps))
+        advance_watermark(watermark, Weather,
+                          [weather_id for weather_id, _, _ in weathers], timestamps)
+        watermark.save()
+    return len(weathers)
+
+
+def refresh_rollups(batch_size: int = ROLLUP_BATCH_SIZE) -> dict[str, int]:
+    """
+    Fold every reading added since the last refresh into the rollups, one batch at a time.
+
+    :param batch_size: The maximum number of new readings to process per batch.
+
+    :return: The number of waste and weather readings processed.
+    """
+    processed = {"waste": 0, "weather": 0}
+    while batch := refresh_waste_rollups(batch_size):
+        processed["waste"] += batch
+    while batch := refresh_weather_rollups(batch_size):
+        processed["weather"] += batch
+    return processed
+
+
+def rebuild_rollups(batch_size: int = ROLLUP_BATCH_SIZE) -> dict[str, int]:
+    """
+    Discard the rollups and rebuild them from the raw readings, e.g. after changing TIME_ZONE.
+
+    Once raw waste readings have been deleted, the rollups before the retention horizon hold the
+    only totals of the deleted readings, so they are kept and only the rollups from the horizon
+    on are rebuilt. Pending readings are folded in first, so the kept rollups are complete.
+
+    :param batch_size: The maximum number of new readings to process per batch.
+
+    :return: The number of waste and weather readings folded into the rollups.
+    """
+    horizon = get_retention_horizon()
+    if horizon is None:
+        with transaction.atomic():
+            Watermark.objects.filter(name__in=(WASTE_ROLLUP, WEATHER_ROLLUP)).delete()
+            WasteHourly.objects.all().delete()
+            WasteDaily.objects.all().delete()
+            WasteSeries.objects.all().delete()
+            WeatherDaily.objects.all().delete()
+        return refresh_rollups(batch_size)
+    processed = refresh_rollups(batch_size)
+    with transaction.atomic():
+        list(Watermark.objects.select_for_update()
+             .filter(name__in=(WASTE_ROLLUP, WEATHER_ROLLUP)))
+        latest = [Waste.objects.aggregate(latest=Max("timestamp"))["latest"],
+                  Weather.objects.aggregate(latest=Max("timestamp"))["latest"]]
+        end = get_day_span([horizon, timezone.now(),
+                            *(timestamp for timestamp in latest if timestamp)])[1]
+        bin_ids = set(Waste.objects.filter(timestamp__gte=horizon)
+                      .values_list("bin_id", flat=True)) \
+            | set(WasteHourly.objects.filter(timestamp__gte=horizon)
+                  .values_list("bin_id", flat=True))
+        locations = set(Weather.objects.filter(timestamp__gte=horizon)
+                        .values_list("location", flat=True)) \
+            | set(filter_dates(WeatherDaily.objects.all(), horizon, end)
+                  .values_list("location", flat=True))
+        rebuild_waste_rollups(bin_ids, horizon, end)
+        rebuild_weather_rollups(locations, horizon, end)
+    return processed
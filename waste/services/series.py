@@ -0,0 +1,143 @@
+import math
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import groupby
+from typing import Iterable, Sequence
+
+from django.db.models import Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from ..models import Waste, WasteHourly, WasteSeries
+from .period import filter_period, resolve_date
+
+SERIES_RESOLUTION = timedelta(hours=1)
+
+
+def get_slot_count(start: datetime, end: datetime) -> int:
+    """
+    Get the number of series slots within a half-open range.
+
+    :param start: The start of the range (inclusive).
+    :param end: The end of the range (exclusive).
+
+    :return: The number of slots, e.g. 24 for a day without a daylight saving transition.
+    """
+    return (end - start) // SERIES_RESOLUTION
+
+
+def build_series(totals: Iterable[tuple[datetime, Decimal | float]],
+                 start: datetime, end: datetime) -> array:
+    """
+    Build a series of waste levels from the total waste level of some slots.
+
+    :param totals: The start of a slot and its total waste level, for each slot with readings.
+    :param start: The start of the series (inclusive).
+    :param end: The end of the series (exclusive).
+
+    :return: The waste level of each slot, NaN for slots without readings.
+    """
+    levels = array("d", [math.nan]) * get_slot_count(start, end)
+    for timestamp, total in totals:
+        slot = (timestamp - start) // SERIES_RESOLUTION
+        level = levels[slot]
+        levels[slot] = float(total) if math.isnan(level) else level + float(total)
+    return levels
+
+
+def encode_series(levels: array) -> bytes:
+    """
+    Pack a series of waste levels into the blob stored in the waste_series table.
+
+    :param levels: The waste level of each slot.
+
+    :return: The levels as little-endian doubles.
+    """
+    if sys.byteorder == "big":
+        levels = array("d", levels)
+        levels.byteswap()
+    return levels.tobytes()
+
+
+def decode_series(blob: bytes | memoryview) -> Sequence[float]:
+    """
+    Unpack a blob stored in the waste_series table.
+
+    On little-endian machines the blob is read in place, without copying it, so slicing the
+    series only converts the slots that are used.
+
+    :param blob: The levels as little-endian doubles.
+
+    :return: The waste level of each slot, NaN for slots without readings.
+    """
+    if sys.byteorder == "little":
+        return memoryview(blob).cast("B").cast("d")
+    levels = array("d", bytes(blob))
+    levels.byteswap()
+    return levels
+
+
+def rebuild_waste_series(bin_ids: set[int], start: datetime,
+                         end: datetime) -> None:
+    """
+    Recompute the daily waste series of some bins from the hourly waste rollups.
+
+    :param bin_ids: IDs of the bins to recompute.
+    :param start: The start of the range to recompute, at midnight in the current time zone.
+    :param end: The end of the range to recompute, at midnight in the current time zone.
+    """
+    hours = WasteHourly.objects.filter(
+        bin_id__in=bin_ids, timestamp__gte=start, timestamp__lt=end) \
+        .order_by("bin_id", "timestamp") \
+        .values_list("bin_id", "timestamp", "total_level")
+    WasteSeries.objects.filter(bin_id__in=bin_ids,
+                               date__gte=timezone.localdate(start),
+                               date__lt=timezone.localdate(end)).delete()
+    WasteSeries.objects.bulk_create(
+        WasteSeries(bin_id=bin_id, date=day, levels=encode_series(build_series(
+            ((timestamp, total) for _, timestamp, total in rows),
+            *resolve_date(day))))
+        for (bin_id, day), rows in groupby(
+            hours, key=lambda hour: (hour[0], timezone.localdate(hour[1]))))
+
+
+def get_waste_series(day: date, stored: bool = True, first: int = 0,
+                     last: int | None = None, **filters) -> list[float | None]:
+    """
+    Get the total waste level of each hour of a date.
+
+    Stored series are sliced before their levels are converted, so no model instances or
+    Decimal values are built. Without stored series, the levels are computed from the raw
+    readings instead.
+
+    :param day: The date of the series.
+    :param stored: Whether to read the stored series, which requires the rollups to include
+                   every reading of the date.
+    :param first: The first slot to return.
+    :param last: The slot after the last slot to return, or None for the end of the day.
+    :param filters: Lookups narrowing the waste data to a bin or location, e.g. bin_id or
+                    bin__location.
+
+    :return: The total waste level of each requested slot, None for slots without readings.
+    """
+    start, end = resolve_date(day)
+    if stored:
+        series = (decode_series(blob)[first:last] for blob in
+                  WasteSeries.objects.filter(date=day, **filters)
+                  .values_list("levels", flat=True))
+    else:
+        series = [build_series(
+            filter_period(Waste.objects.filter(**filters), start, end)
+            .annotate(hour=TruncHour("timestamp")).order_by()
+            .values_list("hour").annotate(total=Sum("level")),
+            start, end)[first:last]]
+    totals = [None] * len(range(get_slot_count(start, end))[first:last])
+    for levels in series:
+        for slot, level in enumerate(levels):
+            if not math.isnan(level):
+                totals[slot] = level if totals[slot] is None \
+                    else totals[slot] + level
+    return [round(total, 2) if total is not None else None
+            for total in totals]
@@ -0,0 +1,57 @@
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+
+from ..models import Bin, Waste, Weather
+from .period import filter_period
+
+
+def get_reading_validators(start: datetime, end: datetime,
+                           bin_id: int | str | None = None,
+                           location: str | None = None) -> tuple[str, datetime | None]:
+    """
+    Compute the validators of a response built from the waste and weather readings of a scope.
+
+    The ETag is derived from the number of readings and the timestamp of the latest reading,
+    so it changes whenever readings are added to or removed from the scope.
+
+    :param start: The start of the period (inclusive).
+    :param end: The end of the period (exclusive).
+    :param bin_id: The ID of the bin, if any.
+    :param location: The location, if any.
+
+    :return: The ETag and the timestamp of the latest reading, or None if there is no reading.
+    """
+    wastes = filter_period(Waste.objects.all(), start, end)
+    weathers = filter_period(Weather.objects.all(), start, end)
+    if bin_id:
+        wastes = wastes.filter(bin_id=bin_id)
+        weathers = weathers.filter(
+            location__in=Bin.objects.filter(bin_id=bin_id).values("location"))
+    elif location:
+        wastes = wastes.filter(bin__location=location)
+        weathers = weathers.filter(location=location)
+    waste = wastes.aggregate(latest=Max("timestamp"), count=Count("*"))
+    weather = weathers.aggregate(latest=Max("timestamp"), count=Count("*"))
+    state = f"{waste['count']}:{waste['latest']}:{weather['count']}:{weather['latest']}"
+    timestamps = [timestamp for timestamp in (waste["latest"], weather["latest"])
+                  if timestamp is not None]
+    return hashlib.sha1(state.encode()).hexdigest(), max(timestamps, default=None)
+
+
+def get_bin_validators(bin_id: int | str | None = None) -> tuple[str, None]:
+    """
+    Compute the validators of a response built from the bins.
+
+    Bins have no modification time, so the ETag is derived from the bin rows themselves.
+
+    :param bin_id: The ID of the bin, if any.
+
+    :return: The ETag and no modification time.
+    """
+    bins = Bin.objects.order_by("bin_id")
+    if bin_id:
+        bins = bins.filter(bin_id=bin_id)
+    state = repr(list(bins.values_list()))
+    return hashlib.sha1(state.encode()).hexdigest(), None
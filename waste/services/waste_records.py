@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Waste, WasteRecord, Watermark, Weather
+from .watermarks import advance_watermark, get_pending
+from .weather_merge import get_weather_index
+
+WASTE_RECORD = "waste_record"
+WASTE_RECORD_BATCH_SIZE = 5000
+WEATHER_GRACE_PERIOD = timedelta(hours=2)
+
+
+def append_waste_records(batch_size: int = WASTE_RECORD_BATCH_SIZE,
+                         grace_period: timedelta = WEATHER_GRACE_PERIOD) -> tuple[int, int]:
+    """
+    Append waste readings added since the last run to the denormalized waste_record table.
+
+    Readings are processed in waste ID order and the watermark is advanced in the same
+    transaction as the inserted records, so an interrupted or repeated run never appends
+    a reading twice, and readings committed after others with a higher ID are picked up from
+    the watermark gaps. Like data/data_integration.sql, readings without weather data at
+    the same location and time are left out, except that readings younger than the
+    grace period stop the batch so their weather data can still arrive.
+
+    :param batch_size: The maximum number of waste readings to process.
+    :param grace_period: How long to wait for the weather data of a reading.
+
+    :return: The number of waste readings processed and the number of records appended.
+    """
+    with transaction.atomic():
+        watermark, _ = Watermark.objects.select_for_update() \
+            .get_or_create(name=WASTE_RECORD)
+        wastes = list(get_pending(Waste.objects.all(), watermark)
+                      .values("waste_id", "bin_id", "timestamp", "level",
+                              "bin__location", "bin__lat", "bin__lon",
+                              "bin__capacity")[:batch_size])
+        if not wastes:
+            return 0, 0
+        weather_index = get_weather_index(Weather.objects.filter(
+            location__in={waste["bin__location"] for waste in wastes},
+            timestamp__gte=min(waste["timestamp"] for waste in wastes),
+            timestamp__lte=max(waste["timestamp"] for waste in wastes)))
+        cutoff = timezone.now() - grace_period
+        processed = []
+        records = []
+        for waste in wastes:
+            weather = weather_index.get(
+                (waste["bin__location"], waste["timestamp"]))
+            if weather is None and waste["timestamp"] > cutoff:
+                break
+            processed.append(waste)
+            if weather is not None:
+                records.append(WasteRecord(
+                    timestamp=waste["timestamp"],
+                    bin_id=waste["bin_id"],
+                    location=waste["bin__location"],
+                    lat=waste["bin__lat"],
+                    lon=waste["bin__lon"],
+                    temp=weather["temp"],
+                    precip=weather["precip"],
+                    humid=weather["humid"],
+                    capacity=waste["bin__capacity"],
+                    level=waste["level"],
+                ))
+        if not processed:
+            return 0, 0
+        WasteRecord.objects.bulk_create(records)
+        advance_watermark(watermark, Waste, [waste["waste_id"] for waste in processed],
+                          [waste["timestamp"] for waste in processed])
+        watermark.save()
+    return len(processed), len(records)
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+from django.db.models import Model, Q, QuerySet
+from django.utils import timezone
+
+from ..models import Watermark
+
+WATERMARK_GAP_TIMEOUT = timedelta(hours=1)
+
+
+def get_pending_condition(watermark: Watermark, field: str) -> Q:
+    """
+    Build the condition matching the rows a watermark has not processed yet.
+
+    :param watermark: The watermark.
+    :param field: The name of the ID field of the source table.
+
+    :return: The condition matching the rows after the last processed ID or within its gaps.
+    """
+    condition = Q(**{f"{field}__gt": watermark.last_id})
+    for first, last, _ in watermark.gaps:
+        condition |= Q(**{f"{field}__range": (first, last)})
+    return condition
+
+
+def get_pending(queryset: QuerySet, watermark: Watermark) -> QuerySet:
+    """
+    Narrow a queryset to the rows a watermark has not processed yet, in ID order.
+
+    :param queryset: The queryset of the source table.
+    :param watermark: The watermark.
+
+    :return: The filtered and ordered queryset.
+    """
+    field = queryset.model._meta.pk.name
+    return queryset.filter(get_pending_condition(watermark, field)).order_by(field)
+
+
+def remove_ids(first: int, last: int, ids: set[int]) -> list[tuple[int, int]]:
+    """
+    Remove some IDs from a range of IDs.
+
+    :param first: The first ID of the range.
+    :param last: The last ID of the range.
+    :param ids: The IDs to remove.
+
+    :return: The remaining ranges, as (first ID, last ID) pairs.
+    """
+    ranges = []
+    for id in sorted(id for id in ids if first <= id <= last):
+        if id > first:
+            ranges.append((first, id - 1))
+        first = id + 1
+    if first <= last:
+        ranges.append((first, last))
+    return ranges
+
+
+def advance_watermark(watermark: Watermark, model: type[Model], ids: list[int],
+                      timestamps: list[datetime]) -> None:
+    """
+    Record that some rows of a source table have been processed.
+
+    Rows commit out of ID order when their transactions overlap, so IDs skipped by the processed
+    rows are kept as gaps and returned by get_pending until their rows appear. A gap still empty
+    after WATERMARK_GAP_TIMEOUT belonged to a transaction that rolled back and is forgotten.
+    Must be called inside the transaction that locked the watermark, which the caller saves.
+
+    :param watermark: The watermark, locked with select_for_update.
+    :param model: The model of the source table.
+    :param ids: The IDs of the processed rows, in the order returned by get_pending.
+    :param timestamps: The timestamps of the processed rows.
+    """
+    now = timezone.now()
+    processed = set(ids)
+    gaps = [(first, last, seen) for gap_first, gap_last, seen in watermark.gaps
+            for first, last in remove_ids(gap_first, gap_last, processed)]
+    previous = watermark.last_id
+    for id in ids:
+        if id <= previous:
+            continue
+        if id > previous + 1:
+            gaps.append((previous + 1, id - 1, now.isoformat()))
+        previous = id
+    timeout = now - WATERMARK_GAP_TIMEOUT
+    expired = [gap for gap in gaps if datetime.fromisoformat(gap[2]) < timeout]
+    if expired:
+        field = model._meta.pk.name
+        condition = Q()
+        for first, last, _ in expired:
+            condition |= Q(**{f"{field}__range": (first, last)})
+        existing = sorted(model.objects.filter(condition).values_list(field, flat=True))
+        gaps = sorted([gap for gap in gaps if gap not in expired]
+                      + [(id, id, seen) for first, last, seen in expired
+                         for id in existing if first <= id <= last])
+    watermark.gaps = [list(gap) for gap in gaps]
+    watermark.last_id = previous
+    watermark.last_timestamp = max(filter(None, [watermark.last_timestamp, *timestamps]))
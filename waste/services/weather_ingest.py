@@ -0,0 +1,179 @@
+import asyncio
+import json
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from ..models import Bin, Weather
+from .response_cache import bump_data_version
+
+WEATHER_VALUE_FIELDS = ("lat", "lon", "temp", "precip", "humid")
+
+
+class WeatherAPIProvider:
+    """
+    Weather provider for the current observations of weatherapi.com.
+
+    Any server that answers GET <url>?key=<key>&q=<location> like the current.json endpoint of
+    weatherapi.com can stand in, e.g. a local fixture server.
+    """
+
+    def __init__(self, url: str | None = None, api_key: str | None = None,
+                 timeout: float = 10):
+        """
+        Create a provider.
+
+        :param url: The URL of the current.json endpoint, WEATHER_API_URL by default.
+        :param api_key: The API key, WEATHER_API_KEY by default.
+        :param timeout: The number of seconds to wait for a response.
+        """
+        self.url = url or settings.WEATHER_API_URL
+        self.api_key = api_key if api_key is not None else settings.WEATHER_API_KEY
+        self.timeout = timeout
+
+    def get(self, location: str) -> dict:
+        """
+        Request the current observation of a location.
+
+        :param location: The location, as stored in the bin table.
+
+        :return: The decoded JSON response.
+        """
+        query = urlencode({"key": self.api_key, "q": location, "aqi": "no"})
+        with urlopen(f"{self.url}?{query}", timeout=self.timeout) as response:
+            return json.load(response)
+
+    async def fetch(self, location: str) -> dict:
+        """
+        Fetch the current observation of a location.
+
+        The blocking request runs in a worker thread, so requests for several locations
+        run concurrently.
+
+        :param location: The location, as stored in the bin table.
+
+        :return: The observation with the fields of the Weather model except weather_id. Like
+                 the former Node-RED flow, the timestamp is truncated to the hour.
+        """
+        payload = await asyncio.to_thread(self.get, location)
+        current = payload["current"]
+        timestamp = datetime.fromtimestamp(current["last_updated_epoch"],
+                                           tz=dt_timezone.utc)
+        return {
+            "timestamp": timestamp.replace(minute=0, second=0, microsecond=0),
+            "location": location,
+            "lat": payload["location"]["lat"],
+            "lon": payload["location"]["lon"],
+            "temp": current["temp_c"],
+            "precip": current["precip_mm"],
+            "humid": current["humidity"],
+        }
+
+
+def get_weather_provider():
+    """
+    Create the weather provider configured with WEATHER_PROVIDER.
+
+    :return: The weather provider.
+    """
+    return import_string(settings.WEATHER_PROVIDER)()
+
+
+async def fetch_observations(provider, locations: list[str],
+                             concurrency: int = 10) -> tuple[list[dict], dict[str, str]]:
+    """
+    Fetch the current observations of several locations concurrently.
+
+    :param provider: The weather provider, with an async fetch(location) method.
+    :param locations: The locations.
+    :param concurrency: The maximum number of requests in flight.
+
+    :return: The observations and the error of each location that could not be fetched.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(location: str) -> dict:
+        async with semaphore:
+            return await provider.fetch(location)
+
+    results = await asyncio.gather(*(fetch(location) for location in locations),
+                                   return_exceptions=True)
+    observations = []
+    errors = {}
+    for location, result in zip(locations, results):
+        if isinstance(result, Exception):
+            errors[location] = f"{type(result).__name__}: {result}"
+        else:
+            observations.append(result)
+    return observations, errors
+
+
+def parse_decimal(field: str, value: float | str) -> Decimal:
+    """
+    Convert an observed value to a decimal with the decimal places of its Weather field.
+
+    :param field: The name of the Weather field.
+    :param value: The observed value.
+
+    :return: The rounded value.
+    """
+    decimal_places = Weather._meta.get_field(field).decimal_places
+    return Decimal(str(value)).quantize(Decimal(1).scaleb(-decimal_places))
+
+
+def store_observations(observations: list[dict]) -> int:
+    """
+    Insert weather observations, skipping observations whose location and timestamp are already stored.
+
+    :param observations: The observations, with the fields of the Weather model except weather_id.
+
+    :return: The number of inserted observations.
+    """
+    unique_observations = {}
+    for observation in observations:
+        unique_observations.setdefault(
+            (observation["location"], observation["timestamp"]), observation)
+    if not unique_observations:
+        return 0
+    with transaction.atomic():
+        existing = set(Weather.objects.filter(
+            location__in={location for location, _ in unique_observations},
+            timestamp__gte=min(timestamp for _, timestamp in unique_observations),
+            timestamp__lte=max(timestamp for _, timestamp in unique_observations),
+        ).values_list("location", "timestamp"))
+        weathers = [
+            Weather(timestamp=observation["timestamp"], location=observation["location"],
+                    **{field: parse_decimal(field, observation[field])
+                       for field in WEATHER_VALUE_FIELDS})
+            for key, observation in unique_observations.items() if key not in existing
+        ]
+        Weather.objects.bulk_create(weathers)
+    if weathers:
+        bump_data_version([weather.timestamp for weather in weathers])
+    return len(weathers)
+
+
+def ingest_weather(provider=None, locations: list[str] | None = None,
+                   concurrency: int = 10) -> tuple[int, dict[str, str]]:
+    """
+    Fetch the current weather of every bin location and store the new observations.
+
+    :param provider: The weather provider, WEATHER_PROVIDER by default.
+    :param locations: The locations, the distinct bin locations by default.
+    :param concurrency: The maximum number of requests in flight.
+
+    :return: The number of inserted observations and the error of each location that could not be fetched.
+    """
+    if provider is None:
+        provider = get_weather_provider()
+    if locations is None:
+        locations = list(Bin.objects.order_by("location")
+                         .values_list("location", flat=True).distinct())
+    observations, errors = asyncio.run(
+        fetch_observations(provider, locations, concurrency))
+    return store_observations(observations), errors
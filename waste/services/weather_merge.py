@@ -0,0 +1,77 @@
+from datetime import datetime
+from functools import partial
+from typing import Iterable, Iterator
+
+from django.db.models import QuerySet
+
+from .concurrent_queries import run_concurrently
+
+WASTE_FIELDS = ("bin_id", "bin__location", "timestamp", "level")
+WEATHER_FIELDS = ("location", "timestamp", "temp", "precip", "humid")
+
+
+def get_weather_index(weather_queryset: QuerySet) -> dict[tuple[str, datetime], dict]:
+    """
+    Load weather readings into a lookup keyed by location and timestamp.
+
+    When several readings share a location and timestamp, the one with the
+    lowest weather ID is kept.
+
+    :param weather_queryset: Weather data queryset already narrowed to the requested scope.
+
+    :return: Weather readings keyed by (location, timestamp).
+    """
+    weather_index = {}
+    for weather in weather_queryset.order_by("weather_id").values(
+            *WEATHER_FIELDS):
+        weather_index.setdefault(
+            (weather["location"], weather["timestamp"]), weather)
+    return weather_index
+
+
+def merge_weather(waste_queryset: QuerySet,
+                  weather_queryset: QuerySet) -> Iterator[tuple[dict, dict | None]]:
+    """
+    Pair every waste reading with the weather reading taken at the same location and time.
+
+    Both querysets are evaluated exactly once, so the number of queries does not
+    depend on the number of records.
+
+    :param waste_queryset: Waste data queryset, in the order the records should be returned.
+    :param weather_queryset: Weather data queryset covering the same locations and period.
+
+    :return: An iterator of (waste, weather) pairs, where weather is None if no reading matches.
+    """
+    weather_index = get_weather_index(weather_queryset)
+    yield from pair_weather(waste_queryset.values(*WASTE_FIELDS), weather_index)
+
+
+def pair_weather(wastes: Iterable[dict],
+                 weather_index: dict[tuple[str, datetime], dict]) -> Iterator[tuple[dict, dict | None]]:
+    """
+    Pair waste readings with the weather readings of a lookup built by get_weather_index.
+
+    :param wastes: The waste readings, with the fields of WASTE_FIELDS.
+    :param weather_index: Weather readings keyed by (location, timestamp).
+
+    :return: An iterator of (waste, weather) pairs, where weather is None if no reading matches.
+    """
+    for waste in wastes:
+        yield waste, weather_index.get(
+            (waste["bin__location"], waste["timestamp"]))
+
+
+async def amerge_weather(waste_queryset: QuerySet,
+                         weather_queryset: QuerySet) -> list[tuple[dict, dict | None]]:
+    """
+    Asynchronous version of merge_weather, which fetches the waste and weather readings concurrently.
+
+    :param waste_queryset: Waste data queryset, in the order the records should be returned.
+    :param weather_queryset: Weather data queryset covering the same locations and period.
+
+    :return: A list of (waste, weather) pairs, where weather is None if no reading matches.
+    """
+    wastes, weather_index = await run_concurrently(
+        lambda: list(waste_queryset.values(*WASTE_FIELDS)),
+        partial(get_weather_index, weather_queryset))
+    return list(pair_weather(wastes, weather_index))
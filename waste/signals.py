@@ -0,0 +1,78 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Bin, Waste, Weather
+from .services import (bump_data_version, install_query_recorder,
+                       invalidate_latest, record_latest_readings)
+
+
+@receiver(post_save, sender=Waste)
+def update_latest_waste(sender, instance: Waste, created: bool, **kwargs):
+    """
+    Move the cached latest readings forward when a waste reading is created.
+
+    An update may move a reading backwards, so the cached latest readings are discarded
+    instead.
+
+    :param sender: The Waste model.
+    :param instance: The saved waste reading.
+    :param created: Whether the waste reading was created.
+    """
+    if not created:
+        invalidate_latest()
+        return
+    record_latest_readings(
+        [(instance.bin_id, instance.bin.location, instance.timestamp)])
+
+
+@receiver(post_delete, sender=Waste)
+def discard_latest_waste(sender, instance: Waste, **kwargs):
+    """
+    Discard the cached latest readings when a waste reading is deleted.
+
+    :param sender: The Waste model.
+    :param instance: The deleted waste reading.
+    """
+    invalidate_latest()
+
+
+@receiver(post_save, sender=Waste)
+@receiver(post_delete, sender=Waste)
+@receiver(post_save, sender=Weather)
+@receiver(post_delete, sender=Weather)
+def discard_cached_reading_responses(sender, instance: Waste | Weather, **kwargs):
+    """
+    Discard the cached API responses that may include a saved or deleted reading.
+
+    An updated reading may have been moved from another period, so every cached response is
+    discarded after an update.
+
+    :param sender: The Waste or Weather model.
+    :param instance: The saved or deleted reading.
+    """
+    bump_data_version([instance.timestamp] if kwargs.get("created", True)
+                      else None)
+
+
+@receiver(post_save, sender=Bin)
+@receiver(post_delete, sender=Bin)
+def discard_cached_responses(sender, instance: Bin, **kwargs):
+    """
+    Discard every cached API response when a bin is saved or deleted.
+
+    :param sender: The Bin model.
+    :param instance: The saved or deleted bin.
+    """
+    bump_data_version()
+
+
+@receiver(connection_created)
+def record_queries(sender, connection, **kwargs):
+    """
+    Let the query metrics capture the queries of every new database connection.
+
+    :param sender: The class of the database connection.
+    :param connection: The database connection.
+    """
+    install_query_recorder(connection)
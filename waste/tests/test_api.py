@@ -1,6 +1,7 @@
 import datetime
 from decimal import Decimal
 
+from django.core.cache import cache
 from django.db import connection
 from django.test import TestCase
 from rest_framework import status
@@ -16,6 +17,7 @@ class APITest(TestCase):
         """
         Set up test data for the API tests.
         """
+        cache.clear()
         self.maxDiff = None
         with connection.cursor() as cursor:
             cursor.execute("""
@@ -842,3 +844,76 @@ class APITest(TestCase):
         response = self.client.get('/api/waste/2024/location/Undefined/')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.data, expected_response)
+
+    def test_specific_period_waste_api_query_count(self):
+        """
+        Test that the endpoint for retrieving waste data for a specific bin or location in a specific year
+        issues the same number of queries regardless of how many records are returned.
+
+        Ensures that the two validator queries for the ETag, the bin lookup, the waste query and the weather query
+        are the only queries issued.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-24 10:00:00', 10.00),
+                    (1, '2024-04-24 09:00:00', 20.00),
+                    (1, '2024-04-24 08:00:00', 30.00)
+            """)
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/waste/2024/bin/1/')
+        self.assertEqual(len(response.data["records"]), 8)
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/waste/2024/location/Thanyaburi/')
+        self.assertEqual(len(response.data["records"]), 8)
+        self.assertEqual(response.data["records"][0]["temp"], 0)
+
+    def test_list_wastes_api_query_count(self):
+        """
+        Test that the endpoints for retrieving aggregated waste data for all bins
+        issue the same number of queries regardless of how many bins there are.
+
+        Both endpoints compute the ETag with one query for the waste and one for the weather readings.
+        The period endpoint checks the rollup watermarks before aggregating the raw readings.
+
+        Ensures that bins without weather data for their location are reported with empty weather fields.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 3', 'Khlong Luang', 14.0650, 100.6467, 'General', 80.00, 'Daily')
+            """)
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (3, '2024-04-23 10:00:00', 15.00)
+            """)
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/waste/2024/')
+        self.assertEqual([bin["bin"] for bin in response.data], [1, 2, 3])
+        self.assertEqual(response.data[2]["total_waste"], Decimal("15.00"))
+        self.assertIsNone(response.data[2]["avg_temp"])
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/waste/latest/')
+        self.assertEqual(len(response.data), 3)
+
+    def test_invalid_period_wastes_api_date(self):
+        """
+        Test the endpoints for retrieving waste data for a date that does not exist.
+
+        Ensures that the response status code is 400 (Bad Request) and the response data matches the expected response.
+        """
+        expected_response = {"Error": "Invalid Date"}
+        response = self.client.get('/api/waste/2024/2/30/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, expected_response)
+        response = self.client.get('/api/waste/2024/13/bin/1/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, expected_response)
+        for path in ('/api/waste/2024/0/', '/api/waste/2024/4/0/',
+                     '/api/waste/2024/0/bin/1/', '/api/waste/2024/4/0/location/Thanyaburi/'):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, path)
+            self.assertEqual(response.data, expected_response)
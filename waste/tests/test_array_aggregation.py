@@ -0,0 +1,174 @@
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from ..services import get_aggregation_backend, refresh_rollups
+from ..services import array_aggregation
+
+
+@skipIf(array_aggregation.np is None, "numpy is not installed")
+class ArrayAggregationTest(TestCase):
+    """
+    Test case for the NumPy aggregation backend.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the rollup tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def assertSummariesEqual(self, first, second):
+        """
+        Assert that two lists of summaries are equal, comparing numbers to six decimal places.
+        """
+        self.assertEqual(len(first), len(second))
+        for first_summary, second_summary in zip(first, second):
+            self.assertEqual(first_summary.keys(), second_summary.keys())
+            for key, value in first_summary.items():
+                if value is None or isinstance(value, (str, int)):
+                    self.assertEqual(value, second_summary[key], key)
+                else:
+                    self.assertAlmostEqual(float(value), float(second_summary[key]),
+                                           places=6, msg=key)
+
+    def test_list_apis_match_sql(self):
+        """
+        Test that the list endpoints return the same summaries with both backends.
+        """
+        for url in ("/api/waste/latest/", "/api/waste/2024/", "/api/waste/2024/4/",
+                    "/api/waste/2024/4/23/"):
+            sql = self.client.get(f"{url}?backend=sql")
+            numpy = self.client.get(f"{url}?backend=numpy")
+            self.assertEqual(numpy.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(numpy.data), 2)
+            self.assertSummariesEqual(numpy.data, sql.data)
+
+    def test_list_api_reads_rollups(self):
+        """
+        Test that the NumPy backend combines the daily rollups like the database, reading the
+        waste and weather rollups with one query each like the SQL backend.
+        """
+        refresh_rollups()
+        with CaptureQueriesContext(connection) as sql_queries:
+            sql = self.client.get("/api/waste/2024/?backend=sql")
+        with self.assertNumQueries(len(sql_queries)):
+            numpy = self.client.get("/api/waste/2024/?backend=numpy")
+        self.assertSummariesEqual(numpy.data, sql.data)
+        self.assertEqual(str(numpy.data[0]["total_waste"]), "251.75")
+
+    def test_comparison_view_matches_sql(self):
+        """
+        Test that the comparison view charts the same data with both backends.
+        """
+        for query in ("year=2024&month=4&day=23", "year=2024&month=4", "year=2024",
+                      "year=2024&filter_type=bin_id&filter_value=1"):
+            contexts = [self.client.get(f"{reverse('waste:comparison')}?{query}&backend={backend}")
+                        .context for backend in ("sql", "numpy")]
+            for key in ("chart_data", "temperature_data", "precipitation_data",
+                        "humidity_data"):
+                self.assertEqual(
+                    [round(float(value), 6) if value is not None else None
+                     for value in contexts[0][key]],
+                    [round(float(value), 6) if value is not None else None
+                     for value in contexts[1][key]], f"{query} {key}")
+            self.assertSummariesEqual(contexts[1]["weather_data"],
+                                      contexts[0]["weather_data"])
+
+    @override_settings(WASTE_AGGREGATION_BACKEND="numpy")
+    def test_backend_setting(self):
+        """
+        Test that the backend is chosen by the setting unless a request asks for another one.
+        """
+        self.assertEqual(get_aggregation_backend(), "numpy")
+        self.assertEqual(get_aggregation_backend("sql"), "sql")
+        with mock.patch.object(array_aggregation, "np", None):
+            self.assertEqual(get_aggregation_backend(), "sql")
+
+    def test_invalid_backend(self):
+        """
+        Test that unknown backends are rejected.
+        """
+        response = self.client.get("/api/waste/2024/?backend=pandas")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"Error": "Invalid Backend"})
+        response = self.client.get("/api/waste/latest/?backend=pandas")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f"{reverse('waste:comparison')}?backend=pandas")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,249 @@
+import json
+import threading
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import include, path
+from rest_framework import status
+
+from ..api_views import (AsyncListLatestWastesAPI, AsyncListPeriodWastesAPI,
+                         AsyncSpecificLatestWasteAPI,
+                         AsyncSpecificPeriodWasteAPI)
+from ..services import run_concurrently
+
+urlpatterns = [
+    path('async/api/waste/latest/', AsyncListLatestWastesAPI.as_view()),
+    path('async/api/waste/latest/bin/<int:bin>/', AsyncSpecificLatestWasteAPI.as_view()),
+    path('async/api/waste/latest/location/<str:location>/', AsyncSpecificLatestWasteAPI.as_view()),
+    path('async/api/waste/<int:year>/<int:month>/<int:day>/', AsyncListPeriodWastesAPI.as_view()),
+    path('async/api/waste/<int:year>/<int:month>/<int:day>/bin/<int:bin>/', AsyncSpecificPeriodWasteAPI.as_view()),
+    path('async/api/waste/<int:year>/<int:month>/<int:day>/location/<str:location>/', AsyncSpecificPeriodWasteAPI.as_view()),
+    path('async/api/waste/<int:year>/<int:month>/', AsyncListPeriodWastesAPI.as_view()),
+    path('async/api/waste/<int:year>/<int:month>/bin/<int:bin>/', AsyncSpecificPeriodWasteAPI.as_view()),
+    path('async/api/waste/<int:year>/', AsyncListPeriodWastesAPI.as_view()),
+    path('', include('waste.urls')),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncAPITest(TestCase):
+    """
+    Test case for the async versions of the waste endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the async API tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+
+    def get_async(self, path: str, **extra):
+        """
+        Request an async endpoint through the ASGI test client.
+
+        :param path: The path of the sync endpoint.
+
+        :return: The response.
+        """
+        return async_to_sync(self.async_client.get)("/async" + path, **extra)
+
+    async def read_stream(self, response) -> bytes:
+        """
+        Read the content of an async streaming response.
+
+        :param response: The streaming response.
+
+        :return: The content.
+        """
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    def assertSameResponse(self, path: str):
+        """
+        Assert that the async endpoint answers a request like the sync endpoint.
+
+        :param path: The path of the sync endpoint.
+        """
+        response = self.client.get(path)
+        async_response = self.get_async(path)
+        self.assertEqual(async_response.status_code, response.status_code)
+        self.assertEqual(async_response["Content-Type"], "application/json")
+        if async_response.streaming:
+            content = async_to_sync(self.read_stream)(async_response)
+        else:
+            content = async_response.content
+        self.assertEqual(json.loads(content), json.loads(response.getvalue()))
+
+    def test_list_endpoints(self):
+        """
+        Test that the async list endpoints return the same data as the sync endpoints.
+        """
+        for path in ("/api/waste/latest/", "/api/waste/latest/?backend=sql",
+                     "/api/waste/2024/4/23/", "/api/waste/2024/4/",
+                     "/api/waste/2024/", "/api/waste/2024/4/22/",
+                     "/api/waste/2024/13/1/", "/api/waste/2024/?backend=invalid"):
+            with self.subTest(path=path):
+                self.assertSameResponse(path)
+
+    def test_specific_endpoints(self):
+        """
+        Test that the async specific endpoints return the same data as the sync endpoints.
+        """
+        for path in ("/api/waste/latest/bin/1/", "/api/waste/latest/bin/3/",
+                     "/api/waste/latest/location/Lam%20Luk%20Ka/",
+                     "/api/waste/latest/location/Bangkok/",
+                     "/api/waste/2024/4/23/bin/1/", "/api/waste/2024/4/bin/2/",
+                     "/api/waste/2024/4/23/location/Thanyaburi/",
+                     "/api/waste/2024/4/23/bin/3/", "/api/waste/2024/4/31/bin/1/",
+                     "/api/waste/2024/4/23/bin/1/?page_size=2",
+                     "/api/waste/2024/4/23/bin/1/?page_size=0",
+                     "/api/waste/2024/4/23/bin/1/?cursor=invalid",
+                     "/api/waste/2024/4/23/bin/1/?stream=1&page_size=2"):
+            with self.subTest(path=path):
+                self.assertSameResponse(path)
+
+    def test_pagination(self):
+        """
+        Test that the pages of the async endpoint can be followed with their cursors.
+        """
+        levels = []
+        path = "/api/waste/2024/4/23/bin/1/?page_size=2"
+        while path:
+            data = self.get_async(path).json()
+            levels += [record["level"] for record in data["records"]]
+            path = data["next"] and f"/api/waste/2024/4/23/bin/1/?page_size=2&cursor={data['next']}"
+        self.assertEqual(levels, [70.5, 60.0, 50.25, 40.75, 30.25])
+
+    def test_conditional_response(self):
+        """
+        Test that the async endpoints are cached and answer conditional requests with 304.
+        """
+        response = self.get_async("/api/waste/2024/4/23/bin/1/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        with self.assertNumQueries(0):
+            cached = self.get_async("/api/waste/2024/4/23/bin/1/")
+        self.assertEqual(cached.json(), response.json())
+        response = self.get_async("/api/waste/2024/4/23/bin/1/",
+                                  headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_query_metrics(self):
+        """
+        Test that the query metrics middleware counts the queries of the async endpoints.
+        """
+        response = self.get_async("/api/waste/2024/4/23/bin/1/")
+        self.assertRegex(response["Server-Timing"],
+                         r'^db;dur=\d+\.\d\d;desc="5 queries", app;dur=\d+\.\d\d$')
+
+    def test_method_not_allowed(self):
+        """
+        Test that the async endpoints only answer GET and HEAD requests.
+        """
+        response = async_to_sync(self.async_client.post)("/async/api/waste/latest/")
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        response = async_to_sync(self.async_client.head)("/async/api/waste/latest/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_run_concurrently_in_transaction(self):
+        """
+        Test that functions run on the connection of an open transaction.
+        """
+        def get_connection():
+            return id(connection.connection)
+
+        self.assertEqual(async_to_sync(run_concurrently)(get_connection, get_connection),
+                         [id(connection.connection)] * 2)
+
+
+class RunConcurrentlyTest(SimpleTestCase):
+    """
+    Test case for running blocking database functions concurrently.
+    """
+
+    def test_run_concurrently(self):
+        """
+        Test that functions run concurrently in worker threads outside of a transaction.
+        """
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait(result):
+            barrier.wait()
+            return result, threading.get_ident()
+
+        results = async_to_sync(run_concurrently)(lambda: wait(1), lambda: wait(2))
+        self.assertEqual([result for result, _ in results], [1, 2])
+        self.assertNotIn(threading.get_ident(), [thread for _, thread in results])
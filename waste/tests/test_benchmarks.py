@@ -0,0 +1,168 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from ..management.commands.run_benchmarks import percentile
+from ..models import Bin, Waste, Weather
+from ..urls import urlpatterns
+
+
+class BenchmarkTest(TestCase):
+    """
+    Test case for the benchmark data generator and runner.
+    """
+
+    def setUp(self):
+        """
+        Set up the tables for the benchmark tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily')
+            """)
+        self.output = os.path.join(tempfile.mkdtemp(), "report.json")
+        self.addCleanup(lambda: os.path.exists(self.output) and os.remove(self.output))
+
+    def generate(self, *args) -> str:
+        """
+        Run the benchmark data generator.
+
+        :return: The output of the command.
+        """
+        stdout = StringIO()
+        call_command("generate_benchmark_data", "--end", "2024-04-24", *args,
+                     stdout=stdout)
+        return stdout.getvalue()
+
+    def test_generate(self):
+        """
+        Test that every generated bin gets a waste and a weather reading per cadence interval.
+        """
+        output = self.generate("--bins", "3", "--days", "2", "--cadence", "30")
+        self.assertIn("Generated 3 bins with 288 waste and 288 weather readings", output)
+        bins = Bin.objects.filter(name__startswith="Benchmark Bin ")
+        self.assertEqual([bin.bin_id for bin in bins.order_by("bin_id")], [2, 3, 4])
+        self.assertEqual(Waste.objects.filter(bin_id=2).count(), 96)
+        self.assertEqual(Weather.objects.filter(location="Benchmark Location 3").count(), 96)
+        first = Waste.objects.order_by("timestamp").first()
+        self.assertEqual(first.timestamp,
+                         datetime.datetime(2024, 4, 22, tzinfo=datetime.timezone.utc))
+        self.assertEqual(Waste.objects.order_by("timestamp").last().timestamp,
+                         datetime.datetime(2024, 4, 23, 23, 30,
+                                           tzinfo=datetime.timezone.utc))
+
+    def test_generate_clear(self):
+        """
+        Test that regenerating with --clear replaces the generated data and keeps the rest.
+        """
+        self.generate("--bins", "2", "--days", "1")
+        self.generate("--bins", "1", "--days", "1", "--clear")
+        self.assertEqual(Bin.objects.count(), 2)
+        self.assertTrue(Bin.objects.filter(name="Bin 1").exists())
+        self.assertEqual(Waste.objects.count(), 24)
+        self.assertEqual(Weather.objects.count(), 24)
+
+    def test_generate_is_reproducible(self):
+        """
+        Test that the same seed generates the same readings.
+        """
+        self.generate("--bins", "1", "--days", "1", "--seed", "7")
+        levels = list(Waste.objects.order_by("timestamp").values_list("level", flat=True))
+        self.generate("--bins", "1", "--days", "1", "--seed", "7", "--clear")
+        self.assertEqual(
+            list(Waste.objects.order_by("timestamp").values_list("level", flat=True)),
+            levels)
+
+    @override_settings(ALLOWED_HOSTS=["*.ku.th", ".ku.ac.th", ""])
+    def test_run_benchmarks(self):
+        """
+        Test that every route is benchmarked and reported, even when every allowed host is a wildcard.
+        """
+        self.generate("--bins", "2", "--days", "2")
+        stdout = StringIO()
+        call_command("run_benchmarks", "--repeat", "3", "--output", self.output,
+                     stdout=stdout)
+        with open(self.output, encoding="utf-8") as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report["rows"], {"bins": 3, "waste": 96, "weather": 96})
+        routes = report["routes"]
+        self.assertEqual(len(routes), len(urlpatterns))
+        self.assertEqual(routes["api/waste/<int:year>/<int:month>/<int:day>/bin/<int:bin>/"]
+                         ["path"], "/api/waste/2024/4/23/bin/2/")
+        self.assertEqual(routes["api/waste/latest/location/<str:location>/"]["path"],
+                         "/api/waste/latest/location/Benchmark%20Location%202/")
+        self.assertEqual(routes["<path:undefined_path>/"]["status"], 404)
+        self.assertEqual(routes["api/waste/ingest/"]["status"], 201)
+        for route, result in routes.items():
+            if route not in ("<path:undefined_path>/", "api/waste/ingest/"):
+                self.assertEqual(result["status"], 200, route)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertGreaterEqual(result["queries"], 0)
+            self.assertGreater(result["peak_memory_kb"], 0)
+        self.assertEqual(routes["api/waste/latest/"]["queries"], 0)
+        self.assertEqual(Waste.objects.count(), 96)
+
+        call_command("run_benchmarks", "--repeat", "1", "--cold", "--output",
+                     self.output, "--compare", self.output, stdout=stdout)
+        self.assertIn("api/waste/latest/: p50", stdout.getvalue())
+
+    def test_run_benchmarks_without_data(self):
+        """
+        Test that the runner asks for benchmark data when there is no waste reading.
+        """
+        with self.assertRaisesRegex(CommandError, "generate_benchmark_data"):
+            call_command("run_benchmarks", "--output", self.output)
+
+    def test_percentile(self):
+        """
+        Test that percentiles are computed with the nearest-rank method.
+        """
+        values = [float(value) for value in range(1, 21)]
+        self.assertEqual(percentile(values, 50), 10)
+        self.assertEqual(percentile(values, 95), 19)
+        self.assertEqual(percentile([3.0], 95), 3)
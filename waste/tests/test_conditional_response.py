@@ -0,0 +1,166 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import Bin, Waste
+
+
+class ConditionalResponseTest(TestCase):
+    """
+    Test case for the conditional GET support of the API endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the conditional GET tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def test_latest_wastes_api_not_modified(self):
+        """
+        Test that a request with a matching ETag is answered with 304 (Not Modified)
+        without running the aggregation queries.
+        """
+        response = self.client.get('/api/waste/latest/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers["ETag"]
+        self.assertEqual(response.headers["Last-Modified"],
+                         "Tue, 23 Apr 2024 10:00:00 GMT")
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/waste/latest/',
+                                       HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        cache.clear()
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/waste/latest/',
+                                       HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_latest_wastes_api_modified(self):
+        """
+        Test that a request with a stale ETag or modification time gets the full response.
+        """
+        response = self.client.get('/api/waste/latest/bin/1/')
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+        response = self.client.get('/api/waste/latest/bin/1/',
+                                   HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Waste.objects.create(bin=Bin.objects.get(pk=1),
+                             timestamp=timezone.make_aware(
+                                 datetime.datetime(2024, 4, 23, 11)),
+                             level=80)
+        response = self.client.get('/api/waste/latest/bin/1/',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(len(response.data["records"]), 6)
+        response = self.client.get('/api/waste/latest/bin/1/',
+                                   HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_period_waste_api_not_modified(self):
+        """
+        Test that the period endpoints answer a request with a matching ETag with 304 (Not Modified).
+        """
+        for url in ('/api/waste/2024/4/', '/api/waste/2024/4/location/Lam Luk Ka/'):
+            etag = self.client.get(url).headers["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bins_api_not_modified(self):
+        """
+        Test that the bin endpoints answer a request with a matching ETag with 304 (Not Modified)
+        until a bin changes.
+        """
+        etag = self.client.get('/api/bins/').headers["ETag"]
+        response = self.client.get('/api/bins/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Bin.objects.filter(pk=2).update(capacity=150)
+        cache.clear()
+        response = self.client.get('/api/bins/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[1]["capacity"], "150.00")
+
+    def test_invalid_date_is_not_conditional(self):
+        """
+        Test that an invalid date is reported even for a conditional request.
+        """
+        response = self.client.get('/api/waste/2024/2/30/', HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("ETag", response.headers)
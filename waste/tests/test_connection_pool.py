@@ -0,0 +1,186 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from ..db import ConnectionPool, close_connection_pools
+from ..db.backends.sqlite3.base import DatabaseWrapper
+
+
+class FakeConnection:
+    """
+    DB-API connection stand-in that fails its health check once broken.
+    """
+
+    def __init__(self):
+        self.broken = False
+        self.closed = False
+
+    def cursor(self):
+        if self.broken:
+            raise OSError("Lost connection")
+        return self
+
+    def execute(self, sql):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    """
+    Test case for the database connection pool and the pooled database backends.
+    """
+
+    def setUp(self):
+        """
+        Set up a pool of fake connections with a fake clock.
+        """
+        self.now = 0
+        self.opened = []
+        self.pool = ConnectionPool(self.connect, max_size=2, idle_timeout=300,
+                                   health_check_interval=30, timeout=0,
+                                   clock=lambda: self.now)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(close_connection_pools)
+
+    def connect(self) -> FakeConnection:
+        """
+        Open a fake connection.
+
+        :return: The connection.
+        """
+        self.opened.append(FakeConnection())
+        return self.opened[-1]
+
+    def create_wrapper(self) -> DatabaseWrapper:
+        """
+        Create a pooled SQLite database wrapper on a temporary file.
+
+        :return: The database wrapper.
+        """
+        return DatabaseWrapper(connection.settings_dict | {
+            "NAME": os.path.join(self.directory.name, "pool.sqlite3"),
+            "CONN_MAX_AGE": 0,
+            "POOL": {"MAX_SIZE": 2, "IDLE_TIMEOUT": 300,
+                     "HEALTH_CHECK_INTERVAL": 30, "TIMEOUT": 1},
+        }, alias="pooled")
+
+    def test_reuse(self):
+        """
+        Test that returned connections are reused, most recently returned first.
+        """
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        self.pool.release(first)
+        self.now = 1
+        self.pool.release(second)
+        self.assertIs(self.pool.acquire(), second)
+        self.assertIs(self.pool.acquire(), first)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["connects"], stats["reuses"]), (2, 2))
+        self.assertEqual((stats["size"], stats["idle"], stats["in_use"]), (2, 0, 2))
+
+    def test_exhausted(self):
+        """
+        Test that acquiring from a full pool fails once the timeout has passed.
+        """
+        self.pool.acquire()
+        self.pool.acquire()
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire()
+        self.assertEqual(self.pool.get_stats()["timeouts"], 1)
+
+    def test_idle_timeout(self):
+        """
+        Test that connections idle for longer than the idle timeout are closed.
+        """
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.now = 300
+        self.assertIsNot(self.pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["expired"], stats["connects"], stats["size"]), (1, 2, 1))
+
+    def test_health_check(self):
+        """
+        Test that connections idle for longer than the health check interval are checked before reuse.
+        """
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        connection.broken = True
+        self.now = 29
+        self.assertIs(self.pool.acquire(), connection)
+        self.pool.release(connection)
+        self.now = 60
+        self.assertIsNot(self.pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["failed_checks"], stats["discarded"], stats["size"]),
+                         (1, 1, 1))
+
+    def test_failed_connect(self):
+        """
+        Test that a failed connect does not use up a slot of the pool.
+        """
+        self.pool.connect = lambda: 1 / 0
+        for _ in range(3):
+            with self.assertRaises(ZeroDivisionError):
+                self.pool.acquire()
+        self.assertEqual(self.pool.get_stats()["size"], 0)
+
+    def test_pooled_backend(self):
+        """
+        Test that closing a connection of the pooled backend returns it to the pool.
+        """
+        wrapper = self.create_wrapper()
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE pooled (value INTEGER)")
+        raw_connection = wrapper.connection
+        wrapper.close()
+        other = self.create_wrapper()
+        with other.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pooled")
+        self.assertIs(other.connection, raw_connection)
+        stats = wrapper.get_pool().get_stats()
+        self.assertEqual((stats["connects"], stats["reuses"], stats["in_use"]), (1, 1, 1))
+        other.close()
+        self.assertEqual(wrapper.get_pool().get_stats()["idle"], 1)
+
+    def test_pooled_backend_transaction(self):
+        """
+        Test that returned connections are rolled back, and discarded if closed inside an atomic block.
+        """
+        wrapper = self.create_wrapper()
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE pooled (value INTEGER)")
+        wrapper.set_autocommit(False)
+        with wrapper.cursor() as cursor:
+            cursor.execute("INSERT INTO pooled VALUES (1)")
+        wrapper.close()
+        other = self.create_wrapper()
+        with other.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pooled")
+            self.assertEqual(cursor.fetchone(), (0,))
+        other.in_atomic_block = True
+        other.close()
+        stats = wrapper.get_pool().get_stats()
+        self.assertEqual((stats["reuses"], stats["discarded"], stats["size"]), (1, 1, 0))
+
+    def test_pool_stats_api(self):
+        """
+        Test that the connection pool statistics are available from the API.
+        """
+        wrapper = self.create_wrapper()
+        wrapper.ensure_connection()
+        wrapper.close()
+        response = self.client.get("/api/db/pools/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["pooled"]["connects"], 1)
+        self.assertEqual(response.data["pooled"]["idle"], 1)
+        self.assertEqual(response.data["pooled"]["max_size"], 2)
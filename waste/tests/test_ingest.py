@@ -0,0 +1,241 @@
+import datetime
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from ..models import Waste
+from ..services import get_latest_timestamp, ingest_readings
+
+
+@override_settings(WASTE_INGEST_TOKEN="", WASTE_INGEST_ALLOW_ANONYMOUS=True)
+class IngestWastesAPITest(TestCase):
+    """
+    Test case for the waste ingest API.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the ingest API tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def test_ingest_json_readings(self):
+        """
+        Test that a JSON array of readings is inserted and the latest reading is updated.
+        """
+        self.assertEqual(get_latest_timestamp(bin_id=2),
+                         datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc))
+        readings = [{"bin_id": 2, "timestamp": f"2024-04-23T{hour}:00:00Z",
+                     "level": hour} for hour in range(11, 15)]
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {"received": 4, "inserted": 4,
+                                         "duplicates": 0, "expired": 0})
+        self.assertEqual(Waste.objects.filter(bin_id=2).count(), 9)
+        self.assertEqual(Waste.objects.get(bin_id=2, timestamp__hour=14).level,
+                         Decimal("14.00"))
+        self.assertEqual(get_latest_timestamp(bin_id=2),
+                         datetime.datetime(2024, 4, 23, 14, tzinfo=datetime.timezone.utc))
+
+    def test_ingest_ndjson_readings(self):
+        """
+        Test that newline-delimited JSON readings are inserted.
+        """
+        body = "\n".join(json.dumps({"bin_id": 1, "timestamp": f"2024-04-24T0{hour}:00:00+07:00",
+                                     "level": "12.5"}) for hour in range(3))
+        response = self.client.post('/api/waste/ingest/', body + "\n",
+                                    content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["inserted"], 3)
+        self.assertEqual(Waste.objects.filter(timestamp__gte=datetime.datetime(
+            2024, 4, 23, 17, tzinfo=datetime.timezone.utc)).count(), 3)
+
+    def test_ingest_duplicate_readings(self):
+        """
+        Test that readings already stored or repeated within the batch are skipped.
+        """
+        readings = [{"bin_id": 1, "timestamp": "2024-04-23T10:00:00Z", "level": 99},
+                    {"bin_id": 1, "timestamp": "2024-04-23T11:00:00Z", "level": 80},
+                    {"bin_id": 1, "timestamp": "2024-04-23T18:00:00+07:00", "level": 81}]
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json")
+        self.assertEqual(response.data, {"received": 3, "inserted": 1,
+                                         "duplicates": 2, "expired": 0})
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json")
+        self.assertEqual(response.data["inserted"], 0)
+        self.assertEqual(Waste.objects.filter(bin_id=1).count(), 6)
+        self.assertEqual(Waste.objects.get(bin_id=1, timestamp__hour=10).level,
+                         Decimal("70.50"))
+
+    def test_ingest_concurrent_duplicates(self):
+        """
+        Test that a reading stored by a concurrent request after the duplicate lookup is skipped
+        by the unique key instead of being stored twice.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE UNIQUE INDEX waste_bin_timestamp_uniq ON waste (bin_id, timestamp)")
+        timestamp = datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc)
+        nothing = Waste.objects.none()
+        with mock.patch.object(Waste.objects, "filter", return_value=nothing):
+            ingest_readings([(1, timestamp, Decimal("99.00"))])
+        self.assertEqual(Waste.objects.filter(bin_id=1, timestamp=timestamp).count(), 1)
+        self.assertEqual(Waste.objects.get(bin_id=1, timestamp=timestamp).level,
+                         Decimal("70.50"))
+
+    def test_ingest_in_batches(self):
+        """
+        Test that a batch larger than the INSERT batch size is inserted in several statements.
+        """
+        readings = [{"bin_id": 1 + minute % 2, "timestamp": f"2024-04-25T00:{minute:02}:00Z",
+                     "level": minute} for minute in range(60)]
+        with override_settings(WASTE_INGEST_BATCH_SIZE=25):
+            response = self.client.post('/api/waste/ingest/', readings,
+                                        content_type="application/json")
+        self.assertEqual(response.data["inserted"], 60)
+        self.assertEqual(Waste.objects.filter(timestamp__day=25).count(), 60)
+
+    def test_ingest_invalid_readings(self):
+        """
+        Test that a batch with invalid readings is rejected as a whole.
+        """
+        readings = [{"bin_id": 1, "timestamp": "2024-04-25T00:00:00Z", "level": 1},
+                    {"bin_id": 3, "timestamp": "2024-04-25T00:00:00Z", "level": 1},
+                    {"bin_id": 1, "timestamp": "yesterday", "level": 1},
+                    {"bin_id": 1, "timestamp": "2024-04-25T01:00:00Z", "level": "full"},
+                    {"bin_id": 1, "timestamp": "2024-04-25T02:00:00Z", "level": -1},
+                    {"bin_id": 1, "level": 1},
+                    "reading"]
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["index"] for error in response.data["readings"]],
+                         [1, 2, 3, 4, 5, 6])
+        self.assertEqual(response.data["readings"][4],
+                         {"index": 5, "error": "missing timestamp"})
+        self.assertFalse(Waste.objects.filter(timestamp__day=25).exists())
+        response = self.client.post('/api/waste/ingest/', {"bin_id": 1},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/api/waste/ingest/', "{}\n{",
+                                    content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(WASTE_INGEST_TOKEN="secret")
+    def test_ingest_token(self):
+        """
+        Test that the configured ingest token is required.
+        """
+        readings = [{"bin_id": 1, "timestamp": "2024-04-25T00:00:00Z", "level": 1}]
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json",
+                                    HTTP_AUTHORIZATION="Token wrong")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json",
+                                    HTTP_AUTHORIZATION="Token secret")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(WASTE_INGEST_ALLOW_ANONYMOUS=False)
+    def test_ingest_without_token(self):
+        """
+        Test that every request is rejected when no token is configured and anonymous
+        ingestion is not allowed.
+        """
+        readings = [{"bin_id": 1, "timestamp": "2024-04-25T00:00:00Z", "level": 1}]
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Waste.objects.filter(timestamp__day=25).exists())
+
+    @override_settings(WASTE_INGEST_MAX_READINGS=2)
+    def test_ingest_too_many_readings(self):
+        """
+        Test that a batch larger than the maximum number of readings is rejected.
+        """
+        readings = [{"bin_id": 1, "timestamp": f"2024-04-25T0{hour}:00:00Z", "level": 1}
+                    for hour in range(3)]
+        response = self.client.post('/api/waste/ingest/', readings,
+                                    content_type="application/json")
+        self.assertEqual(response.status_code,
+                         status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
@@ -0,0 +1,283 @@
+import datetime
+import os
+import tempfile
+import threading
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ..management.commands.ingest_mqtt import Command
+from ..models import Waste, Weather
+from ..services import WasteMessageBuffer, merge_weather
+from ..services.ingest import truncate_to_hour
+
+
+class FakeMQTTClient:
+    """
+    In-process stand-in for a paho-mqtt client that delivers a fixed list of messages.
+    """
+
+    def __init__(self, payloads: list[bytes]):
+        """
+        Create a client that delivers the given payloads once its network loop is started.
+
+        :param payloads: The payloads of the messages to deliver.
+        """
+        self.payloads = payloads
+        self.subscriptions = []
+        self.thread = None
+
+    def connect(self, host: str, port: int):
+        """
+        Record the broker the client connects to.
+        """
+        self.broker = (host, port)
+
+    def subscribe(self, topic: str, qos: int = 0):
+        """
+        Record a subscription.
+        """
+        self.subscriptions.append((topic, qos))
+
+    def loop_start(self):
+        """
+        Deliver the messages from a network thread, like paho-mqtt does.
+        """
+        def deliver():
+            self.on_connect(self, None, {}, 0, None)
+            for payload in self.payloads:
+                self.on_message(self, None, SimpleNamespace(
+                    topic=self.subscriptions[0][0], payload=payload))
+        self.thread = threading.Thread(target=deliver)
+        self.thread.start()
+
+    def loop_stop(self):
+        """
+        Wait for the network thread to finish.
+        """
+        self.thread.join()
+
+    def disconnect(self):
+        """
+        Disconnect from the broker.
+        """
+
+
+class IngestMQTTTest(TestCase):
+    """
+    Test case for the MQTT ingestion worker.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the MQTT ingestion tests.
+        """
+        cache.clear()
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50)
+            """)
+
+    def test_subscribe(self):
+        """
+        Test that messages received from the broker are buffered and inserted, stamped with the
+        time they were received unless they carry a timestamp.
+        """
+        payloads = [b'{"bin_id": 1, "level": 5}', b'{"bin_id": 2, "level": 0}',
+                    b'{"bin_id": 2, "timestamp": "2024-04-23T11:00:00Z", "level": 7.5}',
+                    b'not json', b'{"bin_id": 9, "level": 1}']
+        client = FakeMQTTClient(payloads)
+        out = StringIO()
+        before = timezone.now()
+        with mock.patch.object(Command, "create_client", return_value=client):
+            call_command("ingest_mqtt", "--broker", "localhost", "--batch-size", "2",
+                         "--max-messages", "5", stdout=out)
+        self.assertEqual(client.broker, ("localhost", 1883))
+        self.assertEqual(client.subscriptions, [("b6510545641/waste", 1)])
+        self.assertIn("received=5 inserted=3 duplicates=0 expired=0 invalid=2", out.getvalue())
+        self.assertEqual(Waste.objects.get(bin_id=1, timestamp__gte=truncate_to_hour(before)).level,
+                         Decimal("5.00"))
+        self.assertTrue(Waste.objects.filter(
+            bin_id=2, timestamp=datetime.datetime(2024, 4, 23, 11, tzinfo=datetime.timezone.utc)
+        ).exists())
+
+    def test_subscribe_with_full_queue(self):
+        """
+        Test that messages are not lost when the queue between the network thread and the
+        database is full.
+        """
+        payloads = [f'{{"bin_id": {1 + index % 2}, "timestamp": "2024-04-24T{index // 2:02}:00:00Z",'
+                    f' "level": 1}}'.encode() for index in range(30)]
+        out = StringIO()
+        with mock.patch.object(Command, "create_client",
+                               return_value=FakeMQTTClient(payloads)):
+            call_command("ingest_mqtt", "--broker", "localhost", "--max-queue", "2",
+                         "--batch-size", "10", "--max-messages", "30", stdout=out)
+        self.assertEqual(Waste.objects.filter(timestamp__day=24).count(), 30)
+        self.assertIn("inserted=30", out.getvalue())
+
+    def test_subscribe_without_broker(self):
+        """
+        Test that subscribing without a broker is rejected.
+        """
+        with self.assertRaises(CommandError):
+            call_command("ingest_mqtt", "--broker", "", stdout=StringIO())
+
+    def test_replay(self):
+        """
+        Test that the messages of a replay file are inserted and replaying it again inserts nothing.
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as replay_file:
+            for hour in range(4):
+                replay_file.write(f'{{"bin_id": 2, "timestamp": "2024-04-24T0{hour}:00:00Z",'
+                                  f' "level": {hour}}}\n')
+            replay_file.write("\n")
+        self.addCleanup(os.remove, replay_file.name)
+        out = StringIO()
+        call_command("ingest_mqtt", "--replay", replay_file.name, "--batch-size", "3",
+                     stdout=out)
+        self.assertIn("received=4 inserted=4 duplicates=0 expired=0 invalid=0 flushes=2", out.getvalue())
+        out = StringIO()
+        call_command("ingest_mqtt", "--replay", replay_file.name, stdout=out)
+        self.assertIn("inserted=0 duplicates=4", out.getvalue())
+
+    def test_batched_payload(self):
+        """
+        Test that a batch of readings published by a collector is inserted reading by reading.
+        """
+        buffer = WasteMessageBuffer()
+        received_at = timezone.make_aware(datetime.datetime(2024, 4, 24, 12))
+        buffer.add(b'{"bin_id": 2, "readings": [{"timestamp": "2024-04-24T10:00:00Z", "level": 3},'
+                   b' {"timestamp": "2024-04-24T11:00:00Z", "level": 0}, {"level": 4.5}]}',
+                   received_at)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(list(Waste.objects.filter(bin_id=2, timestamp__day=24)
+                              .order_by("timestamp").values_list("timestamp", "level")),
+                         [(datetime.datetime(2024, 4, 24, 10, tzinfo=datetime.timezone.utc),
+                           Decimal("3.00")),
+                          (datetime.datetime(2024, 4, 24, 11, tzinfo=datetime.timezone.utc),
+                           Decimal("0.00")),
+                          (received_at, Decimal("4.50"))])
+
+    def test_buffered_reading_matches_weather(self):
+        """
+        Test that a reading taken during an hour is stored on the hour and paired with its weather.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES ('2024-04-24 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 31.5, 1.2, 70.0)
+            """)
+        buffer = WasteMessageBuffer()
+        buffer.add(b'{"bin_id": 1, "level": 6}', datetime.datetime(
+            2024, 4, 24, 10, 17, 42, tzinfo=datetime.timezone.utc))
+        buffer.add(b'{"bin_id": 1, "timestamp": "2024-04-24T17:59:59+07:00", "level": 7}',
+                   timezone.now())
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(buffer.stats["duplicates"], 1)
+        [(waste, weather)] = merge_weather(Waste.objects.filter(timestamp__day=24),
+                                           Weather.objects.all())
+        self.assertEqual(waste["timestamp"],
+                         datetime.datetime(2024, 4, 24, 10, tzinfo=datetime.timezone.utc))
+        self.assertEqual((weather["temp"], weather["precip"], weather["humid"]),
+                         (Decimal("31.50"), Decimal("1.20"), Decimal("70.00")))
+
+    def test_buffer_flush_interval(self):
+        """
+        Test that a buffer is due to be flushed once its oldest message has waited the flush interval.
+        """
+        now = [100.0]
+        buffer = WasteMessageBuffer(batch_size=10, flush_interval=5, clock=lambda: now[0])
+        self.assertIsNone(buffer.time_until_flush())
+        self.assertFalse(buffer.should_flush())
+        buffer.add('{"bin_id": 1, "level": 1}', timezone.now())
+        now[0] += 3
+        buffer.add('{"bin_id": 2, "level": 1}', timezone.now())
+        self.assertEqual(buffer.time_until_flush(), 2)
+        self.assertFalse(buffer.should_flush())
+        now[0] += 2
+        self.assertTrue(buffer.should_flush())
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(len(buffer), 0)
+
+    def test_buffer_keeps_readings_after_failed_flush(self):
+        """
+        Test that the readings of a flush whose insert fails stay buffered for the next flush.
+        """
+        buffer = WasteMessageBuffer(batch_size=10)
+        buffer.add('{"bin_id": 1, "level": 1}', timezone.now())
+        buffer.add('{"bin_id": 2, "level": 2}', timezone.now())
+        with mock.patch("waste.services.message_buffer.ingest_readings",
+                        side_effect=DatabaseError("connection lost")):
+            with self.assertRaises(DatabaseError):
+                buffer.flush()
+        self.assertEqual(len(buffer), 2)
+        self.assertIsNotNone(buffer.time_until_flush())
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.stats["inserted"], 2)
+
+    def test_create_client_with_persistent_session(self):
+        """
+        Test that the client connects with the configured client ID and a persistent session.
+        """
+        mqtt = SimpleNamespace(Client=mock.Mock())
+        modules = {"paho": SimpleNamespace(mqtt=SimpleNamespace(client=mqtt)),
+                   "paho.mqtt": SimpleNamespace(client=mqtt), "paho.mqtt.client": mqtt}
+        with mock.patch.dict("sys.modules", modules):
+            Command().create_client("waste-ingest")
+        mqtt.Client.assert_called_once_with(client_id="waste-ingest", clean_session=False)
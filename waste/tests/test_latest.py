@@ -0,0 +1,116 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Bin, Waste
+from ..services import get_latest_timestamp, invalidate_latest
+
+
+class LatestTimestampTest(TestCase):
+    """
+    Test case for the cached timestamp of the latest waste reading.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the latest timestamp tests.
+        """
+        cache.clear()
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50)
+            """)
+
+    def test_latest_timestamp_is_cached(self):
+        """
+        Test that the latest timestamp is looked up once per scope and then served from the cache.
+        """
+        expected = {
+            (None, None): datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc),
+            (2, None): datetime.datetime(2024, 4, 23, 9, tzinfo=datetime.timezone.utc),
+            (None, "Thanyaburi"): datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc),
+        }
+        for (bin_id, location), timestamp in expected.items():
+            with self.assertNumQueries(1):
+                self.assertEqual(get_latest_timestamp(bin_id, location), timestamp)
+            with self.assertNumQueries(0):
+                self.assertEqual(get_latest_timestamp(bin_id, location), timestamp)
+
+    def test_latest_timestamp_without_waste_data(self):
+        """
+        Test that a scope without waste data is cached as None.
+        """
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_latest_timestamp(bin_id=3))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_latest_timestamp(bin_id=3))
+
+    def test_new_reading_moves_latest_timestamp_forward(self):
+        """
+        Test that saving a new waste reading updates the cached latest timestamps.
+        """
+        get_latest_timestamp()
+        get_latest_timestamp(bin_id=2)
+        get_latest_timestamp(location="Thanyaburi")
+        timestamp = timezone.make_aware(datetime.datetime(2024, 4, 23, 11))
+        Waste.objects.create(bin=Bin.objects.get(pk=2), timestamp=timestamp, level=45)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_latest_timestamp(), timestamp)
+            self.assertEqual(get_latest_timestamp(bin_id=2), timestamp)
+            self.assertEqual(get_latest_timestamp(location="Thanyaburi"),
+                             datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc))
+
+    def test_deleted_reading_invalidates_latest_timestamp(self):
+        """
+        Test that deleting the latest waste reading discards the cached latest timestamps.
+        """
+        self.assertEqual(get_latest_timestamp(bin_id=1),
+                         datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc))
+        Waste.objects.filter(bin_id=1, timestamp__hour=10).delete()
+        self.assertEqual(get_latest_timestamp(bin_id=1),
+                         datetime.datetime(2024, 4, 23, 8, tzinfo=datetime.timezone.utc))
+
+    def test_invalidate_latest(self):
+        """
+        Test that invalidating the latest timestamps forces a new lookup.
+        """
+        get_latest_timestamp()
+        invalidate_latest()
+        with self.assertNumQueries(1):
+            get_latest_timestamp()
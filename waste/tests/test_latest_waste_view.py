@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.db import connection
 from django.test import TestCase
 from django.urls import reverse
@@ -14,6 +15,7 @@ class LatestWasteViewTest(TestCase):
         """
         Set up test data for the Latest Waste view tests.
         """
+        cache.clear()
         self.maxDiff = None
         with connection.cursor() as cursor:
             cursor.execute("""
@@ -0,0 +1,87 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from ..models import Waste, Weather
+from ..services.partitions import (add_months, get_partition_bound, get_partition_month,
+                                   plan_expired_partitions, plan_future_partitions,
+                                   plan_partitioning)
+
+
+@override_settings(TIME_ZONE="Asia/Bangkok")
+class PartitionTest(SimpleTestCase):
+    """
+    Test case for planning the monthly partitions of the waste and weather_api tables.
+    """
+
+    def test_partition_bound(self):
+        """
+        Test that partitions end at midnight of the next month in the current time zone.
+        """
+        self.assertEqual(get_partition_bound(date(2024, 4, 14)), 1714496400)
+        self.assertEqual(add_months(date(2024, 11, 30), 3), date(2025, 2, 1))
+        self.assertEqual(add_months(date(2024, 1, 15), -1), date(2023, 12, 1))
+        self.assertEqual(get_partition_month("p202404"), date(2024, 4, 1))
+        self.assertIsNone(get_partition_month("pfuture"))
+
+    def test_plan_partitioning(self):
+        """
+        Test that the unique keys are extended with the timestamp before the table is partitioned.
+        """
+        constraints = {
+            "PRIMARY": {"columns": ["waste_id"], "primary_key": True, "unique": True},
+            "waste_id": {"columns": ["waste_id"], "primary_key": False, "unique": True},
+            "waste_timestamp_idx": {"columns": ["timestamp", "bin_id", "level"],
+                                    "primary_key": False, "unique": False},
+        }
+        self.assertEqual(plan_partitioning(Waste, constraints, date(2024, 4, 14),
+                                           date(2024, 5, 1)), [
+            "ALTER TABLE `waste` DROP PRIMARY KEY, DROP INDEX `waste_id`, "
+            "ADD PRIMARY KEY (`waste_id`, `timestamp`)",
+            "ALTER TABLE `waste` PARTITION BY RANGE (UNIX_TIMESTAMP(`timestamp`)) ("
+            "PARTITION `p202404` VALUES LESS THAN (1714496400), "
+            "PARTITION `p202405` VALUES LESS THAN (1717174800), "
+            "PARTITION `pfuture` VALUES LESS THAN MAXVALUE)",
+        ])
+
+    def test_plan_future_partitions(self):
+        """
+        Test that missing future partitions are split off the future partition.
+        """
+        partitions = ["p202404", "p202405", "pfuture"]
+        self.assertEqual(plan_future_partitions(Weather, partitions, date(2024, 6, 1)), [
+            "ALTER TABLE `weather_api` REORGANIZE PARTITION `pfuture` INTO ("
+            "PARTITION `p202406` VALUES LESS THAN (1719766800), "
+            "PARTITION `pfuture` VALUES LESS THAN MAXVALUE)",
+        ])
+        self.assertEqual(plan_future_partitions(Weather, partitions, date(2024, 5, 1)), [])
+        self.assertEqual(plan_future_partitions(Weather, partitions[:2], date(2024, 6, 1)), [
+            "ALTER TABLE `weather_api` ADD PARTITION ("
+            "PARTITION `p202406` VALUES LESS THAN (1719766800))",
+        ])
+
+    def test_plan_expired_partitions(self):
+        """
+        Test that expired partitions are archived to a table of their own or dropped.
+        """
+        partitions = ["p202403", "p202404", "pfuture"]
+        self.assertEqual(plan_expired_partitions(Waste, partitions, date(2024, 4, 1), True), [
+            "CREATE TABLE `waste_p202403` LIKE `waste`",
+            "ALTER TABLE `waste_p202403` REMOVE PARTITIONING",
+            "ALTER TABLE `waste` EXCHANGE PARTITION `p202403` WITH TABLE `waste_p202403`",
+            "ALTER TABLE `waste` DROP PARTITION `p202403`",
+        ])
+        self.assertEqual(plan_expired_partitions(Waste, partitions, date(2024, 5, 1), False), [
+            "ALTER TABLE `waste` DROP PARTITION `p202403`",
+            "ALTER TABLE `waste` DROP PARTITION `p202404`",
+        ])
+
+    def test_command_requires_mysql(self):
+        """
+        Test that the command refuses to run on other databases.
+        """
+        with self.assertRaises(CommandError):
+            call_command("partition_tables", "--dry-run", stdout=StringIO())
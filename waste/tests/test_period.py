@@ -0,0 +1,66 @@
+import datetime
+
+from django.test import SimpleTestCase, override_settings
+
+from ..services import resolve_date, resolve_period
+
+
+class PeriodTest(SimpleTestCase):
+    """
+    Test case for resolving periods into datetime ranges.
+    """
+
+    def test_resolve_period_year(self):
+        """
+        Test that a year resolves to the range from its first day to the first day of the next year.
+        """
+        self.assertEqual(resolve_period(2024),
+                         (datetime.datetime(2024, 1, 1,
+                                            tzinfo=datetime.timezone.utc),
+                          datetime.datetime(2025, 1, 1,
+                                            tzinfo=datetime.timezone.utc)))
+
+    def test_resolve_period_december(self):
+        """
+        Test that December resolves to a range ending on the first day of the next year.
+        """
+        self.assertEqual(resolve_period("2024", "12"),
+                         (datetime.datetime(2024, 12, 1,
+                                            tzinfo=datetime.timezone.utc),
+                          datetime.datetime(2025, 1, 1,
+                                            tzinfo=datetime.timezone.utc)))
+
+    def test_resolve_period_day(self):
+        """
+        Test that a day resolves to a range of exactly one day.
+        """
+        start, end = resolve_period(2024, 2, 29)
+        self.assertEqual(start, datetime.datetime(2024, 2, 29,
+                                                  tzinfo=datetime.timezone.utc))
+        self.assertEqual(end - start, datetime.timedelta(days=1))
+
+    def test_resolve_period_invalid(self):
+        """
+        Test that invalid dates, including a month or day of 0, and a day without a month are rejected.
+        """
+        with self.assertRaises(ValueError):
+            resolve_period(2024, 13)
+        with self.assertRaises(ValueError):
+            resolve_period(2023, 2, 29)
+        with self.assertRaises(ValueError):
+            resolve_period(2024, "", 1)
+        with self.assertRaises(ValueError):
+            resolve_period(2024, 0)
+        with self.assertRaises(ValueError):
+            resolve_period(2024, 4, 0)
+
+    @override_settings(TIME_ZONE="Asia/Bangkok")
+    def test_resolve_date_uses_time_zone(self):
+        """
+        Test that a date resolves to midnight in the configured time zone.
+        """
+        start, end = resolve_date(datetime.date(2024, 4, 23))
+        self.assertEqual(start, datetime.datetime(2024, 4, 22, 17, 0,
+                                                  tzinfo=datetime.timezone.utc))
+        self.assertEqual(end, datetime.datetime(2024, 4, 23, 17, 0,
+                                                tzinfo=datetime.timezone.utc))
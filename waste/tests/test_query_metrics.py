@@ -0,0 +1,138 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from ..services import reset_request_metrics
+
+
+class QueryMetricsTest(TestCase):
+    """
+    Test case for the query metrics middleware and the request metrics endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the query metrics tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+        reset_request_metrics()
+
+    def test_server_timing_header(self):
+        """
+        Test that responses carry the number and duration of their queries.
+        """
+        response = self.client.get("/api/bins/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response["Server-Timing"],
+                         r'^db;dur=\d+\.\d\d;desc="2 queries", app;dur=\d+\.\d\d$')
+        response = self.client.get("/api/bins/")
+        self.assertIn('desc="0 queries"', response["Server-Timing"])
+
+    def test_request_metrics(self):
+        """
+        Test that the metrics endpoint reports the requests of each route.
+        """
+        self.client.get("/api/waste/2024/4/23/bin/1/")
+        self.client.get("/api/waste/2024/4/23/bin/2/")
+        cache.clear()
+        self.client.get("/api/waste/2024/4/23/bin/1/")
+        response = self.client.get("/api/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = response.data["routes"][
+            "api/waste/<int:year>/<int:month>/<int:day>/bin/<int:bin>/"]
+        self.assertEqual(metrics["requests"], 3)
+        self.assertEqual(metrics["max_queries"], 5)
+        self.assertGreater(metrics["avg_queries"], 0)
+        self.assertGreater(metrics["avg_bytes"], 0)
+        self.assertGreaterEqual(metrics["avg_db_ms"], 0)
+        self.assertNotIn("api/metrics/", response.data["routes"])
+        reset_request_metrics()
+        self.assertEqual(self.client.get("/api/metrics/").data["routes"], {})
+
+    @override_settings(WASTE_QUERY_BUDGET=3)
+    def test_query_budget(self):
+        """
+        Test that the SQL of requests exceeding the query budget is logged.
+        """
+        with self.assertLogs("waste.middleware.query_metrics_middleware",
+                             "WARNING") as logs:
+            self.client.get("/api/waste/2024/4/23/bin/1/")
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("GET /api/waste/2024/4/23/bin/1/ issued 5 queries (budget 3)",
+                      logs.output[0])
+        self.assertIn('FROM "waste"', logs.output[0])
+        with self.assertNoLogs("waste.middleware.query_metrics_middleware", "WARNING"):
+            self.client.get("/api/bins/1/")
@@ -0,0 +1,168 @@
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from rest_framework import status
+
+
+class RecordPaginationTest(TestCase):
+    """
+    Test case for the cursor pagination and streaming of the specific period waste API.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the record pagination tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def get_all_records(self, url: str, page_size: int) -> list[dict]:
+        """
+        Follow the cursors of a paginated endpoint until the last page.
+
+        :param url: The URL of the endpoint.
+        :param page_size: The number of records per page.
+
+        :return: The records of all pages, in order.
+        """
+        records = []
+        response = self.client.get(url, {"page_size": page_size})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["records"]), page_size)
+            records += response.data["records"]
+            if response.data["next"] is None:
+                return records
+            response = self.client.get(url, {"page_size": page_size,
+                                             "cursor": response.data["next"]})
+
+    def test_paginated_records(self):
+        """
+        Test that following the cursors returns the same records as the unpaginated response.
+        """
+        for url in ('/api/waste/2024/bin/1/', '/api/waste/2024/4/location/Lam Luk Ka/'):
+            expected_records = self.client.get(url).data["records"]
+            response = self.client.get(url, {"page_size": 2})
+            self.assertEqual(response.data["records"], expected_records[:2])
+            for page_size in (1, 2, 4, 5, 100):
+                self.assertEqual(self.get_all_records(url, page_size), expected_records)
+
+    def test_paginated_records_with_equal_timestamps(self):
+        """
+        Test that readings sharing a timestamp are neither skipped nor repeated across pages.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 08:00:00', 51.00),
+                    (1, '2024-04-23 08:00:00', 52.00)
+            """)
+        records = self.get_all_records('/api/waste/2024/4/23/bin/1/', 1)
+        self.assertEqual([str(record["level"]) for record in records],
+                         ["70.50", "60.00", "52.00", "51.00", "50.25", "40.75", "30.25"])
+
+    def test_invalid_pagination_parameters(self):
+        """
+        Test that a malformed cursor or page size is rejected with 400 (Bad Request).
+        """
+        for params, error in (({"cursor": "invalid"}, "Invalid Cursor"),
+                              ({"page_size": 0}, "Invalid Page Size"),
+                              ({"page_size": "all"}, "Invalid Page Size"),
+                              ({"page_size": 10001}, "Invalid Page Size")):
+            response = self.client.get('/api/waste/2024/bin/1/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data, {"Error": error})
+
+    def test_streamed_records(self):
+        """
+        Test that the streaming response contains the same JSON as the unpaginated response.
+        """
+        for url in ('/api/waste/2024/bin/2/', '/api/waste/2024/4/23/location/Thanyaburi/'):
+            expected_response = json.loads(self.client.get(url).content)
+            for params in ({"stream": 1}, {"stream": 1, "page_size": 2}):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertTrue(response.streaming)
+                self.assertEqual(json.loads(b"".join(response.streaming_content)),
+                                 expected_response)
+
+    def test_streamed_records_without_data(self):
+        """
+        Test that streaming a period without waste data returns an empty list of records.
+        """
+        response = self.client.get('/api/waste/2023/bin/1/', {"stream": 1})
+        self.assertEqual(json.loads(b"".join(response.streaming_content)),
+                         {"bin": 1, "year": 2023, "records": []})
@@ -0,0 +1,189 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from ..api_views import AsyncSpecificPeriodWasteAPI, SpecificPeriodWasteAPI
+from ..api_views.cached_response import cached_response
+from ..api_views.conditional_response import conditional_response
+from ..db import ReplicaRouter, read_from_replica, reading_from_lagging_replica, use_replica
+from ..db.replica_router import forget_replica_lags, get_replica_lag
+from ..models import Waste
+from ..services import get_response_cache_key
+
+
+@override_settings(WASTE_REPLICA_DATABASES=["replica_1"], WASTE_REPLICA_MAX_LAG=5,
+                   WASTE_REPLICA_MAX_ANALYTICS_LAG=300,
+                   WASTE_REPLICA_LAG_CHECK_INTERVAL=60)
+class ReplicaRouterTest(SimpleTestCase):
+    """
+    Test case for routing the reads of the analytics and latest views to the read replicas.
+    """
+
+    def setUp(self):
+        """
+        Set up the router with a replica lagging behind by one second.
+        """
+        self.router = ReplicaRouter()
+        forget_replica_lags()
+        self.addCleanup(forget_replica_lags)
+        patcher = mock.patch("waste.db.replica_router.get_replica_lag", return_value=1)
+        self.get_replica_lag = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_use_replica(self):
+        """
+        Test that reads go to the replica inside use_replica, and writes to the primary.
+        """
+        self.assertIsNone(self.router.db_for_read(Waste))
+        with use_replica(5) as alias:
+            self.assertEqual(alias, "replica_1")
+            self.assertEqual(self.router.db_for_read(Waste), "replica_1")
+            self.assertEqual(self.router.db_for_write(Waste), DEFAULT_DB_ALIAS)
+        self.assertIsNone(self.router.db_for_read(Waste))
+
+    def test_lag_fallback(self):
+        """
+        Test that reads fall back to the primary when the replica lags behind too far or is stopped.
+        """
+        self.get_replica_lag.return_value = 10
+        with use_replica(5) as alias:
+            self.assertEqual(alias, DEFAULT_DB_ALIAS)
+        with use_replica(300) as alias:
+            self.assertEqual(alias, "replica_1")
+        forget_replica_lags()
+        self.get_replica_lag.return_value = None
+        with use_replica(300) as alias:
+            self.assertEqual(alias, DEFAULT_DB_ALIAS)
+
+    def test_lag_cache(self):
+        """
+        Test that the lag of a replica is queried at most every WASTE_REPLICA_LAG_CHECK_INTERVAL seconds.
+        """
+        for _ in range(3):
+            with use_replica(5):
+                pass
+        self.assertEqual(self.get_replica_lag.call_count, 1)
+        with override_settings(WASTE_REPLICA_LAG_CHECK_INTERVAL=0):
+            with use_replica(5):
+                pass
+        self.assertEqual(self.get_replica_lag.call_count, 2)
+
+    def test_transaction(self):
+        """
+        Test that reads inside a transaction stay on the primary.
+        """
+        with mock.patch.object(connections[DEFAULT_DB_ALIAS], "in_atomic_block", True):
+            with use_replica(5) as alias:
+                self.assertEqual(alias, DEFAULT_DB_ALIAS)
+        self.get_replica_lag.assert_not_called()
+
+    def test_read_from_replica(self):
+        """
+        Test that decorated sync and async handlers read from the replica, including from worker threads.
+        """
+        router = self.router
+
+        class View:
+            @read_from_replica(latest=True)
+            def get(self):
+                return router.db_for_read(Waste)
+
+            @read_from_replica()
+            async def aget(self):
+                return await sync_to_async(router.db_for_read,
+                                           thread_sensitive=False)(Waste)
+
+        self.assertEqual(View().get(), "replica_1")
+        self.assertEqual(async_to_sync(View().aget)(), "replica_1")
+        self.assertIsNone(self.router.db_for_read(Waste))
+        self.get_replica_lag.return_value = 10
+        forget_replica_lags()
+        self.assertEqual(View().get(), DEFAULT_DB_ALIAS)
+        self.assertEqual(async_to_sync(View().aget)(), "replica_1")
+
+    def test_lagging_replica_not_cached(self):
+        """
+        Test that responses and validators read from a lagging replica are not cached.
+        """
+        router = self.router
+        self.addCleanup(cache.clear)
+
+        class View:
+            def __init__(self, request):
+                self.request = request
+
+            def get_validators(self, **kwargs):
+                return router.db_for_read(Waste), timezone.now()
+
+            @read_from_replica()
+            @conditional_response
+            @cached_response
+            def get(self, *args, **kwargs):
+                return Response({"database": router.db_for_read(Waste)})
+
+        def get_cached(path):
+            View(RequestFactory().get(path)).get()
+            return [cache.get(get_response_cache_key(view, path)[0])
+                    for view in ("View", "View:validators")]
+
+        with use_replica(5):
+            self.assertTrue(reading_from_lagging_replica())
+        self.assertEqual(get_cached("/lagging/"), [None, None])
+        self.get_replica_lag.return_value = 0
+        forget_replica_lags()
+        with use_replica(5):
+            self.assertFalse(reading_from_lagging_replica())
+        data, (etag, _) = get_cached("/current/")
+        self.assertEqual(data, {"database": "replica_1"})
+        self.assertEqual(etag, "replica_1")
+
+    def test_stream_from_replica(self):
+        """
+        Test that streamed record pages are read from the replica after the handler returns.
+        """
+        databases = []
+
+        def get_record_pages(wastes, weathers, page_size, cursor=None):
+            databases.append((wastes.db, weathers.db))
+            yield [], None
+
+        async def read_stream(response):
+            return b"".join([chunk async for chunk in response])
+
+        for view in (SpecificPeriodWasteAPI, AsyncSpecificPeriodWasteAPI):
+            with self.subTest(view=view.__name__), \
+                    mock.patch.object(view, "get_validators", return_value=None), \
+                    mock.patch("waste.api_views.specific_period_waste_api.get_record_pages",
+                               get_record_pages), \
+                    mock.patch("waste.api_views.async_specific_period_waste_api"
+                               ".get_record_pages", get_record_pages):
+                databases.clear()
+                request = APIRequestFactory().get("/api/waste/2024/?stream=1")
+                if view is AsyncSpecificPeriodWasteAPI:
+                    response = async_to_sync(view.as_view())(request, year="2024")
+                    self.assertEqual(databases, [])
+                    async_to_sync(read_stream)(response)
+                else:
+                    response = view.as_view()(request, year="2024")
+                    self.assertEqual(databases, [])
+                    b"".join(response)
+                self.assertEqual(databases, [("replica_1", "replica_1")])
+
+    def test_allow_migrate(self):
+        """
+        Test that migrations only run on the primary.
+        """
+        self.assertFalse(self.router.allow_migrate("replica_1", "waste"))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, "waste"))
+
+    def test_replica_lag_without_replication(self):
+        """
+        Test that a database without replication status, like SQLite, counts as not lagging behind.
+        """
+        self.assertEqual(get_replica_lag(DEFAULT_DB_ALIAS), 0)
@@ -0,0 +1,157 @@
+import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import Bin, Waste
+from ..services import get_response_cache_key
+
+
+class ResponseCacheTest(TestCase):
+    """
+    Test case for the response cache of the API endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the response cache tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def test_closed_period_is_cached(self):
+        """
+        Test that the response of a closed period is served from the cache on the second request.
+        """
+        response = self.client.get('/api/waste/2024/4/23/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get('/api/waste/2024/4/23/')
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response.data, response.data)
+        response = self.client.get('/api/cache/stats/')
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 1)
+        self.assertEqual(response.data["hit_ratio"], 0.5)
+
+    @override_settings(WASTE_ARCHIVE_CACHE_TIMEOUT=600, WASTE_RESPONSE_CACHE_TIMEOUT=60)
+    def test_closed_period_expires(self):
+        """
+        Test that responses of closed periods expire, so changes made by other processes show up.
+        """
+        end = timezone.make_aware(datetime.datetime(2024, 4, 24))
+        self.assertEqual(get_response_cache_key("View", "/", end)[1], 600)
+        self.assertEqual(get_response_cache_key("View", "/", timezone.now() + datetime.timedelta(
+            days=1))[1], 60)
+
+    def test_closed_period_is_invalidated_by_old_reading(self):
+        """
+        Test that saving a reading of a closed period discards the cached responses of closed periods.
+        """
+        self.client.get('/api/waste/2024/4/23/bin/1/')
+        Waste.objects.create(bin=Bin.objects.get(pk=1),
+                             timestamp=timezone.make_aware(
+                                 datetime.datetime(2024, 4, 23, 11)),
+                             level=80)
+        response = self.client.get('/api/waste/2024/4/23/bin/1/')
+        self.assertEqual(len(response.data["records"]), 6)
+        self.assertEqual(response.data["records"][0]["level"], Decimal("80.00"))
+
+    def test_open_period_is_invalidated_by_new_reading(self):
+        """
+        Test that saving a reading of the current day discards the cached responses of open periods
+        but keeps the cached responses of closed periods.
+        """
+        self.client.get('/api/waste/2024/')
+        self.client.get(f'/api/waste/{timezone.localdate().year}/')
+        Waste.objects.create(bin=Bin.objects.get(pk=2), timestamp=timezone.now(),
+                             level=10)
+        with self.assertNumQueries(0):
+            self.client.get('/api/waste/2024/')
+        response = self.client.get(f'/api/waste/{timezone.localdate().year}/')
+        self.assertEqual(response.data[0]["bin"], 2)
+        self.assertEqual(response.data[0]["total_waste"], Decimal("10.00"))
+
+    def test_error_response_is_not_cached(self):
+        """
+        Test that error responses are not cached.
+        """
+        self.client.get('/api/waste/2024/2/30/')
+        self.client.get('/api/waste/latest/bin/3/')
+        response = self.client.get('/api/cache/stats/')
+        self.assertEqual(response.data["hits"], 0)
+        self.assertEqual(response.data["misses"], 2)
@@ -0,0 +1,199 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import Waste, WasteDaily, WasteHourly, Watermark
+from ..services import (ingest_readings, purge_raw_wastes, refresh_rollups,
+                        resolve_date, resolve_period, rollups_cover)
+from ..services.rollups import refresh_waste_rollups, rollups_complete
+from ..services.waste_records import WASTE_RECORD
+
+
+class RetentionTest(TestCase):
+    """
+    Test case for deleting expired raw waste readings once the rollups include them.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the retention tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+
+    def test_apply_retention(self):
+        """
+        Test that the period endpoint returns the same totals after the raw readings are deleted.
+        """
+        expected_response = self.client.get('/api/waste/2024/4/').json()
+        output = StringIO()
+        call_command("apply_retention", "--days", "30", stdout=output)
+        self.assertIn("Deleted 10 raw waste readings", output.getvalue())
+        self.assertFalse(Waste.objects.exists())
+        self.assertEqual(self.client.get('/api/waste/2024/4/').json(), expected_response)
+        self.assertEqual(self.client.get('/api/waste/2024/').json(), expected_response)
+
+    def test_rebuild_after_retention(self):
+        """
+        Test that rebuilding the rollups keeps those of the deleted readings.
+        """
+        expected_response = self.client.get('/api/waste/2024/4/').json()
+        call_command("apply_retention", "--days", "30", stdout=StringIO())
+        now = timezone.now().replace(microsecond=0)
+        Waste.objects.create(bin_id=1, timestamp=now, level=Decimal("12.50"))
+        refresh_rollups()
+        WasteDaily.objects.filter(date=timezone.localdate(now)).update(count=99)
+        call_command("refresh_rollups", "--rebuild", stdout=StringIO())
+        self.assertEqual(self.client.get('/api/waste/2024/4/').json(), expected_response)
+        self.assertEqual(WasteDaily.objects.get(date=timezone.localdate(now)).count, 1)
+
+    def test_batches(self):
+        """
+        Test that readings are deleted in batches, and only once the rollups include them.
+        """
+        self.assertEqual(purge_raw_wastes(30), 0)
+        refresh_waste_rollups(4)
+        self.assertEqual(purge_raw_wastes(30, batch_size=3), 4)
+        self.assertEqual(Waste.objects.count(), 6)
+        refresh_rollups()
+        Watermark.objects.create(name=WASTE_RECORD, last_id=8)
+        self.assertEqual(purge_raw_wastes(30, dry_run=True), 4)
+        self.assertEqual(purge_raw_wastes(30, batch_size=3), 4)
+        self.assertEqual(list(Waste.objects.values_list("waste_id", flat=True)), [9, 10])
+
+    def test_late_readings(self):
+        """
+        Test that readings arriving late for a deleted day are added to its rollups.
+        """
+        refresh_rollups()
+        purge_raw_wastes(30)
+        start, end = resolve_period(2024, 4, 23)
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES (1, '2024-04-23 10:30:00', 4.25)
+            """)
+        self.assertTrue(rollups_cover(start, end))
+        self.assertEqual(refresh_rollups(), {"waste": 1, "weather": 0})
+        daily = WasteDaily.objects.get(bin_id=1)
+        self.assertEqual((daily.total_level, daily.count), (Decimal("256.00"), 6))
+        hourly = WasteHourly.objects.get(
+            bin_id=1, timestamp=datetime.datetime(
+                2024, 4, 23, 10, tzinfo=datetime.timezone.utc))
+        self.assertEqual((hourly.total_level, hourly.count), (Decimal("74.75"), 2))
+
+    def test_rollups_cover_horizon(self):
+        """
+        Test that ranges straddling the retention horizon are read from the rollups without refreshing them.
+        """
+        refresh_rollups()
+        purge_raw_wastes(30)
+        now = timezone.now().replace(microsecond=0)
+        Waste.objects.create(bin_id=1, timestamp=now, level=Decimal("12.50"))
+        start, _ = resolve_period(2024, 4, 23)
+        today, tomorrow = resolve_date(timezone.localdate(now))
+        self.assertTrue(rollups_cover(start, tomorrow))
+        self.assertFalse(rollups_cover(today, tomorrow))
+        self.assertFalse(rollups_complete(start, tomorrow))
+        self.assertFalse(WasteDaily.objects.filter(date=timezone.localdate(now)).exists())
+        refresh_rollups()
+        self.assertTrue(rollups_cover(today, tomorrow))
+        self.assertTrue(rollups_complete(start, tomorrow))
+
+    @override_settings(WASTE_INGEST_TOKEN="", WASTE_INGEST_ALLOW_ANONYMOUS=True)
+    def test_ingest_skips_expired_readings(self):
+        """
+        Test that readings older than the retention horizon are skipped on ingest and counted as expired.
+        """
+        refresh_rollups()
+        purge_raw_wastes(30)
+        now = timezone.now().replace(microsecond=0)
+        self.assertEqual(ingest_readings([
+            (1, datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc),
+             Decimal("70.50")),
+            (1, now, Decimal("12.50")),
+        ]), (1, 1))
+        self.assertEqual(list(Waste.objects.values_list("timestamp", flat=True)), [now])
+        response = self.client.post('/api/waste/ingest/', [
+            {"bin_id": 2, "timestamp": "2024-04-23T10:00:00Z", "level": 40.25},
+            {"bin_id": 1, "timestamp": now.isoformat(), "level": 12.5},
+        ], content_type="application/json")
+        self.assertEqual(response.data, {"received": 2, "inserted": 0, "duplicates": 1,
+                                         "expired": 1})
@@ -0,0 +1,209 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from ..models import Waste, WasteDaily, WasteHourly, Watermark, WeatherDaily
+from ..services import refresh_rollups, rollups_cover, resolve_period
+
+
+class RollupTest(TestCase):
+    """
+    Test case for the hourly and daily rollups.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the rollup tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def test_refresh_rollups(self):
+        """
+        Test that refreshing the rollups summarizes every raw reading per hour and per day.
+        """
+        self.assertEqual(refresh_rollups(), {"waste": 10, "weather": 10})
+        self.assertEqual(WasteHourly.objects.count(), 10)
+        daily = WasteDaily.objects.get(bin_id=1)
+        self.assertEqual(daily.date, datetime.date(2024, 4, 23))
+        self.assertEqual(daily.total_level, Decimal("251.75"))
+        self.assertEqual(daily.min_level, Decimal("30.25"))
+        self.assertEqual(daily.max_level, Decimal("70.50"))
+        self.assertEqual(daily.count, 5)
+        weather = WeatherDaily.objects.get(location="Thanyaburi")
+        self.assertEqual(weather.sum_temp, Decimal("145"))
+        self.assertEqual(weather.count, 5)
+        self.assertEqual(refresh_rollups(), {"waste": 0, "weather": 0})
+
+    def test_refresh_rollups_incrementally(self):
+        """
+        Test that readings added after a refresh are folded into the existing rollups.
+        """
+        refresh_rollups()
+        start, end = resolve_period(2024, 4, 23)
+        self.assertTrue(rollups_cover(start, end))
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES (1, '2024-04-23 10:30:00', 4.25)
+            """)
+        self.assertFalse(rollups_cover(start, end))
+        self.assertEqual(refresh_rollups(1), {"waste": 1, "weather": 0})
+        self.assertTrue(rollups_cover(start, end))
+        self.assertEqual(WasteDaily.objects.get(bin_id=1).total_level,
+                         Decimal("256.00"))
+        hourly = WasteHourly.objects.get(
+            bin_id=1, timestamp=datetime.datetime(
+                2024, 4, 23, 10, tzinfo=datetime.timezone.utc))
+        self.assertEqual(hourly.total_level, Decimal("74.75"))
+        self.assertEqual(hourly.count, 2)
+
+    def test_refresh_rollups_out_of_order(self):
+        """
+        Test that a reading committed after one with a higher ID is still folded into the rollups.
+        """
+        refresh_rollups()
+        start, end = resolve_period(2024, 4, 23)
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (waste_id, bin_id, timestamp, level)
+                VALUES (12, 1, '2024-04-23 10:30:00', 4.25)
+            """)
+        self.assertEqual(refresh_rollups(), {"waste": 1, "weather": 0})
+        watermark = Watermark.objects.get(name="waste_rollup")
+        self.assertEqual(watermark.last_id, 12)
+        self.assertEqual([gap[:2] for gap in watermark.gaps], [[11, 11]])
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (waste_id, bin_id, timestamp, level)
+                VALUES (11, 1, '2024-04-23 10:45:00', 1.75)
+            """)
+        self.assertFalse(rollups_cover(start, end))
+        self.assertEqual(refresh_rollups(), {"waste": 1, "weather": 0})
+        self.assertTrue(rollups_cover(start, end))
+        self.assertEqual(Watermark.objects.get(name="waste_rollup").gaps, [])
+        self.assertEqual(WasteDaily.objects.get(bin_id=1).total_level,
+                         Decimal("257.75"))
+        self.assertEqual(refresh_rollups(), {"waste": 0, "weather": 0})
+
+    def test_refresh_rollups_forgets_rolled_back_gaps(self):
+        """
+        Test that a gap still empty after the timeout is forgotten.
+        """
+        refresh_rollups()
+        Watermark.objects.filter(name="waste_rollup").update(
+            last_id=12, gaps=[[11, 12, "2024-04-23T00:00:00+00:00"]])
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (waste_id, bin_id, timestamp, level)
+                VALUES (13, 1, '2024-04-23 10:30:00', 4.25)
+            """)
+        self.assertEqual(refresh_rollups(), {"waste": 1, "weather": 0})
+        watermark = Watermark.objects.get(name="waste_rollup")
+        self.assertEqual((watermark.last_id, watermark.gaps), (13, []))
+
+    def test_period_api_reads_rollups(self):
+        """
+        Test that the period endpoint returns the same totals from the rollups as from the raw readings.
+        """
+        expected_response = self.client.get('/api/waste/2024/4/').json()
+        call_command("refresh_rollups", stdout=StringIO())
+        Waste.objects.all().delete()
+        response = self.client.get('/api/waste/2024/4/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected_response)
+
+    def test_comparison_view_reads_rollups(self):
+        """
+        Test that the comparison view charts the rollups when they cover the period.
+        """
+        call_command("refresh_rollups", stdout=StringIO())
+        Waste.objects.all().delete()
+        response = self.client.get(
+            f"{reverse('waste:comparison')}?filter_type=bin_id&filter_value=1&year=2024")
+        self.assertEqual(response.context['chart_data'],
+                         [None, None, None, 251.75, None, None, None, None,
+                          None, None, None, None])
+        self.assertEqual(response.context['temperature_data'][3],
+                         Decimal('29'))
+        response = self.client.get(
+            f"{reverse('waste:comparison')}?filter_type=location&filter_value=Thanyaburi&year=2024&month=4&day=23")
+        self.assertEqual(response.context['chart_data'],
+                         [None, 71.0, 180.75, None, None, None])
@@ -221,3 +221,25 @@ class WasteLevelComparisonViewTest(TestCase):
                           None])
         self.assertEqual(response.context['precipitation_data'],
                          [None, Decimal('0'), Decimal('0'), None, None, None])
+
+    def test_comparison_view_query_count(self):
+        """
+        Test that the Waste Level Comparison view issues the same number of queries for every granularity.
+
+        One query checks the rollup watermarks, two build the chart data and two list the bins
+        and locations for the filter form.
+        """
+        for query in ("year=2024&month=4&day=23", "year=2024&month=4",
+                      "year=2024"):
+            with self.assertNumQueries(5):
+                response = self.client.get(
+                    f"{reverse('waste:comparison')}?filter_type=bin_id&filter_value=1&{query}")
+            self.assertEqual(response.status_code, 200)
+
+    def test_comparison_view_with_invalid_period(self):
+        """
+        Test that a day without a month or an invalid date is rejected instead of being widened.
+        """
+        for query in ("year=2024&day=23", "year=2024&month=13"):
+            response = self.client.get(f"{reverse('waste:comparison')}?{query}")
+            self.assertEqual(response.status_code, 400)
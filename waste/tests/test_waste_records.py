@@ -0,0 +1,187 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Waste, WasteRecord, Weather
+from ..services import append_waste_records
+
+
+class WasteRecordTest(TestCase):
+    """
+    Test case for the incremental refresh of the waste_record table.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the waste record tests.
+        """
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste_record (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    bin_id INTEGER NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def test_append_waste_records(self):
+        """
+        Test that every waste reading with matching weather data is appended exactly once.
+        """
+        self.assertEqual(append_waste_records(), (10, 10))
+        self.assertEqual(append_waste_records(), (0, 0))
+        record = WasteRecord.objects.get(bin_id=1, level=Decimal("70.50"))
+        self.assertEqual(record.location, "Thanyaburi")
+        self.assertEqual(record.temp, Decimal("30.00"))
+        self.assertEqual(record.capacity, Decimal("100.00"))
+
+    def test_append_waste_records_in_batches(self):
+        """
+        Test that readings are appended in bounded batches without gaps or duplicates.
+        """
+        self.assertEqual(append_waste_records(batch_size=4), (4, 4))
+        self.assertEqual(append_waste_records(batch_size=4), (4, 4))
+        self.assertEqual(append_waste_records(batch_size=4), (2, 2))
+        self.assertEqual(WasteRecord.objects.count(), Waste.objects.count())
+
+    def test_append_waste_records_without_weather(self):
+        """
+        Test that old readings without weather data are skipped while recent ones wait for it.
+        """
+        append_waste_records()
+        recent = timezone.now().replace(microsecond=0)
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES (1, '2024-04-23 11:00:00', 5.00)
+            """)
+        Waste.objects.create(bin_id=2, timestamp=recent, level=Decimal("1.50"))
+        self.assertEqual(append_waste_records(), (1, 0))
+        self.assertEqual(append_waste_records(), (0, 0))
+        Weather.objects.create(timestamp=recent, location="Lam Luk Ka",
+                               lat=Decimal("13.9729"), lon=Decimal("100.6375"),
+                               temp=Decimal("33.0"), precip=Decimal("0.0"),
+                               humid=Decimal("50.0"))
+        self.assertEqual(append_waste_records(), (1, 1))
+        self.assertEqual(WasteRecord.objects.count(), 11)
+
+    def test_append_waste_records_out_of_order(self):
+        """
+        Test that a reading committed after one with a higher ID is appended exactly once.
+        """
+        append_waste_records()
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (waste_id, bin_id, timestamp, level)
+                VALUES (12, 1, '2024-04-23 09:00:00', 5.00)
+            """)
+        self.assertEqual(append_waste_records(), (1, 1))
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste (waste_id, bin_id, timestamp, level)
+                VALUES (11, 2, '2024-04-23 09:00:00', 2.50)
+            """)
+        self.assertEqual(append_waste_records(), (1, 1))
+        self.assertEqual(append_waste_records(), (0, 0))
+        self.assertEqual(WasteRecord.objects.count(), 12)
+
+    def test_refresh_waste_records_command(self):
+        """
+        Test that the command refuses to append to a table it did not fill unless asked to rebuild it.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO waste_record (timestamp, bin_id, location, lat, lon, temp, precip, humid, capacity, level)
+                VALUES ('2024-04-23 10:00:00', 1, 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0, 100.00, 70.50)
+            """)
+        with self.assertRaises(CommandError):
+            call_command("refresh_waste_records", stdout=StringIO())
+        output = StringIO()
+        call_command("refresh_waste_records", "--rebuild", stdout=output)
+        self.assertIn("Appended 10 records from 10 waste readings",
+                      output.getvalue())
+        self.assertEqual(WasteRecord.objects.count(), 10)
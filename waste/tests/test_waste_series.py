@@ -0,0 +1,190 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from ..models import Waste, WasteSeries
+from ..services import get_waste_series, refresh_rollups
+from ..services.series import decode_series
+
+
+class WasteSeriesTest(TestCase):
+    """
+    Test case for the daily waste series.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the rollup tests.
+        """
+        cache.clear()
+        self.maxDiff = None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+
+    def test_refresh_builds_series(self):
+        """
+        Test that refreshing the rollups stores one series of hourly levels per bin and day.
+        """
+        refresh_rollups()
+        self.assertEqual(WasteSeries.objects.count(), 2)
+        series = WasteSeries.objects.get(bin_id=1)
+        self.assertEqual(series.date, datetime.date(2024, 4, 23))
+        levels = decode_series(series.levels)
+        self.assertEqual(len(levels), 24)
+        self.assertEqual(list(levels[6:11]), [30.25, 40.75, 50.25, 60.0, 70.5])
+        self.assertNotEqual(levels[5], levels[5])
+
+    def test_refresh_updates_series(self):
+        """
+        Test that readings added after a refresh are folded into the series of their day.
+        """
+        refresh_rollups()
+        Waste.objects.create(bin_id=1, level=10,
+                             timestamp=datetime.datetime(2024, 4, 23, 10, 30,
+                                                         tzinfo=datetime.timezone.utc))
+        refresh_rollups()
+        self.assertEqual(WasteSeries.objects.count(), 2)
+        self.assertEqual(get_waste_series(datetime.date(2024, 4, 23), first=10,
+                                          last=11, bin_id=1), [80.5])
+
+    def test_stored_series_matches_raw_readings(self):
+        """
+        Test that the stored series and the series computed from the raw readings are equal.
+        """
+        refresh_rollups()
+        day = datetime.date(2024, 4, 23)
+        for filters in ({"bin_id": 1}, {"bin__location": "Lam Luk Ka"}, {}):
+            self.assertEqual(get_waste_series(day, **filters),
+                             get_waste_series(day, stored=False, **filters))
+        self.assertEqual(get_waste_series(day, first=5, last=8),
+                         [None, 35.75, 51.0])
+
+    def test_series_api(self):
+        """
+        Test that the series API returns the hourly levels of a bin, sliced to the requested hours.
+        """
+        refresh_rollups()
+        cache.clear()
+        response = self.client.get("/api/waste/series/2024/4/23/bin/1/?start=6&end=11")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            "bin": 1,
+            "date": "2024-04-23",
+            "start": "2024-04-23T06:00:00Z",
+            "resolution": 3600,
+            "levels": [30.25, 40.75, 50.25, 60.0, 70.5],
+        })
+        response = self.client.get("/api/waste/series/2024/4/23/location/Lam Luk Ka/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["levels"]), 24)
+        self.assertEqual(response.json()["levels"][6], 5.5)
+
+    def test_series_api_without_rollups(self):
+        """
+        Test that the series API computes the levels from the raw readings before a refresh.
+        """
+        response = self.client.get("/api/waste/series/2024/4/23/bin/2/?start=9&end=11")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["levels"], [30.75, 40.25])
+
+    def test_series_api_errors(self):
+        """
+        Test that the series API rejects invalid dates, hours, bins and locations.
+        """
+        for url, status_code in (
+                ("/api/waste/series/2024/2/30/bin/1/", status.HTTP_400_BAD_REQUEST),
+                ("/api/waste/series/2024/4/0/bin/1/", status.HTTP_400_BAD_REQUEST),
+                ("/api/waste/series/2024/0/23/location/Thanyaburi/",
+                 status.HTTP_400_BAD_REQUEST),
+                ("/api/waste/series/2024/4/23/bin/1/?start=5&end=25",
+                 status.HTTP_400_BAD_REQUEST),
+                ("/api/waste/series/2024/4/23/bin/1/?start=x",
+                 status.HTTP_400_BAD_REQUEST),
+                ("/api/waste/series/2024/4/23/bin/9/", status.HTTP_404_NOT_FOUND),
+                ("/api/waste/series/2024/4/23/location/Nowhere/",
+                 status.HTTP_404_NOT_FOUND)):
+            self.assertEqual(self.client.get(url).status_code, status_code, url)
+
+    def test_latest_view_reads_series(self):
+        """
+        Test that the latest waste view charts the stored series of the bin.
+        """
+        refresh_rollups()
+        response = self.client.get(
+            f"{reverse('waste:latest')}?filter_type=bin_id&filter_value=1")
+        self.assertEqual(response.context['chart_data'],
+                         [30.25, 40.75, 50.25, 60.0, 70.5])
+        self.assertEqual(response.context['chart_labels'],
+                         ["06:00", "07:00", "08:00", "09:00", "10:00"])
@@ -0,0 +1,219 @@
+import asyncio
+import datetime
+import json
+import threading
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from ..models import Weather
+from ..services import (WeatherAPIProvider, fetch_observations,
+                        ingest_weather, store_observations)
+
+OBSERVED_AT = datetime.datetime(2024, 4, 23, 11, 15, tzinfo=datetime.timezone.utc)
+
+
+class WeatherFixtureHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of a local fixture server answering like the current.json endpoint of weatherapi.com.
+    """
+
+    def do_GET(self):
+        """
+        Answer with a fixed observation for Thanyaburi and Lam Luk Ka, and an error otherwise.
+        """
+        query = parse_qs(urlparse(self.path).query)
+        location = query["q"][0]
+        if query["key"] != ["test-key"] or location not in ("Thanyaburi", "Lam Luk Ka"):
+            self.send_response(400)
+            self.end_headers()
+            return
+        body = json.dumps({
+            "location": {"name": location, "lat": 13.99, "lon": 100.62},
+            "current": {"last_updated_epoch": int(OBSERVED_AT.timestamp()),
+                        "temp_c": 33.1, "precip_mm": 0.02, "humidity": 58},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """
+        Keep the test output quiet.
+        """
+
+
+class FakeWeatherProvider:
+    """
+    In-process weather provider that records how many requests are in flight.
+    """
+
+    def __init__(self):
+        """
+        Create a provider without requests in flight.
+        """
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, location: str) -> dict:
+        """
+        Return a fixed observation after a short delay.
+        """
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"timestamp": OBSERVED_AT.replace(minute=0), "location": location,
+                "lat": 14, "lon": 100.5, "temp": 30, "precip": 0, "humid": 70}
+
+
+class WeatherIngestTest(TestCase):
+    """
+    Test case for the weather ingestion pipeline.
+    """
+
+    def setUp(self):
+        """
+        Set up test data for the weather ingestion tests and start the fixture server.
+        """
+        cache.clear()
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bin (
+                    bin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name VARCHAR(100) NOT NULL,
+                    location VARCHAR(100) NOT NULL,
+                    lat DECIMAL(9,6) NOT NULL,
+                    lon DECIMAL(9,6) NOT NULL,
+                    waste_type VARCHAR(50) NOT NULL,
+                    capacity DECIMAL(10,2) NOT NULL,
+                    collect_freq VARCHAR(50) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS waste (
+                    waste_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bin_id INTEGER NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    level NUMERIC(6,2) NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS weather_api (
+                    weather_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    location TEXT NOT NULL,
+                    lat NUMERIC(9,6) NOT NULL,
+                    lon NUMERIC(9,6) NOT NULL,
+                    temp NUMERIC(5,2) NOT NULL,
+                    precip NUMERIC(5,2) NOT NULL,
+                    humid NUMERIC(5,2) NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                INSERT INTO bin (name, location, lat, lon, waste_type, capacity, collect_freq)
+                VALUES 
+                    ('Bin 1', 'Thanyaburi', 13.9864, 100.6183, 'General', 100.00, 'Daily'),
+                    ('Bin 2', 'Lam Luk Ka', 13.9729, 100.6375, 'Recyclable', 120.00, 'Weekly')
+            """)
+
+            cursor.execute("""
+                INSERT INTO waste (bin_id, timestamp, level)
+                VALUES 
+                    (1, '2024-04-23 10:00:00', 70.50),
+                    (2, '2024-04-23 10:00:00', 40.25),
+                    (1, '2024-04-23 09:00:00', 60.00),
+                    (2, '2024-04-23 09:00:00', 30.75),
+                    (1, '2024-04-23 08:00:00', 50.25),
+                    (2, '2024-04-23 08:00:00', 20.50),
+                    (1, '2024-04-23 07:00:00', 40.75),
+                    (2, '2024-04-23 07:00:00', 10.25),
+                    (1, '2024-04-23 06:00:00', 30.25),
+                    (2, '2024-04-23 06:00:00', 5.50)
+            """)
+
+            cursor.execute("""
+                INSERT INTO weather_api (timestamp, location, lat, lon, temp, precip, humid)
+                VALUES 
+                    ('2024-04-23 10:00:00', 'Thanyaburi', 13.9864, 100.6183, 30.0, 0.0, 60.0),
+                    ('2024-04-23 09:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.5, 0.0, 65.0),
+                    ('2024-04-23 08:00:00', 'Thanyaburi', 13.9864, 100.6183, 29.0, 0.0, 70.0),
+                    ('2024-04-23 07:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.5, 0.0, 75.0),
+                    ('2024-04-23 06:00:00', 'Thanyaburi', 13.9864, 100.6183, 28.0, 0.0, 80.0),
+                    ('2024-04-23 10:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 32.0, 0.0, 55.0),
+                    ('2024-04-23 09:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.5, 0.0, 60.0),
+                    ('2024-04-23 08:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 31.0, 0.0, 65.0),
+                    ('2024-04-23 07:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.5, 0.0, 70.0),
+                    ('2024-04-23 06:00:00', 'Lam Luk Ka', 13.9729, 100.6375, 30.0, 0.0, 75.0)
+            """)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), WeatherFixtureHandler)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,),
+                         daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/current.json"
+
+    def test_ingest_weather_from_fixture_server(self):
+        """
+        Test that the weather of every bin location is fetched and stored once per hour.
+        """
+        with override_settings(WEATHER_API_URL=self.url, WEATHER_API_KEY="test-key"):
+            inserted, errors = ingest_weather()
+            self.assertEqual((inserted, errors), (2, {}))
+            self.assertEqual(ingest_weather(), (0, {}))
+        weather = Weather.objects.get(location="Lam Luk Ka", timestamp__hour=11)
+        self.assertEqual(weather.timestamp,
+                         datetime.datetime(2024, 4, 23, 11, tzinfo=datetime.timezone.utc))
+        self.assertEqual((weather.lat, weather.temp, weather.precip, weather.humid),
+                         (Decimal("13.990000"), Decimal("33.10"), Decimal("0.02"),
+                          Decimal("58.00")))
+
+    def test_ingest_weather_with_failed_location(self):
+        """
+        Test that a location that cannot be fetched is reported without losing the other locations.
+        """
+        provider = WeatherAPIProvider(self.url, "test-key")
+        inserted, errors = ingest_weather(provider, ["Thanyaburi", "Khlong Luang"])
+        self.assertEqual(inserted, 1)
+        self.assertEqual(list(errors), ["Khlong Luang"])
+        self.assertIn("HTTPError", errors["Khlong Luang"])
+
+    def test_fetch_observations_concurrently(self):
+        """
+        Test that observations are fetched concurrently, up to the concurrency limit.
+        """
+        provider = FakeWeatherProvider()
+        locations = [f"Location {number}" for number in range(10)]
+        observations, errors = asyncio.run(fetch_observations(provider, locations, 4))
+        self.assertEqual(len(observations), 10)
+        self.assertEqual(errors, {})
+        self.assertEqual(provider.max_in_flight, 4)
+
+    def test_store_observations_deduplicates(self):
+        """
+        Test that observations already stored or repeated in the batch are skipped.
+        """
+        observation = {"timestamp": datetime.datetime(2024, 4, 23, 10, tzinfo=datetime.timezone.utc),
+                       "location": "Thanyaburi", "lat": 14, "lon": 100.5, "temp": 30,
+                       "precip": 0, "humid": 70}
+        new_observation = observation | {"timestamp": OBSERVED_AT.replace(minute=0)}
+        self.assertEqual(store_observations([observation, new_observation, new_observation]), 1)
+        self.assertEqual(Weather.objects.filter(location="Thanyaburi").count(), 6)
+
+    def test_ingest_weather_command(self):
+        """
+        Test that the command reports the inserted observations.
+        """
+        out = StringIO()
+        with override_settings(WEATHER_API_URL=self.url, WEATHER_API_KEY="test-key"):
+            call_command("ingest_weather", stdout=out)
+        self.assertIn("Inserted 2 weather observations", out.getvalue())
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from django.views.generic import TemplateView
 from .views import *
@@ -5,6 +6,13 @@ from .api_views import *
 
 app_name = "waste"
 
+if settings.WASTE_ASYNC_VIEWS:
+    ListLatestWastes, SpecificLatestWaste = AsyncListLatestWastesAPI, AsyncSpecificLatestWasteAPI
+    ListPeriodWastes, SpecificPeriodWaste = AsyncListPeriodWastesAPI, AsyncSpecificPeriodWasteAPI
+else:
+    ListLatestWastes, SpecificLatestWaste = ListLatestWastesAPI, SpecificLatestWasteAPI
+    ListPeriodWastes, SpecificPeriodWaste = ListPeriodWastesAPI, SpecificPeriodWasteAPI
+
 urlpatterns = [
     path("", TemplateView.as_view(template_name="homepage.html"), name="home"),
     path("latest/", LatestWasteView.as_view(), name="latest"),
@@ -13,18 +21,24 @@ urlpatterns = [
     path('api/', TemplateView.as_view(template_name="swagger.html"), name="swagger"),
     path('api/bins/', ListBinsAPI.as_view()),
     path('api/bins/<int:pk>/', SpecificBinAPI.as_view()),
-    path('api/waste/latest/', ListLatestWastesAPI.as_view()),
-    path('api/waste/latest/bin/<int:bin>/', SpecificLatestWasteAPI.as_view()),
-    path('api/waste/latest/location/<str:location>/', SpecificLatestWasteAPI.as_view()),
-    path('api/waste/<int:year>/<int:month>/<int:day>/', ListPeriodWastesAPI.as_view()),
-    path('api/waste/<int:year>/<int:month>/<int:day>/bin/<int:bin>/', SpecificPeriodWasteAPI.as_view()),
-    path('api/waste/<int:year>/<int:month>/<int:day>/location/<str:location>/', SpecificPeriodWasteAPI.as_view()),
-    path('api/waste/<int:year>/<int:month>/', ListPeriodWastesAPI.as_view()),
-    path('api/waste/<int:year>/<int:month>/bin/<int:bin>/', SpecificPeriodWasteAPI.as_view()),
-    path('api/waste/<int:year>/<int:month>/location/<str:location>/', SpecificPeriodWasteAPI.as_view()),
-    path('api/waste/<int:year>/', ListPeriodWastesAPI.as_view()),
-    path('api/waste/<int:year>/bin/<int:bin>/', SpecificPeriodWasteAPI.as_view()),
-    path('api/waste/<int:year>/location/<str:location>/', SpecificPeriodWasteAPI.as_view()),
+    path('api/waste/ingest/', IngestWastesAPI.as_view()),
+    path('api/waste/latest/', ListLatestWastes.as_view()),
+    path('api/waste/latest/bin/<int:bin>/', SpecificLatestWaste.as_view()),
+    path('api/waste/latest/location/<str:location>/', SpecificLatestWaste.as_view()),
+    path('api/waste/series/<int:year>/<int:month>/<int:day>/bin/<int:bin>/', WasteSeriesAPI.as_view()),
+    path('api/waste/series/<int:year>/<int:month>/<int:day>/location/<str:location>/', WasteSeriesAPI.as_view()),
+    path('api/waste/<int:year>/<int:month>/<int:day>/', ListPeriodWastes.as_view()),
+    path('api/waste/<int:year>/<int:month>/<int:day>/bin/<int:bin>/', SpecificPeriodWaste.as_view()),
+    path('api/waste/<int:year>/<int:month>/<int:day>/location/<str:location>/', SpecificPeriodWaste.as_view()),
+    path('api/waste/<int:year>/<int:month>/', ListPeriodWastes.as_view()),
+    path('api/waste/<int:year>/<int:month>/bin/<int:bin>/', SpecificPeriodWaste.as_view()),
+    path('api/waste/<int:year>/<int:month>/location/<str:location>/', SpecificPeriodWaste.as_view()),
+    path('api/waste/<int:year>/', ListPeriodWastes.as_view()),
+    path('api/waste/<int:year>/bin/<int:bin>/', SpecificPeriodWaste.as_view()),
+    path('api/waste/<int:year>/location/<str:location>/', SpecificPeriodWaste.as_view()),
+    path('api/cache/stats/', ResponseCacheStatsAPI.as_view()),
+    path('api/metrics/', RequestMetricsAPI.as_view()),
+    path('api/db/pools/', ConnectionPoolStatsAPI.as_view()),
 
     path('<path:undefined_path>/', UnavailableView.as_view(), name="404"),
 ]
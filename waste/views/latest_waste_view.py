@@ -1,7 +1,14 @@
-from django.db.models import Sum
+from datetime import date
+
+from django.db.models import QuerySet
+from django.template.response import TemplateResponse
+from django.utils import timezone
 from django.views.generic import TemplateView
 
+from ..db import read_from_replica
 from ..models import Bin, Waste, Weather
+from ..services import (SERIES_RESOLUTION, get_latest_timestamp,
+                        get_waste_series, resolve_date, rollups_cover)
 
 
 class LatestWasteView(TemplateView):
@@ -13,6 +20,18 @@ class LatestWasteView(TemplateView):
     """
     template_name = 'latest_waste.html'
 
+    @read_from_replica(latest=True)
+    def get(self, request, *args, **kwargs) -> TemplateResponse:
+        """
+        Render the template, reading the data from a replica.
+
+        The response is rendered before it is returned rather than by the response handler, so
+        that the querysets in the context are evaluated on the replica as well.
+
+        :return: The rendered response.
+        """
+        return super().get(request, *args, **kwargs).render()
+
     def get_context_data(self, **kwargs):
         """
         Get the context data for rendering the template.
@@ -31,47 +50,33 @@ class LatestWasteView(TemplateView):
 
         if filter_type == 'bin_id' and filter_value.isnumeric():
             wastes = Waste.objects.filter(bin=filter_value)
-            waste = wastes.order_by('-timestamp').first()
+            waste = self.get_latest_waste(wastes, bin_id=filter_value)
             if waste:
-                waste_date = waste.timestamp.date()
-                wastes = wastes.filter(timestamp__date=waste_date)
-
-                chart_data = [data.level for data in wastes]
-                chart_labels = [data.timestamp.strftime("%H:%M") for data in
-                                wastes]
+                waste_date = timezone.localdate(waste.timestamp)
+                chart_data, chart_labels = self.get_hourly_data(
+                    waste_date, bin_id=filter_value)
 
                 weathers = Weather.objects.filter(location=waste.bin.location)
                 latest_weather = weathers.order_by('-timestamp').first()
             else:
                 latest_weather = None
         elif filter_type == 'location' and filter_value:
-            waste = Waste.objects.filter(bin__location=filter_value).order_by(
-                '-timestamp').first()
+            waste = self.get_latest_waste(
+                Waste.objects.filter(bin__location=filter_value),
+                location=filter_value)
             latest_weather = Weather.objects.filter(
                 location=filter_value).order_by('-timestamp').first()
             if waste:
-                waste_date = waste.timestamp.date()
-                wastes = Waste.objects.filter(bin__location=filter_value,
-                                              timestamp__date=waste_date)
-                wastes = wastes.values("timestamp__hour").annotate(
-                    total_level=Sum("level"))
-
-                chart_data = [data['total_level'] for data in wastes]
-                chart_labels = [f"{data['timestamp__hour']:02d}:00" for data in
-                                wastes]
+                waste_date = timezone.localdate(waste.timestamp)
+                chart_data, chart_labels = self.get_hourly_data(
+                    waste_date, bin__location=filter_value)
 
                 weathers = Weather.objects.filter(location=filter_value)
         else:
-            waste = Waste.objects.order_by('-timestamp').first()
+            waste = self.get_latest_waste(Waste.objects.all())
             if waste:
-                waste_date = waste.timestamp.date()
-                wastes = Waste.objects.filter(timestamp__date=waste_date)
-                wastes = wastes.values("timestamp__hour").annotate(
-                    total_level=Sum("level"))
-
-                chart_data = [data['total_level'] for data in wastes]
-                chart_labels = [f"{data['timestamp__hour']:02d}:00" for data in
-                                wastes]
+                waste_date = timezone.localdate(waste.timestamp)
+                chart_data, chart_labels = self.get_hourly_data(waste_date)
 
                 weathers = Weather.objects.filter(location=waste.bin.location)
                 latest_weather = weathers.order_by('-timestamp').first()
@@ -96,3 +101,35 @@ class LatestWasteView(TemplateView):
         context['humidity_data'] = humidity_data
 
         return context
+
+    def get_latest_waste(self, wastes: QuerySet, **scope) -> Waste | None:
+        """
+        Get the latest waste reading, using the cached timestamp of the latest reading.
+
+        :param wastes: Queryset for the waste data of the scope.
+        :param scope: The bin ID or location of the scope, if any.
+        :return: The latest waste reading, or None if there is no waste data.
+        """
+        latest_timestamp = get_latest_timestamp(**scope)
+        if latest_timestamp is None:
+            return None
+        return wastes.filter(timestamp=latest_timestamp).first()
+
+    def get_hourly_data(self, waste_date: date, **filters) -> tuple[list, list]:
+        """
+        Get the total waste level of each hour of a date.
+
+        The stored daily series are sliced when the rollups include every reading of the date.
+
+        :param waste_date: The date for which waste data is to be fetched.
+        :param filters: Lookups narrowing the waste data to a bin or location.
+        :return: Total waste level and chart label of each hour with waste data.
+        """
+        start, end = resolve_date(waste_date)
+        levels = get_waste_series(
+            waste_date, rollups_cover(start, end, weather=False), **filters)
+        hours = [(slot, level) for slot, level in enumerate(levels)
+                 if level is not None]
+        return ([level for _, level in hours],
+                [timezone.localtime(start + slot * SERIES_RESOLUTION)
+                 .strftime("%H:%M") for slot, _ in hours])
@@ -1,11 +1,23 @@
 from calendar import month_name, monthrange
-from datetime import date
-
-from django.db.models import Sum, Avg, Min, Max
+from typing import Callable
+
+from django.core.exceptions import BadRequest
+from django.db.models import Expression, Subquery
+from django.db.models.functions import (ExtractDay, ExtractHour,
+                                        ExtractMonth, Floor)
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.utils import timezone
 from django.views.generic import TemplateView
 from django.views.generic.list import QuerySet
 
-from ..models import Bin, Waste, Weather
+from ..db import read_from_replica
+from ..models import (Bin, Waste, WasteDaily, WasteHourly, Weather,
+                      WeatherDaily)
+from ..services import (filter_dates, filter_period,
+                        get_aggregation_backend, resolve_date, resolve_period,
+                        rollups_cover, summarize_waste, summarize_waste_arrays,
+                        summarize_weather, summarize_weather_arrays)
 
 
 class WasteLevelComparisonView(TemplateView):
@@ -13,15 +25,32 @@ class WasteLevelComparisonView(TemplateView):
     View for comparing waste levels and weather data.
 
     This view fetches waste data and corresponding weather information for a specified time period
-    and renders it on a template for comparison.
+    and renders it on a template for comparison. Periods fully covered by the rollups are read from
+    the hourly or daily rollups instead of the raw readings. The readings are aggregated by the
+    backend given with the backend parameter, "sql" or "numpy", or by WASTE_AGGREGATION_BACKEND.
     """
     template_name = 'waste_level_comparison.html'
 
+    @read_from_replica()
+    def get(self, request, *args, **kwargs) -> TemplateResponse:
+        """
+        Render the template, reading the data from a replica.
+
+        The response is rendered before it is returned rather than by the response handler, so
+        that the querysets in the context are evaluated on the replica as well.
+
+        :return: The rendered response.
+        """
+        return super().get(request, *args, **kwargs).render()
+
     def get_context_data(self, **kwargs) -> dict:
         """
         Get the context data for rendering the template.
 
         :return: Context data for rendering the template.
+
+        :raises BadRequest: If the period is invalid, e.g. a day without a month.
+        :raises Http404: If the backend is invalid.
         """
         context = super().get_context_data(**kwargs)
         filter_type = self.request.GET.get('filter_type')
@@ -30,27 +59,38 @@ class WasteLevelComparisonView(TemplateView):
         month = self.request.GET.get('month')
         day = self.request.GET.get('day')
 
-        waste_queryset = Waste.objects.all()
-        weather_queryset = Weather.objects.all()
-
         if year:
-            waste_queryset = waste_queryset.filter(timestamp__year=year)
-            weather_queryset = weather_queryset.filter(timestamp__year=year)
-        if month:
-            waste_queryset = waste_queryset.filter(timestamp__month=month)
-            weather_queryset = weather_queryset.filter(timestamp__month=month)
-        if day:
-            waste_queryset = waste_queryset.filter(timestamp__day=day)
-            weather_queryset = weather_queryset.filter(timestamp__day=day)
+            try:
+                start, end = resolve_period(year, month, day)
+            except ValueError:
+                raise BadRequest("Invalid period.")
+        else:
+            start, end = resolve_date(timezone.localdate())
+        try:
+            self.backend = get_aggregation_backend(
+                self.request.GET.get('backend'))
+        except ValueError:
+            raise Http404("Invalid backend.")
+
+        daily = not year or bool(month and day)
+        use_rollups = rollups_cover(start, end)
+        if use_rollups and daily:
+            waste_queryset = filter_period(WasteHourly.objects.all(), start,
+                                           end)
+        elif use_rollups:
+            waste_queryset = filter_dates(WasteDaily.objects.all(), start, end)
+        else:
+            waste_queryset = filter_period(Waste.objects.all(), start, end)
+        if use_rollups and not daily:
+            weather_queryset = filter_dates(WeatherDaily.objects.all(), start,
+                                            end)
+        else:
+            weather_queryset = filter_period(Weather.objects.all(), start, end)
 
         if filter_type == 'bin_id' and filter_value and filter_value.isnumeric():
             waste_queryset = waste_queryset.filter(bin_id=filter_value)
-            waste = waste_queryset.first()
-            if waste:
-                weather_queryset = weather_queryset.filter(
-                    location=waste.bin.location)
-            else:
-                weather_queryset = weather_queryset.none()
+            weather_queryset = weather_queryset.filter(location=Subquery(
+                waste_queryset.values('bin__location')[:1]))
         elif filter_type == 'location' and filter_value:
             waste_queryset = waste_queryset.filter(bin__location=filter_value)
             weather_queryset = weather_queryset.filter(location=filter_value)
@@ -68,10 +108,6 @@ class WasteLevelComparisonView(TemplateView):
              humidity_data, weather_data) = self.get_yearly_data(
                 waste_queryset, weather_queryset)
         else:
-            today = date.today()
-            waste_queryset = waste_queryset.filter(timestamp__contains=today)
-            weather_queryset = weather_queryset.filter(
-                timestamp__contains=today)
             (chart_data, chart_labels, temperature_data, precipitation_data,
              humidity_data, weather_data) = self.get_daily_data(
                 waste_queryset, weather_queryset)
@@ -87,58 +123,94 @@ class WasteLevelComparisonView(TemplateView):
 
         return context
 
-    def get_daily_data(self, waste_queryset: QuerySet,
-                       weather_queryset: QuerySet) -> list[list]:
+    def get_bucketed_data(self, waste_queryset: QuerySet,
+                          weather_queryset: QuerySet,
+                          bucket: Callable[[str], Expression],
+                          buckets: list[int], labels: list[str]) -> list[list]:
         """
-        Get daily waste and weather data.
-
-        :param waste_queryset: Queryset for waste data.
-        :param weather_queryset: Queryset for weather data.
-        :return: Data for daily waste and weather.
+        Get waste and weather data grouped into buckets.
+
+        Waste and weather data are each aggregated with a single GROUP BY on the bucket
+        expression, or read with a single query and aggregated with NumPy, and buckets
+        without any data are filled with empty values.
+
+        :param waste_queryset: Queryset for waste data or waste rollups.
+        :param weather_queryset: Queryset for weather data or weather rollups.
+        :param bucket: Function building the expression that maps a time field to its bucket.
+        :param buckets: Buckets to be returned, in chart order.
+        :param labels: Chart label of each bucket.
+        :return: Data for waste and weather in each bucket.
         """
-        time = 0
+        if self.backend == 'numpy':
+            summarize_waste_data = summarize_waste_arrays
+            summarize_weather_data = summarize_weather_arrays
+        else:
+            summarize_waste_data = summarize_waste
+            summarize_weather_data = summarize_weather
+        waste_levels = {
+            data['bucket']: data['total_waste']
+            for data in summarize_waste_data(waste_queryset.annotate(
+                bucket=bucket(self.get_time_field(waste_queryset))), 'bucket')
+        }
+        weather_conditions = {
+            data['bucket']: data
+            for data in summarize_weather_data(weather_queryset.annotate(
+                bucket=bucket(self.get_time_field(weather_queryset))),
+                'bucket')
+        }
         chart_data = []
-        chart_labels = []
         temperature_data = []
         precipitation_data = []
         humidity_data = []
         weather_data = []
-        for _ in range(6):
-            chart_labels.append(f"{time:02d}:00")
-            waste_level = waste_queryset.filter(timestamp__hour__gte=time,
-                                                timestamp__hour__lt=time + 4) \
-                .aggregate(total_waste=Sum('level'))['total_waste']
+        for key, label in zip(buckets, labels):
+            waste_level = waste_levels.get(key)
             chart_data.append(
                 float(waste_level) if waste_level is not None else None)
-            weather_condition = weather_queryset.filter(
-                timestamp__hour__gte=time,
-                timestamp__hour__lt=time + 4) \
-                .aggregate(min_temp=Min("temp"),
-                           max_temp=Max("temp"),
-                           avg_temp=Avg("temp"),
-                           min_precip=Min("precip"),
-                           max_precip=Max("precip"),
-                           sum_precip=Sum("precip"),
-                           min_humid=Min("humid"),
-                           max_humid=Max("humid"),
-                           avg_humid=Avg("humid"))
-            temperature_data.append(weather_condition['avg_temp'])
-            precipitation_data.append(weather_condition['sum_precip'])
-            humidity_data.append(weather_condition['avg_humid'])
+            weather_condition = weather_conditions.get(key, {})
+            temperature_data.append(weather_condition.get('avg_temp'))
+            precipitation_data.append(weather_condition.get('sum_precip'))
+            humidity_data.append(weather_condition.get('avg_humid'))
             weather_data.append({
-                "timestamp": chart_labels[-1],
-                "temperature_min": weather_condition['min_temp'],
-                "temperature_max": weather_condition['max_temp'],
-                "temperature_avg": weather_condition['avg_temp'],
-                "precipitation_min": weather_condition['min_precip'],
-                "precipitation_max": weather_condition['max_precip'],
-                "precipitation_total": weather_condition['sum_precip'],
-                "humidity_min": weather_condition['min_humid'],
-                "humidity_max": weather_condition['max_humid'],
-                "humidity_avg": weather_condition['avg_humid']
+                "timestamp": label,
+                "temperature_min": weather_condition.get('min_temp'),
+                "temperature_max": weather_condition.get('max_temp'),
+                "temperature_avg": weather_condition.get('avg_temp'),
+                "precipitation_min": weather_condition.get('min_precip'),
+                "precipitation_max": weather_condition.get('max_precip'),
+                "precipitation_total": weather_condition.get('sum_precip'),
+                "humidity_min": weather_condition.get('min_humid'),
+                "humidity_max": weather_condition.get('max_humid'),
+                "humidity_avg": weather_condition.get('avg_humid')
             })
-            time += 4
-        return [chart_data, chart_labels, temperature_data, precipitation_data, humidity_data, weather_data]
+        return [chart_data, labels, temperature_data, precipitation_data,
+                humidity_data, weather_data]
+
+    def get_time_field(self, queryset: QuerySet) -> str:
+        """
+        Get the name of the field holding the time of the records in a queryset.
+
+        :param queryset: Queryset for raw data or rollups.
+        :return: 'date' for daily rollups, 'timestamp' otherwise.
+        """
+        if queryset.model in (WasteDaily, WeatherDaily):
+            return 'date'
+        return 'timestamp'
+
+    def get_daily_data(self, waste_queryset: QuerySet,
+                       weather_queryset: QuerySet) -> list[list]:
+        """
+        Get daily waste and weather data in blocks of four hours.
+
+        :param waste_queryset: Queryset for waste data.
+        :param weather_queryset: Queryset for weather data.
+        :return: Data for daily waste and weather.
+        """
+        blocks = list(range(6))
+        return self.get_bucketed_data(
+            waste_queryset, weather_queryset,
+            lambda field: Floor(ExtractHour(field) / 4), blocks,
+            [f"{block * 4:02d}:00" for block in blocks])
 
     def get_monthly_data(self, waste_queryset: QuerySet,
                          weather_queryset: QuerySet, month: int, year: int) -> list[list]:
@@ -151,48 +223,10 @@ class WasteLevelComparisonView(TemplateView):
         :param year: Year for which data is to be fetched.
         :return: Data for monthly waste and weather.
         """
-        start_date = 1
-        last_date = monthrange(year, month)[1]
-        chart_data = []
-        chart_labels = []
-        temperature_data = []
-        precipitation_data = []
-        humidity_data = []
-        weather_data = []
-        while start_date <= last_date:
-            chart_labels.append(f"{year}-{month:02d}-{start_date:02d}")
-            waste_level = waste_queryset.filter(timestamp__day=start_date) \
-                .aggregate(total_waste=Sum('level'))['total_waste']
-            chart_data.append(
-                float(waste_level) if waste_level is not None else None)
-            weather_condition = weather_queryset.filter(
-                timestamp__day=start_date) \
-                .aggregate(min_temp=Min("temp"),
-                           max_temp=Max("temp"),
-                           avg_temp=Avg("temp"),
-                           min_precip=Min("precip"),
-                           max_precip=Max("precip"),
-                           sum_precip=Sum("precip"),
-                           min_humid=Min("humid"),
-                           max_humid=Max("humid"),
-                           avg_humid=Avg("humid"))
-            temperature_data.append(weather_condition['avg_temp'])
-            precipitation_data.append(weather_condition['sum_precip'])
-            humidity_data.append(weather_condition['avg_humid'])
-            weather_data.append({
-                "timestamp": chart_labels[-1],
-                "temperature_min": weather_condition['min_temp'],
-                "temperature_max": weather_condition['max_temp'],
-                "temperature_avg": weather_condition['avg_temp'],
-                "precipitation_min": weather_condition['min_precip'],
-                "precipitation_max": weather_condition['max_precip'],
-                "precipitation_total": weather_condition['sum_precip'],
-                "humidity_min": weather_condition['min_humid'],
-                "humidity_max": weather_condition['max_humid'],
-                "humidity_avg": weather_condition['avg_humid']
-            })
-            start_date += 1
-        return [chart_data, chart_labels, temperature_data, precipitation_data, humidity_data, weather_data]
+        days = list(range(1, monthrange(year, month)[1] + 1))
+        return self.get_bucketed_data(
+            waste_queryset, weather_queryset, ExtractDay, days,
+            [f"{year}-{month:02d}-{day:02d}" for day in days])
 
     def get_yearly_data(self, waste_queryset: QuerySet,
                         weather_queryset: QuerySet) -> list[list]:
@@ -203,43 +237,6 @@ class WasteLevelComparisonView(TemplateView):
         :param weather_queryset: Queryset for weather data.
         :return: Data for yearly waste and weather.
         """
-        month = 1
-        chart_data = []
-        chart_labels = []
-        temperature_data = []
-        precipitation_data = []
-        humidity_data = []
-        weather_data = []
-        while month <= 12:
-            chart_labels.append(month_name[month])
-            waste_level = waste_queryset.filter(timestamp__month=month) \
-                .aggregate(total_waste=Sum('level'))['total_waste']
-            chart_data.append(
-                float(waste_level) if waste_level is not None else None)
-            weather_condition = weather_queryset.filter(timestamp__month=month) \
-                .aggregate(min_temp=Min("temp"),
-                           max_temp=Max("temp"),
-                           avg_temp=Avg("temp"),
-                           min_precip=Min("precip"),
-                           max_precip=Max("precip"),
-                           sum_precip=Sum("precip"),
-                           min_humid=Min("humid"),
-                           max_humid=Max("humid"),
-                           avg_humid=Avg("humid"))
-            temperature_data.append(weather_condition['avg_temp'])
-            precipitation_data.append(weather_condition['sum_precip'])
-            humidity_data.append(weather_condition['avg_humid'])
-            weather_data.append({
-                "timestamp": month_name[month],
-                "temperature_min": weather_condition['min_temp'],
-                "temperature_max": weather_condition['max_temp'],
-                "temperature_avg": weather_condition['avg_temp'],
-                "precipitation_min": weather_condition['min_precip'],
-                "precipitation_max": weather_condition['max_precip'],
-                "precipitation_total": weather_condition['sum_precip'],
-                "humidity_min": weather_condition['min_humid'],
-                "humidity_max": weather_condition['max_humid'],
-                "humidity_avg": weather_condition['avg_humid']
-            })
-            month += 1
-        return [chart_data, chart_labels, temperature_data, precipitation_data, humidity_data, weather_data]
+        months = list(range(1, 13))
+        return self.get_bucketed_data(
+            waste_queryset, weather_queryset, ExtractMonth, months, [month_name[month] for month in months])